@@ -433,6 +433,21 @@ CREATE TABLE IF NOT EXISTS OPERATIONAL.BARBER.AUTOMATION_SETTINGS (
 -- Snowflake automatically optimizes queries without explicit indexes
 -- Performance is handled by Snowflake's micro-partitioning and clustering
 
+-- Point lookups on every login / session check use search optimization
+-- instead (requires Enterprise Edition)
+ALTER TABLE OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS ADD SEARCH OPTIMIZATION ON EQUALITY(EMAIL);
+ALTER TABLE OPERATIONAL.BARBER.BUSINESS_SESSIONS ADD SEARCH OPTIMIZATION ON EQUALITY(SESSION_ID);
+
+-- Rate limits only look back an hour; purging older attempts keeps every
+-- windowed COUNT over RATE_LIMIT_LOG scanning a small table
+CREATE TASK IF NOT EXISTS OPERATIONAL.BARBER.PURGE_RATE_LIMIT_LOG
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '60 MINUTE'
+AS
+    DELETE FROM OPERATIONAL.BARBER.RATE_LIMIT_LOG
+    WHERE LAST_ATTEMPT < DATEADD(day, -1, CURRENT_TIMESTAMP());
+ALTER TASK OPERATIONAL.BARBER.PURGE_RATE_LIMIT_LOG RESUME;
+
 -- =====================================================
 -- INITIAL SETUP DATA
 -- =====================================================
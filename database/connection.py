@@ -4,11 +4,19 @@ import base64
 from snowflake.snowpark import Session
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Iterator
+
+# Tag attached to every query this app runs, for Snowflake query history
+QUERY_TAG = "ezbiz-barber"
 
 class SnowflakeConnection:
     """
     Singleton class to manage Snowflake database connection
+    
+    One Snowpark session is shared by the whole process and kept alive
+    between reruns, so TLS and authentication happen once rather than per
+    query. Streamlit runs each rerun on a fresh thread, so the session is
+    deliberately not per-thread.
     """
     _instance = None
     
@@ -34,9 +42,12 @@ class SnowflakeConnection:
                 "role": st.secrets.get("snowflake", {}).get("role", "ACCOUNTADMIN"),
                 "warehouse": st.secrets.get("snowflake", {}).get("warehouse", "COMPUTE_WH"),
                 "database": st.secrets.get("snowflake", {}).get("database", "OPERATIONAL"),
-                "schema": st.secrets.get("snowflake", {}).get("schema", "CARPET")
+                "schema": st.secrets.get("snowflake", {}).get("schema", "CARPET"),
+                "client_session_keep_alive": True
             }
-            return Session.builder.configs(connection_parameters).create()
+            session = Session.builder.configs(connection_parameters).create()
+            session.query_tag = QUERY_TAG
+            return session
         except Exception as e:
             st.error(f"Failed to create Snowpark session: {e}")
             return None
@@ -107,6 +118,27 @@ class SnowflakeConnection:
                 st.error(f"Error loading private key from file: {e}")
                 raise
 
+    def _is_session_alive(self) -> bool:
+        """Check the session's connection locally, without a round trip"""
+        try:
+            return self.session is not None and not self.session.connection.is_closed()
+        except Exception:
+            return False
+
+    def _ensure_session(self) -> Session:
+        """
+        Return the shared session, reconnecting first if it has been closed
+        
+        Catching a dropped connection here means the query runs on a fresh
+        session instead of failing once before the reconnect.
+        """
+        if not self._is_session_alive():
+            st.info("Creating new database session...")
+            self.session = self._create_session()
+            if not self.session:
+                raise Exception("Failed to create database session")
+        return self.session
+
     def execute_query(self, 
                      query: str, 
                      params: Optional[List[Any]] = None, 
@@ -123,17 +155,13 @@ class SnowflakeConnection:
             Optional[List[dict]]: Query results or None if error
         """
         try:
-            if not self.session:
-                st.info("Creating new database session...")
-                self.session = self._create_session()
-                if not self.session:
-                    raise Exception("Failed to create database session")
+            session = self._ensure_session()
             
             # Execute query with better error handling
             if params:
-                result = self.session.sql(query, params).collect()
+                result = session.sql(query, params).collect()
             else:
-                result = self.session.sql(query).collect()
+                result = session.sql(query).collect()
                 
             # Convert Snowpark Row objects to dictionaries
             if result:
@@ -159,6 +187,70 @@ class SnowflakeConnection:
                 
             return None
 
+    def execute_write(self, query: str, params: Optional[List[Any]] = None) -> List[dict]:
+        """
+        Execute SQL on the open session and raise on failure
+        
+        For background threads, which have no page to report errors to:
+        nothing here calls Streamlit, and a closed session raises instead of
+        reconnecting so the caller can retry once a page has reconnected.
+        
+        Args:
+            query (str): SQL query to execute
+            params (Optional[List[Any]]): Query parameters
+        
+        Returns:
+            List[dict]: Query results
+        """
+        if not self._is_session_alive():
+            raise ConnectionError("No open database session")
+        if params:
+            result = self.session.sql(query, params).collect()
+        else:
+            result = self.session.sql(query).collect()
+        return [dict(row.asDict()) for row in result]
+
+    def iterate_query(self,
+                      query: str,
+                      params: Optional[List[Any]] = None,
+                      error_msg: str = "Error executing query") -> Iterator[dict]:
+        """
+        Execute SQL query and stream results row by row
+        
+        Unlike execute_query, rows are fetched from Snowflake in batches as
+        the caller iterates instead of being materialized up front.
+        
+        Args:
+            query (str): SQL query to execute
+            params (Optional[List[Any]]): Query parameters
+            error_msg (str): Custom error message
+        
+        Yields:
+            dict: One result row at a time
+        """
+        try:
+            session = self._ensure_session()
+            
+            if params:
+                rows = session.sql(query, params).to_local_iterator()
+            else:
+                rows = session.sql(query).to_local_iterator()
+            
+            for row in rows:
+                yield row.asDict()
+                
+        except Exception as e:
+            st.error(f"{error_msg}: {str(e)}")
+            
+            if st.session_state.get('debug_mode', False):
+                st.error(f"Query: {query}")
+                if params:
+                    st.error(f"Parameters: {params}")
+                st.exception(e)
+            
+            if "connection" in str(e).lower() or "session" in str(e).lower():
+                self.session = None  # Force session recreation
+
 # Create and export the singleton instance
 snowflake_conn = SnowflakeConnection.get_instance()
 
@@ -20,6 +20,25 @@ CREATE TABLE IF NOT EXISTS OPERATIONAL.BARBER.SERVICE_ASSIGNMENTS (
     MODIFIED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
 );
 
+-- Fix 3: Search optimization for business login and session lookups
+-- Issue: EMAIL / SESSION_ID point lookups scan every micro-partition
+-- Requires Enterprise Edition
+ALTER TABLE OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS ADD SEARCH OPTIMIZATION ON EQUALITY(EMAIL);
+ALTER TABLE OPERATIONAL.BARBER.BUSINESS_SESSIONS ADD SEARCH OPTIMIZATION ON EQUALITY(SESSION_ID);
+
+-- Fix 4: Purge old RATE_LIMIT_LOG rows hourly
+-- Issue: every rate-limit check counts over a log that only ever grows,
+-- while no check looks back more than an hour
+CREATE TASK IF NOT EXISTS OPERATIONAL.BARBER.PURGE_RATE_LIMIT_LOG
+    WAREHOUSE = COMPUTE_WH
+    SCHEDULE = '60 MINUTE'
+AS
+    DELETE FROM OPERATIONAL.BARBER.RATE_LIMIT_LOG
+    WHERE LAST_ATTEMPT < DATEADD(day, -1, CURRENT_TIMESTAMP());
+ALTER TASK OPERATIONAL.BARBER.PURGE_RATE_LIMIT_LOG RESUME;
+
 -- These fixes resolve:
 -- 1. "invalid identifier 'PORTAL_USER_ID'" errors in password reset and rate limiting
--- 2. "Object 'SERVICE_ASSIGNMENTS' does not exist" errors in employee assignments
\ No newline at end of file
+-- 2. "Object 'SERVICE_ASSIGNMENTS' does not exist" errors in employee assignments
+-- 3. Slow BUSINESS_PORTAL_USERS.EMAIL / BUSINESS_SESSIONS.SESSION_ID lookups
+-- 4. Rate-limit checks slowing down as RATE_LIMIT_LOG grows
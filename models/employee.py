@@ -3,6 +3,7 @@ from dataclasses import dataclass
 import streamlit as st
 import pandas as pd
 from database.connection import SnowflakeConnection
+from utils.employee_utils import clear_employee_cache, fetch_new_employee_id
 
 @dataclass
 class EmployeeModel:
@@ -125,22 +126,12 @@ def save_employee(data: Dict[str, Any]) -> Optional[int]:
             data.get('status', 'Active')
         ]
         
-        snowflake_conn.execute_query(query, params)
+        if snowflake_conn.execute_query(query, params) is None:
+            return None
+        clear_employee_cache()
         
-        # Get the newly created employee ID
-        result = snowflake_conn.execute_query(
-            """
-            SELECT EMPLOYEE_ID 
-            FROM OPERATIONAL.BARBER.EMPLOYEE 
-            WHERE FIRST_NAME = :1 
-            AND LAST_NAME = :2 
-            ORDER BY EMPLOYEE_ID DESC 
-            LIMIT 1
-            """,
-            [data['first_name'], data['last_name']]
-        )
-        
-        return result[0]['EMPLOYEE_ID'] if result else None
+        # Get the employee ID
+        return fetch_new_employee_id(data['first_name'], data['last_name'])
         
     except Exception as e:
         st.error(f"Error saving employee: {str(e)}")
@@ -155,6 +146,7 @@ def update_employee_status(employee_id: int, status: str) -> bool:
         WHERE EMPLOYEE_ID = :2
         """
         snowflake_conn.execute_query(query, [status, employee_id])
+        clear_employee_cache()
         return True
     except Exception as e:
         st.error(f"Error updating employee status: {str(e)}")
@@ -1,6 +1,6 @@
 # models/portal/portal_service.py
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import datetime, time
 from typing import Optional, List, Dict, Any
 from database.connection import snowflake_conn
 
@@ -80,31 +80,26 @@ def get_available_time_slots(service_id: int, date: datetime.date) -> List[time]
         
         booked_times = snowflake_conn.execute_query(bookings_query, [date]) or []
         
-        # Generate available slots
-        business_start = datetime.strptime("08:00", "%H:%M").time()
-        business_end = datetime.strptime("17:00", "%H:%M").time()
+        # Generate available slots, comparing minutes since midnight
+        from utils.double_booking_prevention import check_minute_overlap, time_to_minutes
+        business_start = time_to_minutes(datetime.strptime("08:00", "%H:%M").time())
+        business_end = time_to_minutes(datetime.strptime("17:00", "%H:%M").time())
         slot_duration = 30  # minutes
         
-        current_slot = datetime.combine(date, business_start)
-        end_time = datetime.combine(date, business_end)
+        booked_ranges = []
+        for booking in booked_times:
+            booking_start = time_to_minutes(booking['START_TIME'])
+            booked_ranges.append((booking_start, booking_start + booking['SERVICE_DURATION']))
         
         available_slots = []
-        while current_slot + timedelta(minutes=service_duration) <= end_time:
-            slot_available = True
-            slot_end = current_slot + timedelta(minutes=service_duration)
+        for slot_start in range(business_start, business_end - service_duration + 1, slot_duration):
+            slot_end = slot_start + service_duration
             
-            for booking in booked_times:
-                booking_start = datetime.combine(date, booking['START_TIME'])
-                booking_end = booking_start + timedelta(minutes=booking['SERVICE_DURATION'])
-                
-                if (current_slot < booking_end and slot_end > booking_start):
-                    slot_available = False
-                    break
-            
-            if slot_available:
-                available_slots.append(current_slot.time())
-            
-            current_slot += timedelta(minutes=slot_duration)
+            if not any(
+                check_minute_overlap(slot_start, slot_end, booking_start, booking_end, buffer_minutes=0)
+                for booking_start, booking_end in booked_ranges
+            ):
+                available_slots.append(time(slot_start // 60, slot_start % 60))
             
         return available_slots
         
@@ -205,6 +200,9 @@ def save_booking(
             notes
         ])
         
+        from utils.double_booking_prevention import clear_bookings_cache
+        clear_bookings_cache(booking_date)
+        
         return result[0]['ID'] if result else None
         
     except Exception as e:
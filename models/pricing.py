@@ -1,14 +1,12 @@
 # models/pricing.py
-from typing import Optional, Dict, Any, List, Tuple
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, NamedTuple
 from datetime import datetime
 from decimal import Decimal
 import streamlit as st
 import json
 from database.connection import snowflake_conn
 
-@dataclass
-class PricingStrategy:
+class PricingStrategy(NamedTuple):
     strategy_id: int
     name: str
     type: str
@@ -17,41 +15,57 @@ class PricingStrategy:
     created_at: datetime
     modified_at: datetime
 
+# Strategies change only from pricing settings, which clear this cache on save
+PRICING_STRATEGY_CACHE_TTL_SECONDS = 300
+
+ACTIVE_PRICING_STRATEGY_QUERY = """
+SELECT 
+    STRATEGY_ID,
+    STRATEGY_NAME,
+    STRATEGY_TYPE,
+    RULES_JSON,
+    ACTIVE_FLAG,
+    CREATED_AT,
+    MODIFIED_AT
+FROM OPERATIONAL.BARBER.PRICING_STRATEGIES
+WHERE ACTIVE_FLAG = TRUE
+ORDER BY MODIFIED_AT DESC
+LIMIT 1
+"""
+
+@st.cache_data(ttl=PRICING_STRATEGY_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_active_pricing_strategy() -> Optional[PricingStrategy]:
+    """Load and parse the active pricing strategy (cached)."""
+    result = snowflake_conn.execute_query(ACTIVE_PRICING_STRATEGY_QUERY)
+    if result is None:
+        # Raise so the failed lookup isn't cached
+        raise RuntimeError("Could not load pricing strategy")
+    if not result:
+        return None
+    
+    strategy = result[0]
+    return PricingStrategy(
+        strategy_id=int(strategy['STRATEGY_ID']),
+        name=strategy['STRATEGY_NAME'],
+        type=strategy['STRATEGY_TYPE'],
+        rules=json.loads(strategy['RULES_JSON']) if strategy['RULES_JSON'] else {},
+        active=bool(strategy['ACTIVE_FLAG']),
+        created_at=strategy['CREATED_AT'],
+        modified_at=strategy['MODIFIED_AT']
+    )
+
+def clear_pricing_strategy_cache() -> None:
+    """Drop the cached active strategy after a strategy is saved."""
+    _fetch_active_pricing_strategy.clear()
+
 def get_active_pricing_strategy() -> Optional[PricingStrategy]:
     """Get the currently active pricing strategy from settings"""
-    query = """
-    SELECT 
-        STRATEGY_ID,
-        STRATEGY_NAME,
-        STRATEGY_TYPE,
-        RULES_JSON,
-        ACTIVE_FLAG,
-        CREATED_AT,
-        MODIFIED_AT
-    FROM OPERATIONAL.BARBER.PRICING_STRATEGIES
-    WHERE ACTIVE_FLAG = TRUE
-    ORDER BY MODIFIED_AT DESC
-    LIMIT 1
-    """
-    
     try:
-        result = snowflake_conn.execute_query(query)
-        if result:
-            strategy = result[0]
-            return PricingStrategy(
-                strategy_id=int(strategy['STRATEGY_ID']),
-                name=strategy['STRATEGY_NAME'],
-                type=strategy['STRATEGY_TYPE'],
-                rules=json.loads(strategy['RULES_JSON']) if strategy['RULES_JSON'] else {},
-                active=bool(strategy['ACTIVE_FLAG']),
-                created_at=strategy['CREATED_AT'],
-                modified_at=strategy['MODIFIED_AT']
-            )
-        else:
+        strategy = _fetch_active_pricing_strategy()
+        if strategy is None and ensure_default_pricing_strategy():
             # If no active strategy found, create and return default fixed price strategy
-            ensure_default_pricing_strategy()
-            return get_active_pricing_strategy()  # Recursive call to get the newly created strategy
-        return None
+            strategy = _fetch_active_pricing_strategy()
+        return strategy
     except Exception as e:
         print(f"Error fetching pricing strategy: {str(e)}")
         return None
@@ -187,6 +201,7 @@ def save_pricing_strategy(strategy_data: Dict[str, Any]) -> bool:
         ]
             
         snowflake_conn.execute_query(query, params)
+        clear_pricing_strategy_cache()
         return True
     except Exception as e:
         print(f"Error saving pricing strategy: {str(e)}")
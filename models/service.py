@@ -1,7 +1,7 @@
 from database.connection import SnowflakeConnection
 from typing import Optional, Dict, Any, List, Union, Tuple
 from dataclasses import dataclass
-from datetime import datetime, date, time, timedelta
+from datetime import datetime, date, time
 import streamlit as st
 import pandas as pd
 import json
@@ -126,6 +126,9 @@ def update_service_status(service_id: int, status: str) -> bool:
         WHERE ID = ?
         """
         snowflake_conn.execute_query(query, [status, service_id])
+        
+        from utils.double_booking_prevention import clear_bookings_cache
+        clear_bookings_cache()
         return True
     except Exception as e:
         st.error(f"Error updating service status: {str(e)}")
@@ -319,6 +322,9 @@ def save_service_schedule(
         # Execute transaction insert
         snowflake_conn.execute_query(query, params)
         
+        from utils.double_booking_prevention import clear_bookings_cache
+        clear_bookings_cache(service_date)
+        
         # Get the newly created transaction ID
         transaction_id_query = """
         SELECT ID FROM OPERATIONAL.BARBER.SERVICE_TRANSACTION 
@@ -481,45 +487,21 @@ def schedule_recurring_services(
         service2_id = int(service_ids[1]) if len(service_ids) > 1 else None
         service3_id = int(service_ids[2]) if len(service_ids) > 2 else None
 
-        # Calculate future dates based on recurrence pattern
-        future_dates = []
-        current_date = service_date
-        six_months_from_now = service_date + timedelta(days=180)  # Limit to 6 months
-
-        # Calculate future dates based on recurrence pattern
-        while current_date < six_months_from_now:
-            if recurrence_pattern == "Weekly":
-                current_date += timedelta(days=7)
-            elif recurrence_pattern == "Bi-Weekly":
-                current_date += timedelta(days=14)
-            elif recurrence_pattern == "Monthly":
-                # Handle month increment
-                year = current_date.year
-                month = current_date.month + 1
-                if month > 12:
-                    year += 1
-                    month = 1
-                try:
-                    current_date = current_date.replace(year=year, month=month)
-                except ValueError:
-                    if month + 1 > 12:
-                        next_month = current_date.replace(year=year + 1, month=1, day=1)
-                    else:
-                        next_month = current_date.replace(year=year, month=month + 1, day=1)
-                    current_date = next_month - timedelta(days=1)
-            
-            if current_date < six_months_from_now:
-                future_dates.append(current_date)
+        # Future dates are the ones validate_recurring_service_availability
+        # checks; the first occurrence is the service already saved
+        from utils.double_booking_prevention import get_recurrence_dates
+        future_dates = get_recurrence_dates(service_date, recurrence_pattern)[1:]
 
         # Create transaction records directly for each future date
         for future_date in future_dates:
             # Check availability for this specific date before creating record
-            from utils.double_booking_prevention import check_for_booking_conflicts
+            from utils.double_booking_prevention import check_for_booking_conflicts, clear_bookings_cache
             
             is_available, _, _ = check_for_booking_conflicts(
                 service_date=future_date,
                 service_time=service_time,
-                service_names=service_list
+                service_names=service_list,
+                return_first_only=True
             )
             
             # Skip this date if there's a conflict
@@ -570,6 +552,7 @@ def schedule_recurring_services(
             
             # Execute transaction insert
             snowflake_conn.execute_query(query, params)
+            clear_bookings_cache(future_date)
 
         return True
 
@@ -205,6 +205,9 @@ def save_transaction(transaction_data: Dict[str, Any]) -> bool:
 
         print(f"Executing transaction update for ID: {service_id}")
         snowflake_conn.execute_query(query, params)
+        
+        from utils.double_booking_prevention import clear_bookings_cache
+        clear_bookings_cache()
 
         # Verify the update
         verification = verify_save(service_id)
@@ -337,6 +340,9 @@ def update_transaction_status(transaction_id: int, status: str) -> bool:
         WHERE ID = {transaction_id}
         """
         snowflake_conn.execute_query(query)
+        
+        from utils.double_booking_prevention import clear_bookings_cache
+        clear_bookings_cache()
         return True
     except Exception as e:
         st.error(f"Error updating transaction status: {str(e)}")
@@ -3,6 +3,10 @@ import streamlit as st
 from database.connection import snowflake_conn
 from utils.auth.auth_utils import hash_password, validate_password, validate_email
 from utils.validation import validate_phone, sanitize_zip_code
+from utils.business.info import clear_business_info_cache
+from utils.operating_hours import clear_business_hours_cache
+from utils.employee_utils import clear_employee_cache, fetch_new_employee_id
+from utils.business.business_auth import clear_unknown_email
 import re
 from typing import Optional
 
@@ -98,6 +102,8 @@ def create_business_info(data: dict) -> Optional[int]:
             data['phone'],
             data['email']
         ])
+        clear_business_info_cache()
+        clear_business_hours_cache()
         
         # Get the business ID
         result = snowflake_conn.execute_query(
@@ -125,20 +131,18 @@ def create_employee_record(data: dict, business_id: int) -> Optional[int]:
         ) VALUES (?, ?, ?, ?, 'Owner', TRUE)
         """
         
-        snowflake_conn.execute_query(query, [
+        result = snowflake_conn.execute_query(query, [
             data['first_name'],
             data['last_name'],
             data['email'],
             data['phone']
         ])
+        if result is None:
+            return None
+        clear_employee_cache()
         
         # Get the employee ID
-        result = snowflake_conn.execute_query(
-            "SELECT EMPLOYEE_ID FROM OPERATIONAL.BARBER.EMPLOYEE WHERE EMAIL = ? ORDER BY EMPLOYEE_ID DESC LIMIT 1",
-            [data['email']]
-        )
-        
-        return result[0]['EMPLOYEE_ID'] if result else None
+        return fetch_new_employee_id(data['first_name'], data['last_name'], data['email'])
         
     except Exception as e:
         st.error(f"Error creating employee record: {str(e)}")
@@ -165,6 +169,7 @@ def create_business_portal_user(data: dict, employee_id: int) -> bool:
             data['email'].lower(),
             password_hash
         ])
+        clear_unknown_email(data['email'])
         
         return True
         
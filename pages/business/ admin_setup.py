@@ -1,6 +1,7 @@
 import streamlit as st
 from utils.auth.auth_utils import hash_password
 from database.connection import snowflake_conn
+from utils.business.business_auth import clear_unknown_email
 
 def setup_admin_user(employee_id: int, email: str, password: str) -> bool:
     """
@@ -39,6 +40,7 @@ def setup_admin_user(employee_id: int, email: str, password: str) -> bool:
             email.lower(),
             password_hash
         ])
+        clear_unknown_email(email)
         
         return True
 
@@ -23,7 +23,7 @@ from utils.validation import validate_phone, validate_email, validate_zip_code,
 from utils.email import generate_service_scheduled_email
 from utils.email import generate_service_completed_email
 from utils.sms import send_service_notification_sms 
-from pages.settings.business import fetch_business_info  # Add this import
+from utils.business.info import fetch_business_info
 
 # In new_service.py
 from typing import Optional, Dict, Any
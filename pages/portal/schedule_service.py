@@ -1,10 +1,11 @@
 # schedule_service.py
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from database.connection import snowflake_conn
 from utils.auth.middleware import require_customer_auth
 from utils.auth.auth_utils import check_rate_limit
 from utils.formatting import format_currency
+from utils.double_booking_prevention import check_minute_overlap, time_to_minutes, get_recurrence_dates
 from typing import Any, Dict, List, Optional
 
 class QueryDebugger:
@@ -162,34 +163,27 @@ def schedule_service_page():
                 business_end = datetime.strptime("17:00", "%H:%M").time()
                 service_duration = int(selected_service['SERVICE_DURATION'])
                 
+                # Compare in minutes since midnight; each booking is converted once
+                booked_ranges = []
+                for booking in bookings or []:
+                    booking_start = time_to_minutes(booking['START_TIME'])
+                    booked_ranges.append(
+                        (booking_start, booking_start + int(booking['SERVICE_DURATION']))
+                    )
+                
                 available_slots = []
-                current_slot = datetime.combine(selected_date, business_start)
-                end_time = datetime.combine(selected_date, business_end)
+                open_minutes = time_to_minutes(business_start)
+                close_minutes = time_to_minutes(business_end)
                 
-                while current_slot + timedelta(minutes=service_duration) <= end_time:
-                    slot_available = True
-                    slot_end = current_slot + timedelta(minutes=service_duration)
+                for slot_start in range(open_minutes, close_minutes - service_duration + 1, 30):
+                    slot_end = slot_start + service_duration
                     
                     # Check if slot conflicts with existing bookings
-                    if bookings:
-                        for booking in bookings:
-                            booking_start = datetime.combine(
-                                selected_date,
-                                booking['START_TIME']
-                            )
-                            booking_end = booking_start + timedelta(
-                                minutes=int(booking['SERVICE_DURATION'])
-                            )
-                            
-                            if (current_slot < booking_end and 
-                                slot_end > booking_start):
-                                slot_available = False
-                                break
-                    
-                    if slot_available:
-                        available_slots.append(current_slot.time())
-                    
-                    current_slot += timedelta(minutes=30)
+                    if not any(
+                        check_minute_overlap(slot_start, slot_end, booking_start, booking_end, buffer_minutes=0)
+                        for booking_start, booking_end in booked_ranges
+                    ):
+                        available_slots.append(time(slot_start // 60, slot_start % 60))
                 
                 debug.debug_print("Available Time Slots", 
                                 [slot.strftime("%I:%M %p") for slot in available_slots])
@@ -303,27 +297,10 @@ def schedule_service_page():
                                         "start_date": str(selected_date)
                                     })
                                     
-                                    # Schedule recurring services with same type casting
-                                    current_date = selected_date
-                                    for _ in range(24):  # 6 months of weekly services
-                                        if recurrence_pattern == "Weekly":
-                                            current_date += timedelta(days=7)
-                                        elif recurrence_pattern == "Bi-Weekly":
-                                            current_date += timedelta(days=14)
-                                        elif recurrence_pattern == "Monthly":
-                                            # Add a month
-                                            year = current_date.year
-                                            month = current_date.month + 1
-                                            if month > 12:
-                                                year += 1
-                                                month = 1
-                                            current_date = current_date.replace(
-                                                year=year, month=month
-                                            )
-                                        
-                                        if (current_date - selected_date).days > 180:
-                                            break
-                                            
+                                    # Schedule recurring services with same type casting, on
+                                    # the dates the availability check uses; the first is
+                                    # the booking just made
+                                    for current_date in get_recurrence_dates(selected_date, recurrence_pattern)[1:]:
                                         recurring_params = [
                                             int(st.session_state.customer_id),
                                             int(selected_service['SERVICE_ID']),
@@ -341,6 +318,9 @@ def schedule_service_page():
                                         debug.debug_query(booking_query, recurring_params)
                                         snowflake_conn.execute_query(booking_query, recurring_params)
                                 
+                                from utils.double_booking_prevention import clear_bookings_cache
+                                clear_bookings_cache(selected_date)
+                                
                                 st.success("Service scheduled successfully!")
                                 st.balloons()
                                 
@@ -4,7 +4,7 @@ from typing import Tuple
 from utils.auth.middleware import require_customer_auth
 from utils.auth.auth_utils import check_rate_limit
 from database.connection import snowflake_conn
-from pages.settings.business import fetch_business_info
+from utils.business.info import fetch_business_info
 from models.service import schedule_recurring_services
 from models.service import get_available_time_slots
 from utils.sms import send_service_notification_sms
@@ -641,6 +641,9 @@ def book_service_page():
                         service['SERVICE_NAME']                 # SERVICE_NAME
                     ])
                     
+                    from utils.double_booking_prevention import clear_bookings_cache
+                    clear_bookings_cache(st.session_state.selected_date)
+                    
                     # Handle recurring bookings if needed
                     if st.session_state.is_recurring:
                         # Validate recurring availability before creating all bookings
@@ -669,6 +672,7 @@ def book_service_page():
                             pattern=st.session_state.recurrence_pattern,
                             notes=st.session_state.booking_notes
                         )
+                        clear_bookings_cache()
                     
                     # Send confirmation notification
                     try:
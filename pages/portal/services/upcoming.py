@@ -3,6 +3,7 @@ import streamlit as st
 from datetime import datetime, timedelta
 from utils.auth.middleware import require_customer_auth
 from database.connection import snowflake_conn
+from utils.double_booking_prevention import clear_bookings_cache
 
 @require_customer_auth
 def upcoming_services_page():
@@ -227,6 +228,7 @@ def upcoming_services_page():
                                 datetime.strptime(new_time, "%I:%M %p").time(),
                                 service['TRANSACTION_ID']
                             ])
+                            clear_bookings_cache(new_date)
                             
                             st.session_state.pop('show_reschedule', None)
                             st.session_state.pop('reschedule_service', None)
@@ -318,6 +320,7 @@ def upcoming_services_page():
                             cancel_notes,
                             service['TRANSACTION_ID']
                         ])
+                        clear_bookings_cache(service['SERVICE_DATE'])
                         
                         st.session_state.pop('show_cancel', None)
                         st.session_state.pop('cancel_service', None)
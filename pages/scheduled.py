@@ -4,7 +4,11 @@ import pandas as pd
 from models.service import ServiceModel
 from utils.formatting import format_currency, format_date, format_time, add_back_navigation
 from database.connection import SnowflakeConnection
-from utils.null_handling import safe_get_float, safe_get_int, safe_get_string, safe_get_bool
+from utils.double_booking_prevention import clear_bookings_cache
+from utils.null_handling import (
+    safe_get_float, safe_get_int, safe_get_string, safe_get_bool,
+    safe_series_float, safe_series_bool
+)
 
 # Removed unused store_service_session_data function - using handle_service_start instead
 
@@ -26,6 +30,7 @@ def update_service_status(snowflake_conn: SnowflakeConnection, transaction_id: i
     """
     try:
         snowflake_conn.execute_query(update_query, [status, transaction_id])
+        clear_bookings_cache()
     except Exception as e:
         st.error(f"Failed to update service status: {str(e)}")
         raise
@@ -77,6 +82,7 @@ def handle_service_start(snowflake_conn: SnowflakeConnection, row: pd.Series) ->
     WHERE ID = ?
     """
     snowflake_conn.execute_query(update_query, [transaction_id])
+    clear_bookings_cache(row['SERVICE_DATE'])
     
     st.session_state['service_start_time'] = datetime.now().time()
     st.session_state['page'] = 'transaction_details'
@@ -95,6 +101,7 @@ def handle_service_restart(snowflake_conn: SnowflakeConnection, row: pd.Series)
         WHERE ID = ?
         """
         snowflake_conn.execute_query(update_query, [transaction_id])
+        clear_bookings_cache(row['SERVICE_DATE'])
         
         st.success("Service restarted successfully! Status changed back to SCHEDULED.")
         
@@ -373,18 +380,13 @@ def render_summary_statistics(services_df: pd.DataFrame) -> None:
     with col1:
         st.metric("Total Services", len(services_df))
 
+    has_deposit = safe_series_float(services_df['DEPOSIT']) > 0
+    deposit_paid = safe_series_bool(services_df['DEPOSIT_PAID'])
+
     with col2:
-        pending_deposits = len(services_df[
-            (services_df['DEPOSIT'].notna()) & 
-            (services_df['DEPOSIT'] > 0) &
-            (~services_df['DEPOSIT_PAID'].fillna(False))
-        ])
+        pending_deposits = int((has_deposit & ~deposit_paid).sum())
         st.metric("Pending Deposits", pending_deposits)
 
     with col3:
-        confirmed_deposits = len(services_df[
-            (services_df['DEPOSIT'].notna()) &
-            (services_df['DEPOSIT'] > 0) &
-            (services_df['DEPOSIT_PAID'] == True)
-        ])
+        confirmed_deposits = int((has_deposit & deposit_paid).sum())
         st.metric("Confirmed Deposits", confirmed_deposits)
\ No newline at end of file
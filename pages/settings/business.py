@@ -1,6 +1,8 @@
 import streamlit as st
 from datetime import time
 from database.connection import snowflake_conn
+from utils.operating_hours import clear_business_hours_cache
+from utils.business.info import clear_business_info_cache
 import traceback
 from typing import Dict, Any
 
@@ -288,6 +290,8 @@ def business_settings_page():
                     st.write("Save Result:", result)
 
                 if result is not None:
+                    clear_business_hours_cache()
+                    clear_business_info_cache()
                     st.success("Business information saved successfully!")
                     st.rerun()
                 else:
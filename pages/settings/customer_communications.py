@@ -1,6 +1,7 @@
 import streamlit as st
 from database.connection import snowflake_conn
 from datetime import datetime
+from utils.portal.verification import clear_verification_template_cache
 
 def customer_communications_page():
     """Customer communication and settings management page"""
@@ -176,6 +177,7 @@ def customer_communications_page():
                         WHERE TEMPLATE_ID = :1
                         """
                         snowflake_conn.execute_query(delete_query, [template['TEMPLATE_ID']])
+                        clear_verification_template_cache()
                         st.success("Message deleted")
                         st.rerun()
                     except Exception as e:
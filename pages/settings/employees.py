@@ -4,6 +4,7 @@ from database.connection import snowflake_conn
 from config.settings import JOB_TITLES, DEPARTMENTS
 from utils.validation import validate_email, validate_phone
 from utils.formatting import format_currency
+from utils.employee_utils import clear_employee_cache
 
 def employees_settings_page():
     """Employee management settings page"""
@@ -135,6 +136,7 @@ def employees_settings_page():
                                 employee['EMPLOYEE_ID']
                             ]
                             snowflake_conn.execute_query(update_query, params)
+                            clear_employee_cache()
                             st.success("Employee updated successfully!")
                             st.rerun()
                         except Exception as e:
@@ -195,6 +197,7 @@ def employees_settings_page():
                         new_department, new_hourly_wage, new_active
                     ]
                     snowflake_conn.execute_query(insert_query, params)
+                    clear_employee_cache()
                     st.success("New employee added successfully!")
                     st.rerun()
                 except Exception as e:
@@ -2,6 +2,8 @@ import streamlit as st
 from database.connection import snowflake_conn
 from config.settings import SERVICE_CATEGORIES
 from utils.formatting import format_currency
+from utils.service_utils import clear_service_categories_cache
+from utils.double_booking_prevention import clear_service_durations_cache
 
 def services_settings_page():
     """Services management settings page"""
@@ -110,6 +112,8 @@ def services_settings_page():
                                             new_cost, new_status, new_duration,
                                             service['SERVICE_ID']
                                         ])
+                                        clear_service_categories_cache()
+                                        clear_service_durations_cache()
                                         st.success("Service updated successfully!")
                                         st.session_state.editing_service = None
                                         st.rerun()
@@ -172,6 +176,8 @@ def services_settings_page():
                             service_name, service_category, service_description,
                             cost, active_status, service_duration
                         ])
+                        clear_service_categories_cache()
+                        clear_service_durations_cache()
                         st.success("New service added successfully!")
                         st.rerun()
                     except Exception as e:
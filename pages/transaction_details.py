@@ -9,6 +9,8 @@ from typing import Dict, Any, Optional, List
 from database.connection import SnowflakeConnection
 from utils.formatting import format_currency, format_date, format_time
 from utils.null_handling import safe_get_float, safe_get_int, safe_get_string, safe_get_bool
+from utils.employee_utils import clear_employee_cache, fetch_new_employee_id
+from utils.double_booking_prevention import clear_bookings_cache
 
 def get_transaction_details(transaction_id: int) -> Optional[Dict[str, Any]]:
     """Get complete transaction details from database"""
@@ -908,6 +910,7 @@ def update_service_status(transaction_id: int, new_status: str) -> bool:
     
     try:
         conn.execute_query(query, [new_status, transaction_id])
+        clear_bookings_cache()
         return True
     except Exception as e:
         st.error(f"Error updating service status: {str(e)}")
@@ -1071,6 +1074,7 @@ def reset_service_status(transaction_id: int) -> bool:
     
     try:
         conn.execute_query(query, [transaction_id])
+        clear_bookings_cache()
         
         # Also remove any employee assignments that were specific to the completed service
         # (Optional - you might want to keep assignments for rescheduled services)
@@ -1354,29 +1358,23 @@ def create_employee_from_transaction(first_name: str, last_name: str, email: str
     """
     
     try:
+        email = email.strip() if email else None
+        
         # Execute insertion
         result = conn.execute_query(query, [
             first_name.strip(), 
             last_name.strip(), 
-            email.strip() if email else None,
+            email,
             phone.strip() if phone else None,
             job_title.strip() if job_title else "Barber",
             float(hourly_rate)
         ])
         
-        if result and len(result) > 0:
-            # Get the newly created employee ID
-            get_id_query = """
-            SELECT EMPLOYEE_ID 
-            FROM OPERATIONAL.BARBER.EMPLOYEE 
-            WHERE FIRST_NAME = ? AND LAST_NAME = ? 
-            ORDER BY EMPLOYEE_ID DESC 
-            LIMIT 1
-            """
+        if result is not None:
+            clear_employee_cache()
             
-            id_result = conn.execute_query(get_id_query, [first_name.strip(), last_name.strip()])
-            if id_result:
-                return id_result[0]['EMPLOYEE_ID']
+            # Get the newly created employee ID
+            return fetch_new_employee_id(first_name.strip(), last_name.strip(), email)
         
         return None
         
@@ -5,6 +5,7 @@ Run this to populate the SERVICES table with basic carpet cleaning services.
 """
 
 from database.connection import snowflake_conn
+from utils.service_utils import bulk_create_services
 
 def seed_services():
     """Add initial services to the database"""
@@ -84,34 +85,12 @@ def seed_services():
         print(f"Services table already has {result[0]['COUNT']} services")
         return
     
-    # Insert services
-    insert_query = """
-    INSERT INTO OPERATIONAL.BARBER.SERVICES (
-        SERVICE_NAME,
-        SERVICE_CATEGORY,
-        SERVICE_DESCRIPTION,
-        COST,
-        ACTIVE_STATUS,
-        SERVICE_DURATION,
-        CUSTOMER_BOOKABLE
-    ) VALUES (?, ?, ?, ?, TRUE, ?, ?)
-    """
-    
-    inserted_count = 0
-    for service in services:
-        try:
-            snowflake_conn.execute_query(insert_query, [
-                service['name'],
-                service['category'],
-                service['description'],
-                service['cost'],
-                service['duration'],
-                service['customer_bookable']
-            ])
-            inserted_count += 1
-            print(f"✅ Added: {service['name']}")
-        except Exception as e:
-            print(f"❌ Failed to add {service['name']}: {e}")
+    # Insert services in one statement
+    inserted_count = bulk_create_services(services)
+    for service in services[:inserted_count]:
+        print(f"✅ Added: {service['name']}")
+    if inserted_count < len(services):
+        print(f"❌ Failed to add {len(services) - inserted_count} services")
     
     print(f"\n🎉 Successfully added {inserted_count} services to the database!")
 
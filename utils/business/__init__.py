@@ -6,6 +6,7 @@ from .business_auth import (
     create_business_session,
     verify_business_session,
     create_business_user,
+    clear_unknown_email,
     business_login,
     validate_password,
     hash_password,
@@ -17,6 +18,7 @@ __all__ = [
     'create_business_session',
     'verify_business_session', 
     'create_business_user',
+    'clear_unknown_email',
     'business_login',
     'validate_password',
     'hash_password',
@@ -1,9 +1,139 @@
+import base64
+import hashlib
+import hmac
 import secrets
-import re
+import string
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
 from passlib.hash import pbkdf2_sha256
 from database.connection import snowflake_conn
+from utils.database.batch_writer import BatchInsertWriter
+
+# Byte-class table for password policy checks: translating the encoded
+# password through it maps every byte to its character class
+_CLASS_UPPER = 1
+_CLASS_LOWER = 2
+_CLASS_SPECIAL = 4
+_PASSWORD_CLASSES = bytes(
+    _CLASS_UPPER if chr(b) in string.ascii_uppercase
+    else _CLASS_LOWER if chr(b) in string.ascii_lowercase
+    else _CLASS_SPECIAL if chr(b) in '!@#$%^&*(),.?":{}|<>'
+    else 0
+    for b in range(256)
+)
+_HAS_UPPER = bytes([_CLASS_UPPER])
+_HAS_LOWER = bytes([_CLASS_LOWER])
+_HAS_SPECIAL = bytes([_CLASS_SPECIAL])
+
+# PBKDF2 parameters matching passlib's pbkdf2_sha256 defaults so hashes stay
+# interchangeable with utils.auth.auth_utils
+PBKDF2_PREFIX = "$pbkdf2-sha256$"
+PBKDF2_ROUNDS = 29000
+PBKDF2_SALT_SIZE = 16
+PBKDF2_KEY_SIZE = 32
+
+# Minimum age of LAST_ACTIVITY before a session check writes it again
+SESSION_ACTIVITY_UPDATE_SECONDS = 30
+
+# Emails with no portal user are remembered briefly so repeated bot attempts
+# against them skip the user lookup
+UNKNOWN_EMAIL_CACHE_TTL_SECONDS = 60
+UNKNOWN_EMAIL_CACHE_SIZE = 10000
+_unknown_emails: "OrderedDict[str, float]" = OrderedDict()
+_unknown_emails_lock = threading.Lock()
+
+# Rate limiting is counted in-process; RATE_LIMIT_LOG seeds the count the
+# first time a key is seen and keeps a persistent record of attempts
+RATE_LIMIT_MAX_ATTEMPTS = 5
+RATE_LIMIT_WINDOW_SECONDS = 3600
+RATE_LIMIT_CACHE_SIZE = 10000
+_rate_limit_attempts: "OrderedDict[Tuple[str, str], deque]" = OrderedDict()
+_rate_limit_lock = threading.Lock()
+
+# Queries on the login / session-check path, bound with qmark placeholders
+RATE_LIMIT_HISTORY_QUERY = f"""
+SELECT DATEDIFF(second, LAST_ATTEMPT, CURRENT_TIMESTAMP()) AS AGE_SECONDS
+FROM OPERATIONAL.BARBER.RATE_LIMIT_LOG
+WHERE IP_ADDRESS = ?
+AND ACTION_TYPE = ?
+AND LAST_ATTEMPT > DATEADD(second, -{RATE_LIMIT_WINDOW_SECONDS}, CURRENT_TIMESTAMP())
+"""
+
+_rate_limit_log = BatchInsertWriter(
+    "INSERT INTO OPERATIONAL.BARBER.RATE_LIMIT_LOG (IP_ADDRESS, ACTION_TYPE, LAST_ATTEMPT) VALUES ",
+    "(?, ?, DATEADD(second, -?, CURRENT_TIMESTAMP()))",
+    append_age_seconds=True
+)
+
+_session_log = BatchInsertWriter(
+    "INSERT INTO OPERATIONAL.BARBER.SESSION_LOG "
+    "(PORTAL_USER_ID, EVENT_TYPE, IP_ADDRESS, USER_AGENT, EVENT_DETAILS) VALUES ",
+    "(?, ?, ?, ?, ?)",
+    max_rows=50,
+    flush_interval=2.0
+)
+
+CREATE_SESSION_QUERY = """
+INSERT INTO OPERATIONAL.BARBER.BUSINESS_SESSIONS (
+    SESSION_ID, PORTAL_USER_ID, IP_ADDRESS, USER_AGENT,
+    LOGIN_TIME, LAST_ACTIVITY, EXPIRES_AT, IS_ACTIVE
+) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP(), ?, TRUE)
+"""
+
+VERIFY_SESSION_QUERY = f"""
+SELECT 
+    s.PORTAL_USER_ID,
+    s.EXPIRES_AT,
+    u.EMPLOYEE_ID,
+    u.IS_ADMIN,
+    u.EMAIL,
+    COALESCE(
+        s.LAST_ACTIVITY < DATEADD(second, -{SESSION_ACTIVITY_UPDATE_SECONDS}, CURRENT_TIMESTAMP()),
+        TRUE
+    ) AS ACTIVITY_STALE
+FROM OPERATIONAL.BARBER.BUSINESS_SESSIONS s
+JOIN OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS u ON s.PORTAL_USER_ID = u.PORTAL_USER_ID
+WHERE s.SESSION_ID = ?
+AND s.IS_ACTIVE = TRUE
+AND s.EXPIRES_AT > CURRENT_TIMESTAMP()
+"""
+
+UPDATE_SESSION_ACTIVITY_QUERY = """
+UPDATE OPERATIONAL.BARBER.BUSINESS_SESSIONS 
+SET LAST_ACTIVITY = CURRENT_TIMESTAMP()
+WHERE SESSION_ID = ?
+"""
+
+GET_LOGIN_USER_QUERY = """
+SELECT 
+    PORTAL_USER_ID,
+    EMPLOYEE_ID,
+    PASSWORD_HASH,
+    IS_ACTIVE,
+    FAILED_LOGIN_ATTEMPTS,
+    ACCOUNT_LOCKED,
+    ACCOUNT_LOCKED_UNTIL
+FROM OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS
+WHERE EMAIL = ?
+"""
+
+LOGIN_SUCCESS_QUERY = """
+UPDATE OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS
+SET FAILED_LOGIN_ATTEMPTS = 0,
+    LAST_LOGIN_DATE = CURRENT_TIMESTAMP()
+WHERE PORTAL_USER_ID = ?
+"""
+
+LOGIN_FAILURE_QUERY = """
+UPDATE OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS
+SET FAILED_LOGIN_ATTEMPTS = ?,
+    ACCOUNT_LOCKED = ?,
+    ACCOUNT_LOCKED_UNTIL = ?
+WHERE PORTAL_USER_ID = ?
+"""
 
 def validate_password(password: str) -> Tuple[bool, str]:
     """
@@ -15,46 +145,124 @@ def validate_password(password: str) -> Tuple[bool, str]:
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
-    if not re.search(r'[A-Z]', password):
+    # Non-ASCII characters encode to bytes >= 0x80, which map to class 0
+    classes = password.encode('utf-8').translate(_PASSWORD_CLASSES)
+    
+    if _HAS_UPPER not in classes:
         return False, "Password must contain at least one uppercase letter"
     
-    if not re.search(r'[a-z]', password):
+    if _HAS_LOWER not in classes:
         return False, "Password must contain at least one lowercase letter"
     
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if _HAS_SPECIAL not in classes:
         return False, "Password must contain at least one special character"
     
     return True, "Password is valid"
 
+def _ab64_encode(data: bytes) -> str:
+    """Encode bytes using passlib's adapted base64 alphabet"""
+    return base64.b64encode(data).rstrip(b'=').replace(b'+', b'.').decode('ascii')
+
+def _ab64_decode(data: str) -> bytes:
+    """Decode passlib's adapted base64 alphabet"""
+    data = data.replace('.', '+')
+    return base64.b64decode(data + '=' * (-len(data) % 4))
+
 def hash_password(password: str) -> str:
-    """Hash password using PBKDF2-SHA256"""
-    return pbkdf2_sha256.hash(password)
+    """Hash password using PBKDF2-SHA256 (passlib-compatible format)"""
+    salt = secrets.token_bytes(PBKDF2_SALT_SIZE)
+    checksum = hashlib.pbkdf2_hmac(
+        'sha256', password.encode('utf-8'), salt, PBKDF2_ROUNDS, dklen=PBKDF2_KEY_SIZE
+    )
+    return f"{PBKDF2_PREFIX}{PBKDF2_ROUNDS}${_ab64_encode(salt)}${_ab64_encode(checksum)}"
 
 def verify_password(password: str, password_hash: str) -> bool:
     """Verify password against hash"""
+    if password_hash and password_hash.startswith(PBKDF2_PREFIX):
+        try:
+            rounds, salt, checksum = password_hash[len(PBKDF2_PREFIX):].split('$')
+            expected = _ab64_decode(checksum)
+            actual = hashlib.pbkdf2_hmac(
+                'sha256', password.encode('utf-8'), _ab64_decode(salt),
+                int(rounds), dklen=len(expected)
+            )
+            return hmac.compare_digest(actual, expected)
+        except ValueError:
+            pass
+    
+    # Fall back to passlib for any hash we can't parse directly
     return pbkdf2_sha256.verify(password, password_hash)
 
+# Verified against when the email is unknown so failed lookups cost the same
+# PBKDF2 work as a wrong password
+_DUMMY_HASH = hash_password(secrets.token_hex(16))
+
+def _email_key(email: str) -> str:
+    """Cache key for an email address"""
+    return hashlib.sha256(email.lower().encode('utf-8')).hexdigest()
+
+def _is_known_unknown_email(email_key: str) -> bool:
+    """Check whether an email recently failed the user lookup"""
+    with _unknown_emails_lock:
+        cached_at = _unknown_emails.get(email_key)
+        if cached_at is None:
+            return False
+        if time.monotonic() - cached_at > UNKNOWN_EMAIL_CACHE_TTL_SECONDS:
+            _unknown_emails.pop(email_key, None)
+            return False
+        return True
+
+def _remember_unknown_email(email_key: str) -> None:
+    """Record an email that has no portal user"""
+    with _unknown_emails_lock:
+        _unknown_emails[email_key] = time.monotonic()
+        _unknown_emails.move_to_end(email_key)
+        while len(_unknown_emails) > UNKNOWN_EMAIL_CACHE_SIZE:
+            _unknown_emails.popitem(last=False)
+
+def clear_unknown_email(email: str) -> None:
+    """Forget a cached login miss once a portal user exists for the email"""
+    email_key = _email_key(email)
+    with _unknown_emails_lock:
+        _unknown_emails.pop(email_key, None)
+
+def _load_rate_limit_attempts(ip_address: str, action_type: str) -> Optional[deque]:
+    """Seed in-process attempt times for a key from RATE_LIMIT_LOG"""
+    result = snowflake_conn.execute_query(RATE_LIMIT_HISTORY_QUERY, [ip_address, action_type])
+    if result is None:
+        return None
+    now = time.monotonic()
+    return deque(sorted(now - row['AGE_SECONDS'] for row in result))
+
 def check_business_rate_limit(ip_address: str, action_type: str) -> Tuple[bool, str]:
     """Check rate limits for business actions"""
-    query = """
-    SELECT COUNT(*) as attempt_count
-    FROM OPERATIONAL.BARBER.RATE_LIMIT_LOG
-    WHERE IP_ADDRESS = :1
-    AND ACTION_TYPE = :2
-    AND LAST_ATTEMPT > DATEADD(hour, -1, CURRENT_TIMESTAMP())
-    """
+    key = (ip_address, action_type)
     try:
-        result = snowflake_conn.execute_query(query, [ip_address, action_type])
-        if result[0]['ATTEMPT_COUNT'] >= 5:
-            return False, "Too many attempts. Please try again later."
+        with _rate_limit_lock:
+            attempts = _rate_limit_attempts.get(key)
+        
+        if attempts is None:
+            loaded = _load_rate_limit_attempts(ip_address, action_type)
+            if loaded is None:
+                return False, "Rate limit check failed"
+            with _rate_limit_lock:
+                attempts = _rate_limit_attempts.setdefault(key, loaded)
+        
+        with _rate_limit_lock:
+            _rate_limit_attempts[key] = attempts
+            _rate_limit_attempts.move_to_end(key)
+            while len(_rate_limit_attempts) > RATE_LIMIT_CACHE_SIZE:
+                _rate_limit_attempts.popitem(last=False)
+            
+            now = time.monotonic()
+            while attempts and now - attempts[0] > RATE_LIMIT_WINDOW_SECONDS:
+                attempts.popleft()
+            if len(attempts) >= RATE_LIMIT_MAX_ATTEMPTS:
+                return False, "Too many attempts. Please try again later."
+            attempts.append(now)
         
         # Log attempt
-        log_query = """
-        INSERT INTO OPERATIONAL.BARBER.RATE_LIMIT_LOG (
-            IP_ADDRESS, ACTION_TYPE, LAST_ATTEMPT
-        ) VALUES (:1, :2, CURRENT_TIMESTAMP())
-        """
-        snowflake_conn.execute_query(log_query, [ip_address, action_type])
+        _rate_limit_log.put(ip_address, action_type)
         return True, "OK"
     except Exception as e:
         print(f"Rate limit error: {str(e)}")
@@ -62,33 +270,20 @@ def check_business_rate_limit(ip_address: str, action_type: str) -> Tuple[bool,
 
 def log_business_event(portal_user_id: Optional[int], event_type: str, details: str, 
                       ip_address: str = 'unknown', user_agent: str = 'unknown') -> None:
-    """Log business security events"""
-    query = """
-    INSERT INTO OPERATIONAL.BARBER.SESSION_LOG (
-        PORTAL_USER_ID, EVENT_TYPE, IP_ADDRESS, USER_AGENT, EVENT_DETAILS
-    ) VALUES (:1, :2, :3, :4, :5)
-    """
+    """Log business security events (written in the background)"""
     try:
-        snowflake_conn.execute_query(query, [
-            portal_user_id, event_type, ip_address, user_agent, details
-        ])
+        _session_log.put(portal_user_id, event_type, ip_address, user_agent, details)
     except Exception as e:
         print(f"Log error: {str(e)}")
 
 def create_business_session(portal_user_id: int, ip_address: str, user_agent: str) -> Optional[str]:
     """Create new business session"""
-    session_id = secrets.token_urlsafe(32)
+    # Same output as secrets.token_urlsafe(32), minus a wrapper call
+    session_id = base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b'=').decode('ascii')
     expires_at = datetime.now() + timedelta(hours=12)  # Longer session for business
-
-    query = """
-    INSERT INTO OPERATIONAL.BARBER.BUSINESS_SESSIONS (
-        SESSION_ID, PORTAL_USER_ID, IP_ADDRESS, USER_AGENT,
-        LOGIN_TIME, LAST_ACTIVITY, EXPIRES_AT, IS_ACTIVE
-    ) VALUES (:1, :2, :3, :4, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP(), :5, TRUE)
-    """
     
     try:
-        snowflake_conn.execute_query(query, [
+        snowflake_conn.execute_query(CREATE_SESSION_QUERY, [
             session_id, portal_user_id, ip_address, user_agent, expires_at
         ])
         return session_id
@@ -97,33 +292,20 @@ def create_business_session(portal_user_id: int, ip_address: str, user_agent: st
         return None
 
 def verify_business_session(session_id: str) -> Optional[Dict]:
-    """Validate business session and update last activity"""
-    query = """
-    SELECT 
-        s.PORTAL_USER_ID,
-        s.EXPIRES_AT,
-        u.EMPLOYEE_ID,
-        u.IS_ADMIN,
-        u.EMAIL
-    FROM OPERATIONAL.BARBER.BUSINESS_SESSIONS s
-    JOIN OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS u ON s.PORTAL_USER_ID = u.PORTAL_USER_ID
-    WHERE s.SESSION_ID = :1
-    AND s.IS_ACTIVE = TRUE
-    AND s.EXPIRES_AT > CURRENT_TIMESTAMP()
     """
-    
+    Validate business session and update last activity.
+    LAST_ACTIVITY is only written when it is older than
+    SESSION_ACTIVITY_UPDATE_SECONDS, so most checks cost a single query.
+    """
     try:
-        result = snowflake_conn.execute_query(query, [session_id])
+        result = snowflake_conn.execute_query(VERIFY_SESSION_QUERY, [session_id])
         if result and len(result) > 0:
             session_data = result[0]
+            if not session_data.pop('ACTIVITY_STALE', True):
+                return session_data
             
             # Update last activity
-            update_query = """
-            UPDATE OPERATIONAL.BARBER.BUSINESS_SESSIONS 
-            SET LAST_ACTIVITY = CURRENT_TIMESTAMP()
-            WHERE SESSION_ID = :1
-            """
-            snowflake_conn.execute_query(update_query, [session_id])
+            snowflake_conn.execute_query(UPDATE_SESSION_ACTIVITY_QUERY, [session_id])
             
             return session_data
         return None
@@ -145,7 +327,7 @@ def create_business_user(employee_id: int, email: str, password: str, is_admin:
         INSERT INTO OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS (
             EMPLOYEE_ID, EMAIL, PASSWORD_HASH, IS_ADMIN,
             IS_ACTIVE, EMAIL_VERIFIED
-        ) VALUES (:1, :2, :3, :4, TRUE, TRUE)
+        ) VALUES (?, ?, ?, ?, TRUE, TRUE)
         RETURNING PORTAL_USER_ID
         """
         
@@ -155,6 +337,7 @@ def create_business_user(employee_id: int, email: str, password: str, is_admin:
             hash_password(password),
             is_admin
         ])
+        clear_unknown_email(email)
         
         return result[0]['PORTAL_USER_ID'] if result else None
 
@@ -174,21 +357,17 @@ def business_login(email: str, password: str, ip_address: str, user_agent: str)
             return False, message, None
 
         # Get user
-        query = """
-        SELECT 
-            PORTAL_USER_ID,
-            EMPLOYEE_ID,
-            PASSWORD_HASH,
-            IS_ACTIVE,
-            FAILED_LOGIN_ATTEMPTS,
-            ACCOUNT_LOCKED,
-            ACCOUNT_LOCKED_UNTIL
-        FROM OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS
-        WHERE EMAIL = :1
-        """
-        
-        result = snowflake_conn.execute_query(query, [email.lower()])
+        email_key = _email_key(email)
+        result = None
+        if not _is_known_unknown_email(email_key):
+            result = snowflake_conn.execute_query(GET_LOGIN_USER_QUERY, [email.lower()])
         if not result:
+            # execute_query returns None on errors; only cache a real miss
+            if result is not None:
+                _remember_unknown_email(email_key)
+            # Burn the same hashing cost as a real check to avoid leaking
+            # which emails exist
+            verify_password(password, _DUMMY_HASH)
             return False, "Invalid email or password", None
 
         user = result[0]
@@ -213,15 +392,7 @@ def business_login(email: str, password: str, ip_address: str, user_agent: str)
             
             if session_id:
                 # Reset failed attempts
-                snowflake_conn.execute_query(
-                    """
-                    UPDATE OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS
-                    SET FAILED_LOGIN_ATTEMPTS = 0,
-                        LAST_LOGIN_DATE = CURRENT_TIMESTAMP()
-                    WHERE PORTAL_USER_ID = :1
-                    """,
-                    [user['PORTAL_USER_ID']]
-                )
+                snowflake_conn.execute_query(LOGIN_SUCCESS_QUERY, [user['PORTAL_USER_ID']])
 
                 log_business_event(
                     user['PORTAL_USER_ID'],
@@ -241,13 +412,7 @@ def business_login(email: str, password: str, ip_address: str, user_agent: str)
             locked_until = datetime.now() + timedelta(minutes=30) if lock_account else None
 
             snowflake_conn.execute_query(
-                """
-                UPDATE OPERATIONAL.BARBER.BUSINESS_PORTAL_USERS
-                SET FAILED_LOGIN_ATTEMPTS = :1,
-                    ACCOUNT_LOCKED = :2,
-                    ACCOUNT_LOCKED_UNTIL = :3
-                WHERE PORTAL_USER_ID = :4
-                """,
+                LOGIN_FAILURE_QUERY,
                 [failed_attempts, lock_account, locked_until, user['PORTAL_USER_ID']]
             )
 
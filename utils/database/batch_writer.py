@@ -0,0 +1,123 @@
+# utils/database/batch_writer.py
+"""
+Background batching for fire-and-forget INSERTs.
+Rows are queued in memory and written by a daemon thread as multi-row
+INSERT statements, so callers never wait on a Snowflake round-trip.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, List, Tuple
+from database.connection import snowflake_conn
+
+class BatchInsertWriter:
+    """
+    Queue rows for one INSERT statement and write them in batches.
+
+    Args:
+        insert_prefix (str): Statement up to and including VALUES
+        row_template (str): Placeholder tuple for one row, e.g. "(?, ?)"
+        max_rows (int): Flush once this many rows are waiting
+        flush_interval (float): Flush at least this often, in seconds
+        append_age_seconds (bool): Bind the seconds each row spent queued as
+            the last parameter, so templates can backdate timestamps with
+            DATEADD(second, -?, CURRENT_TIMESTAMP())
+        max_attempts (int): Writes tried per row before it is dropped; failed
+            batches go back on the queue for the next flush
+    """
+
+    def __init__(self,
+                 insert_prefix: str,
+                 row_template: str,
+                 max_rows: int = 100,
+                 flush_interval: float = 5.0,
+                 append_age_seconds: bool = False,
+                 max_attempts: int = 3):
+        self.insert_prefix = insert_prefix
+        self.row_template = row_template
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval
+        self.append_age_seconds = append_age_seconds
+        self.max_attempts = max_attempts
+        # (time queued, bind values, failed writes so far)
+        self._queue: "queue.Queue[Tuple[float, Tuple[Any, ...], int]]" = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def put(self, *values: Any) -> None:
+        """Queue one row of bind values without blocking"""
+        self._queue.put_nowait((time.monotonic(), values, 0))
+        self._ensure_thread()
+
+    def flush(self) -> None:
+        """Write every queued row now"""
+        while True:
+            rows = self._take(self.max_rows, block=False)
+            if not rows:
+                return
+            self._write(rows)
+
+    def _ensure_thread(self) -> None:
+        """Start the background writer on first use"""
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Background loop: collect a batch, then write it"""
+        while True:
+            rows = self._take(self.max_rows, block=True)
+            if rows:
+                self._write(rows)
+
+    def _take(self, limit: int, block: bool) -> List[Tuple[float, Tuple[Any, ...], int]]:
+        """Pull up to limit rows, waiting at most flush_interval when blocking"""
+        rows = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(rows) < limit:
+            try:
+                if block:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    rows.append(self._queue.get(timeout=timeout))
+                else:
+                    rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write(self, rows: List[Tuple[float, Tuple[Any, ...], int]]) -> None:
+        """Insert a batch of rows with a single statement, re-queuing it on failure"""
+        now = time.monotonic()
+        params = []
+        for queued_at, values, _ in rows:
+            params.extend(values)
+            if self.append_age_seconds:
+                params.append(int(now - queued_at))
+
+        query = self.insert_prefix + ", ".join([self.row_template] * len(rows))
+        try:
+            # execute_write raises rather than reporting to a page; this
+            # thread has no script context to show st.error in
+            with self._write_lock:
+                snowflake_conn.execute_write(query, params)
+        except Exception as e:
+            retry = [
+                (queued_at, values, attempts + 1)
+                for queued_at, values, attempts in rows
+                if attempts + 1 < self.max_attempts
+            ]
+            print(
+                f"Batch insert error: {str(e)}; "
+                f"retrying {len(retry)} rows, dropping {len(rows) - len(retry)}"
+            )
+            for row in retry:
+                self._queue.put_nowait(row)
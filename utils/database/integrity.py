@@ -4,170 +4,222 @@ Database integrity validation and constraint enforcement utilities.
 Ensures proper ID uniqueness and schema compliance.
 """
 
+import pandas as pd
 import streamlit as st
+from datetime import datetime
 from database.connection import snowflake_conn
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
-def validate_id_uniqueness() -> Dict[str, bool]:
-    """
-    Validate that CUSTOMER_ID and ACCOUNT_ID ranges don't overlap.
-    Returns dict with validation results.
-    """
-    results = {
+# Integrity checks are full-table scans; reuse results across reruns
+INTEGRITY_CACHE_TTL_SECONDS = 60
+
+def _empty_uniqueness_results() -> Dict[str, bool]:
+    """Validation results with every check failed."""
+    return {
         'customer_ids_unique': False,
         'account_ids_unique': False,
         'no_id_overlap': False,
-        'service_addresses_proper': False
+        'service_addresses_proper': False,
+        'computed_at': datetime.now()
+    }
+
+def _run_integrity_query(query: str) -> Dict:
+    """Run a single-row integrity query, raising if it fails."""
+    result = snowflake_conn.execute_query(query)
+    if not result:
+        # Raise so the failed check isn't cached
+        raise RuntimeError("Integrity query returned no result")
+    return result[0]
+
+@st.cache_data(ttl=INTEGRITY_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_id_uniqueness() -> Dict[str, bool]:
+    """Run the ID uniqueness checks (cached)."""
+    results = _empty_uniqueness_results()
+    
+    # Check customer ID uniqueness
+    customer_query = """
+    SELECT COUNT(*) as total_customers,
+           COUNT(DISTINCT CUSTOMER_ID) as unique_customer_ids
+    FROM OPERATIONAL.BARBER.CUSTOMER
+    """
+    row = _run_integrity_query(customer_query)
+    results['customer_ids_unique'] = (row['TOTAL_CUSTOMERS'] == row['UNIQUE_CUSTOMER_IDS'])
+    
+    # Check account ID uniqueness
+    account_query = """
+    SELECT COUNT(*) as total_accounts,
+           COUNT(DISTINCT ACCOUNT_ID) as unique_account_ids
+    FROM OPERATIONAL.BARBER.ACCOUNTS
+    """
+    row = _run_integrity_query(account_query)
+    results['account_ids_unique'] = (row['TOTAL_ACCOUNTS'] == row['UNIQUE_ACCOUNT_IDS'])
+    
+    # Check for ID overlap (should be none with proper IDENTITY columns);
+    # EXISTS stops at the first match instead of intersecting both tables
+    overlap_query = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM OPERATIONAL.BARBER.CUSTOMER c
+        JOIN OPERATIONAL.BARBER.ACCOUNTS a ON c.CUSTOMER_ID = a.ACCOUNT_ID
+    ) as overlap_exists
+    """
+    row = _run_integrity_query(overlap_query)
+    results['no_id_overlap'] = not row['OVERLAP_EXISTS']
+    
+    # Check SERVICE_ADDRESSES table integrity
+    addresses_query = """
+    SELECT 
+        COUNT(*) as total_addresses,
+        COUNT_IF(CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NULL) as customer_addresses,
+        COUNT_IF(ACCOUNT_ID IS NOT NULL AND CUSTOMER_ID IS NULL) as account_addresses,
+        COUNT_IF(CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NOT NULL) as invalid_both_ids,
+        COUNT_IF(CUSTOMER_ID IS NULL AND ACCOUNT_ID IS NULL) as invalid_no_ids
+    FROM OPERATIONAL.BARBER.SERVICE_ADDRESSES
+    """
+    row = _run_integrity_query(addresses_query)
+    # Service addresses should have exactly one ID type populated
+    invalid_records = row['INVALID_BOTH_IDS'] + row['INVALID_NO_IDS']
+    results['service_addresses_proper'] = (invalid_records == 0)
+    
+    # Store additional info for reporting
+    results['addresses_stats'] = {
+        'total': row['TOTAL_ADDRESSES'],
+        'customer_addresses': row['CUSTOMER_ADDRESSES'],
+        'account_addresses': row['ACCOUNT_ADDRESSES'],
+        'invalid_both_ids': row['INVALID_BOTH_IDS'],
+        'invalid_no_ids': row['INVALID_NO_IDS']
     }
     
+    return results
+
+def validate_id_uniqueness() -> Dict[str, bool]:
+    """
+    Validate that CUSTOMER_ID and ACCOUNT_ID ranges don't overlap.
+    Returns dict with validation results.
+    """
     try:
-        # Check customer ID uniqueness
-        customer_query = """
-        SELECT COUNT(*) as total_customers,
-               COUNT(DISTINCT CUSTOMER_ID) as unique_customer_ids
-        FROM OPERATIONAL.BARBER.CUSTOMER
-        """
-        customer_result = snowflake_conn.execute_query(customer_query)
-        if customer_result:
-            total = customer_result[0]['TOTAL_CUSTOMERS']
-            unique = customer_result[0]['UNIQUE_CUSTOMER_IDS']
-            results['customer_ids_unique'] = (total == unique)
-        
-        # Check account ID uniqueness
-        account_query = """
-        SELECT COUNT(*) as total_accounts,
-               COUNT(DISTINCT ACCOUNT_ID) as unique_account_ids
-        FROM OPERATIONAL.BARBER.ACCOUNTS
-        """
-        account_result = snowflake_conn.execute_query(account_query)
-        if account_result:
-            total = account_result[0]['TOTAL_ACCOUNTS']
-            unique = account_result[0]['UNIQUE_ACCOUNT_IDS']
-            results['account_ids_unique'] = (total == unique)
-        
-        # Check for ID overlap (should be none with proper IDENTITY columns)
-        overlap_query = """
-        SELECT COUNT(*) as overlap_count
-        FROM (
-            SELECT CUSTOMER_ID as ID FROM OPERATIONAL.BARBER.CUSTOMER
-            INTERSECT
-            SELECT ACCOUNT_ID as ID FROM OPERATIONAL.BARBER.ACCOUNTS
-        )
-        """
-        overlap_result = snowflake_conn.execute_query(overlap_query)
-        if overlap_result:
-            overlap_count = overlap_result[0]['OVERLAP_COUNT']
-            results['no_id_overlap'] = (overlap_count == 0)
-        
-        # Check SERVICE_ADDRESSES table integrity
-        addresses_query = """
-        SELECT 
-            COUNT(*) as total_addresses,
-            COUNT(CASE WHEN CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NULL THEN 1 END) as customer_addresses,
-            COUNT(CASE WHEN ACCOUNT_ID IS NOT NULL AND CUSTOMER_ID IS NULL THEN 1 END) as account_addresses,
-            COUNT(CASE WHEN CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NOT NULL THEN 1 END) as invalid_both_ids,
-            COUNT(CASE WHEN CUSTOMER_ID IS NULL AND ACCOUNT_ID IS NULL THEN 1 END) as invalid_no_ids
-        FROM OPERATIONAL.BARBER.SERVICE_ADDRESSES
-        """
-        addresses_result = snowflake_conn.execute_query(addresses_query)
-        if addresses_result:
-            row = addresses_result[0]
-            # Service addresses should have exactly one ID type populated
-            invalid_records = row['INVALID_BOTH_IDS'] + row['INVALID_NO_IDS']
-            results['service_addresses_proper'] = (invalid_records == 0)
-            
-            # Store additional info for reporting
-            results['addresses_stats'] = {
-                'total': row['TOTAL_ADDRESSES'],
-                'customer_addresses': row['CUSTOMER_ADDRESSES'],
-                'account_addresses': row['ACCOUNT_ADDRESSES'],
-                'invalid_both_ids': row['INVALID_BOTH_IDS'],
-                'invalid_no_ids': row['INVALID_NO_IDS']
-            }
-        
+        return _fetch_id_uniqueness()
     except Exception as e:
         st.error(f"Error validating database integrity: {str(e)}")
-        return results
+        return _empty_uniqueness_results()
+
+# Every schema violation in one statement so only one result stream is opened;
+# SERVICE_ADDRESSES is scanned once for both of its violation kinds
+SCHEMA_VIOLATIONS_QUERY = """
+SELECT CASE WHEN CUSTOMER_ID IS NOT NULL THEN 'SERVICE_ADDRESSES_BOTH_IDS'
+            ELSE 'SERVICE_ADDRESSES_NO_IDS' END AS VIOLATION_TYPE,
+       ADDRESS_ID AS RECORD_ID, CUSTOMER_ID, ACCOUNT_ID,
+       STREET_ADDRESS AS DETAIL, NULL AS SERVICE_DATE
+FROM OPERATIONAL.BARBER.SERVICE_ADDRESSES
+WHERE (CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NOT NULL)
+   OR (CUSTOMER_ID IS NULL AND ACCOUNT_ID IS NULL)
+UNION ALL
+SELECT 'SERVICE_TRANSACTION_BOTH_IDS', ID, CUSTOMER_ID, ACCOUNT_ID, SERVICE_NAME, SERVICE_DATE
+FROM OPERATIONAL.BARBER.SERVICE_TRANSACTION
+WHERE CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NOT NULL
+"""
+
+# Below this many violations each one gets its own expander; at or above it
+# they render as a single table
+VIOLATION_EXPANDER_LIMIT = 20
+
+def _build_violation(record: Dict) -> Dict[str, str]:
+    """Convert a SCHEMA_VIOLATIONS_QUERY row into a violation dict."""
+    violation_type = record['VIOLATION_TYPE']
     
-    return results
+    if violation_type == 'SERVICE_ADDRESSES_BOTH_IDS':
+        return {
+            'type': violation_type,
+            'table': 'SERVICE_ADDRESSES',
+            'address_id': record['RECORD_ID'],
+            'customer_id': record['CUSTOMER_ID'],
+            'account_id': record['ACCOUNT_ID'],
+            'address': record['DETAIL'],
+            'description': 'Address has both CUSTOMER_ID and ACCOUNT_ID populated'
+        }
+    
+    if violation_type == 'SERVICE_ADDRESSES_NO_IDS':
+        return {
+            'type': violation_type,
+            'table': 'SERVICE_ADDRESSES',
+            'address_id': record['RECORD_ID'],
+            'address': record['DETAIL'],
+            'description': 'Address has neither CUSTOMER_ID nor ACCOUNT_ID populated'
+        }
+    
+    return {
+        'type': violation_type,
+        'table': 'SERVICE_TRANSACTION',
+        'transaction_id': record['RECORD_ID'],
+        'customer_id': record['CUSTOMER_ID'],
+        'account_id': record['ACCOUNT_ID'],
+        'service_name': record['DETAIL'],
+        'service_date': str(record['SERVICE_DATE']),
+        'description': 'Transaction has both CUSTOMER_ID and ACCOUNT_ID populated'
+    }
+
+def iter_schema_violations() -> Iterator[Dict[str, str]]:
+    """
+    Identify specific records that violate schema rules.
+    Yields violations one at a time as rows stream in from Snowflake.
+    """
+    for record in snowflake_conn.iterate_query(
+        SCHEMA_VIOLATIONS_QUERY, error_msg="Error finding schema violations"
+    ):
+        yield _build_violation(record)
+
+@st.cache_data(ttl=INTEGRITY_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_schema_violations() -> List[Dict[str, str]]:
+    """Load every schema violation (cached)."""
+    # execute_query rather than iterate_query: the whole list is kept anyway,
+    # and a failure comes back as None instead of an empty stream
+    result = snowflake_conn.execute_query(
+        SCHEMA_VIOLATIONS_QUERY, error_msg="Error finding schema violations"
+    )
+    if result is None:
+        # Raise so the failed lookup isn't cached
+        raise RuntimeError("Could not load schema violations")
+    return [_build_violation(record) for record in result]
 
 def get_schema_violations() -> List[Dict[str, str]]:
     """
     Identify specific records that violate schema rules.
     Returns list of violations for manual correction.
     """
-    violations = []
-    
     try:
-        # Find SERVICE_ADDRESSES records with both IDs populated
-        both_ids_query = """
-        SELECT ADDRESS_ID, CUSTOMER_ID, ACCOUNT_ID, STREET_ADDRESS
-        FROM OPERATIONAL.BARBER.SERVICE_ADDRESSES
-        WHERE CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NOT NULL
-        """
-        both_ids_result = snowflake_conn.execute_query(both_ids_query)
-        
-        for record in both_ids_result or []:
-            violations.append({
-                'type': 'SERVICE_ADDRESSES_BOTH_IDS',
-                'table': 'SERVICE_ADDRESSES',
-                'address_id': record['ADDRESS_ID'],
-                'customer_id': record['CUSTOMER_ID'],
-                'account_id': record['ACCOUNT_ID'],
-                'address': record['STREET_ADDRESS'],
-                'description': 'Address has both CUSTOMER_ID and ACCOUNT_ID populated'
-            })
-        
-        # Find SERVICE_ADDRESSES records with no IDs populated
-        no_ids_query = """
-        SELECT ADDRESS_ID, STREET_ADDRESS
-        FROM OPERATIONAL.BARBER.SERVICE_ADDRESSES
-        WHERE CUSTOMER_ID IS NULL AND ACCOUNT_ID IS NULL
-        """
-        no_ids_result = snowflake_conn.execute_query(no_ids_query)
-        
-        for record in no_ids_result or []:
-            violations.append({
-                'type': 'SERVICE_ADDRESSES_NO_IDS',
-                'table': 'SERVICE_ADDRESSES',
-                'address_id': record['ADDRESS_ID'],
-                'address': record['STREET_ADDRESS'],
-                'description': 'Address has neither CUSTOMER_ID nor ACCOUNT_ID populated'
-            })
-        
-        # Find SERVICE_TRANSACTION records with both IDs populated
-        transaction_both_query = """
-        SELECT ID, CUSTOMER_ID, ACCOUNT_ID, SERVICE_NAME, SERVICE_DATE
-        FROM OPERATIONAL.BARBER.SERVICE_TRANSACTION
-        WHERE CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NOT NULL
-        """
-        transaction_both_result = snowflake_conn.execute_query(transaction_both_query)
-        
-        for record in transaction_both_result or []:
-            violations.append({
-                'type': 'SERVICE_TRANSACTION_BOTH_IDS',
-                'table': 'SERVICE_TRANSACTION',
-                'transaction_id': record['ID'],
-                'customer_id': record['CUSTOMER_ID'],
-                'account_id': record['ACCOUNT_ID'],
-                'service_name': record['SERVICE_NAME'],
-                'service_date': str(record['SERVICE_DATE']),
-                'description': 'Transaction has both CUSTOMER_ID and ACCOUNT_ID populated'
-            })
-        
-    except Exception as e:
-        st.error(f"Error finding schema violations: {str(e)}")
-    
-    return violations
+        return _fetch_schema_violations()
+    except Exception:
+        # execute_query has already reported the error
+        return []
+
+def clear_integrity_cache() -> None:
+    """Drop cached integrity results so the next report re-runs the checks."""
+    _fetch_id_uniqueness.clear()
+    _fetch_schema_violations.clear()
+
+def _display_violation(violation: Dict[str, str]) -> None:
+    """Render a single violation as an expander."""
+    with st.expander(f"{violation['type']} - {violation['table']}"):
+        for key, value in violation.items():
+            if key not in ['type', 'table']:
+                st.write(f"**{key.replace('_', ' ').title()}:** {value}")
 
 def display_integrity_report():
     """Display database integrity validation report in Streamlit."""
     st.subheader("Database Integrity Report")
     
+    refresh_col, computed_col = st.columns([1, 3])
+    with refresh_col:
+        if st.button("Refresh"):
+            clear_integrity_cache()
+    
     # Run validation
     results = validate_id_uniqueness()
     violations = get_schema_violations()
     
+    with computed_col:
+        st.caption(f"Last computed: {results['computed_at']:%Y-%m-%d %H:%M:%S}")
+    
     # Display overall status
     col1, col2 = st.columns(2)
     
@@ -196,11 +248,12 @@ def display_integrity_report():
         st.markdown("### Schema Violations")
         st.error(f"Found {len(violations)} schema violations that need attention:")
         
-        for violation in violations:
-            with st.expander(f"{violation['type']} - {violation['table']}"):
-                for key, value in violation.items():
-                    if key not in ['type', 'table']:
-                        st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+        if len(violations) < VIOLATION_EXPANDER_LIMIT:
+            for violation in violations:
+                _display_violation(violation)
+        else:
+            # One table ships a single payload instead of a widget per row
+            st.dataframe(pd.DataFrame(violations), use_container_width=True, hide_index=True)
     else:
         st.success("✅ No schema violations found!")
 
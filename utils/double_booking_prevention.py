@@ -4,9 +4,17 @@ Centralized double booking prevention system for Ez Biz application.
 Ensures no scheduling conflicts across business and customer portals.
 """
 
+import json
+import threading
+import numpy as np
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date, time, timedelta
-from typing import List, Tuple, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from dateutil.relativedelta import relativedelta
 from database.connection import SnowflakeConnection
 from utils.business.info import fetch_business_info
 from utils.operating_hours import get_business_hours_for_date as get_hours_with_session_support
@@ -14,28 +22,28 @@ from utils.operating_hours import get_business_hours_for_date as get_hours_with_
 # Initialize database connection
 snowflake_conn = SnowflakeConnection.get_instance()
 
-def debug_print(msg: str) -> None:
-    """Helper function for debug logging with defensive access to debug_mode."""
-    if st.session_state.get('debug_mode', False):
-        print(f"DEBUG: {msg}")
-        st.write(f"DEBUG: {msg}")
+def debug_print(msg: Union[str, Callable[[], str]]) -> None:
+    """
+    Helper function for debug logging with defensive access to debug_mode.
+    
+    msg may be a zero-argument callable so the message is only built when
+    debug mode is on.
+    """
+    if not st.session_state.get('debug_mode', False):
+        return
+    if callable(msg):
+        msg = msg()
+    print(f"DEBUG: {msg}")
+    st.write(f"DEBUG: {msg}")
 
-class BookingConflict:
+class BookingConflict(NamedTuple):
     """Represents a booking conflict with detailed information."""
-    
-    def __init__(self, 
-                 conflict_time: time, 
-                 conflict_date: date,
-                 existing_service: str,
-                 existing_customer: str,
-                 conflict_duration: int,
-                 transaction_id: int):
-        self.conflict_time = conflict_time
-        self.conflict_date = conflict_date
-        self.existing_service = existing_service
-        self.existing_customer = existing_customer
-        self.conflict_duration = conflict_duration
-        self.transaction_id = transaction_id
+    conflict_time: time
+    conflict_date: date
+    existing_service: str
+    existing_customer: str
+    conflict_duration: int
+    transaction_id: int
     
     def get_conflict_message(self) -> str:
         """Get human-readable conflict message."""
@@ -56,10 +64,43 @@ def get_business_hours_for_date(service_date: date) -> Tuple[time, time]:
     # Use the session-aware function from operating_hours module
     return get_hours_with_session_support(service_date)
 
+# Service durations rarely change, so repeat lookups for the same
+# services are served from cache for ten minutes
+SERVICE_DURATION_CACHE_TTL_SECONDS = 600
+
+# Names are bound as one JSON array so the SQL text is the same for any
+# number of services and Snowflake can reuse its compiled plan
+SERVICE_DURATION_QUERY = """
+SELECT SERVICE_NAME, MAX(COALESCE(SERVICE_DURATION, 60)) as SERVICE_DURATION
+FROM OPERATIONAL.BARBER.SERVICES
+WHERE SERVICE_NAME IN (
+    SELECT VALUE::STRING FROM TABLE(FLATTEN(INPUT => PARSE_JSON(?)))
+)
+GROUP BY SERVICE_NAME
+"""
+
+@st.cache_data(ttl=SERVICE_DURATION_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_service_durations(service_names: Tuple[str, ...]) -> Dict[str, int]:
+    """Query the duration of each name in a sorted tuple of unique service names (cached)."""
+    duration_result = snowflake_conn.execute_query(
+        SERVICE_DURATION_QUERY, [json.dumps(list(service_names))]
+    )
+    if duration_result is None:
+        # Raise so the failed lookup isn't cached
+        raise RuntimeError("Could not load service durations")
+    return {row['SERVICE_NAME']: int(row['SERVICE_DURATION']) for row in duration_result}
+
+def clear_service_durations_cache() -> None:
+    """Drop cached durations after a service is created or edited."""
+    _fetch_service_durations.clear()
+
 def get_service_duration(service_names: List[str]) -> int:
     """
     Calculate total duration for multiple services.
     
+    A service listed more than once is counted once per listing, and a
+    name with no matching service counts as 60 minutes.
+    
     Args:
         service_names: List of service names
     
@@ -70,23 +111,84 @@ def get_service_duration(service_names: List[str]) -> int:
         return 60  # Default duration
     
     try:
-        placeholders = ','.join(['?' for _ in service_names])
-        services_query = f"""
-        SELECT SUM(COALESCE(SERVICE_DURATION, 60)) as TOTAL_DURATION
-        FROM OPERATIONAL.BARBER.SERVICES
-        WHERE SERVICE_NAME IN ({placeholders})
-        """
-        
-        duration_result = snowflake_conn.execute_query(services_query, service_names)
-        if duration_result and duration_result[0]['TOTAL_DURATION']:
-            return int(duration_result[0]['TOTAL_DURATION'])
-        
-        return len(service_names) * 60  # Fallback: 60 minutes per service
+        counts = Counter(service_names)
+        durations = _fetch_service_durations(tuple(sorted(counts)))
+        return sum(count * durations.get(name, 60) for name, count in counts.items())
         
     except Exception as e:
         debug_print(f"Error calculating service duration: {str(e)}")
         return len(service_names) * 60  # Fallback: 60 minutes per service
 
+# Bookings are cached briefly so slot grids and repeated checks on the same
+# date don't each cost a Snowflake round-trip; anything that creates, cancels,
+# reschedules or changes the status of a booking calls clear_bookings_cache
+BOOKINGS_CACHE_TTL_SECONDS = 60
+
+# Shared by the single-day and multi-day lookups; {date_filter} is a
+# parameterized condition on ST.SERVICE_DATE
+BOOKINGS_QUERY_TEMPLATE = """
+SELECT 
+    ST.ID as TRANSACTION_ID,
+    ST.SERVICE_DATE,
+    ST.START_TIME,
+    ST.END_TIME,
+    ST.SERVICE_NAME,
+    COALESCE(S.SERVICE_DURATION, 60) as SERVICE_DURATION,
+    COALESCE(C.FIRST_NAME || ' ' || C.LAST_NAME, A.ACCOUNT_NAME) AS CUSTOMER_NAME,
+    ST.STATUS,
+    CASE 
+        WHEN C.CUSTOMER_ID IS NOT NULL THEN 'Residential'
+        WHEN A.ACCOUNT_ID IS NOT NULL THEN 'Commercial'
+        ELSE 'Unknown'
+    END AS CUSTOMER_TYPE
+FROM OPERATIONAL.BARBER.SERVICE_TRANSACTION ST
+LEFT JOIN OPERATIONAL.BARBER.SERVICES S ON ST.SERVICE_ID = S.SERVICE_ID
+LEFT JOIN OPERATIONAL.BARBER.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
+LEFT JOIN OPERATIONAL.BARBER.ACCOUNTS A ON ST.ACCOUNT_ID = A.ACCOUNT_ID
+WHERE ST.SERVICE_DATE {date_filter}
+AND ST.STATUS IN ('SCHEDULED', 'IN_PROGRESS')
+ORDER BY ST.SERVICE_DATE, ST.START_TIME
+"""
+
+def _parse_booking_time(value: Any) -> Optional[time]:
+    """Convert a START_TIME value from the database to a time, or None if unusable."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            hour, minute, second = map(int, value.split(':'))
+            return time(hour, minute, second)
+        except ValueError:
+            return None  # Skip invalid time format
+    if isinstance(value, datetime):
+        return value.time()
+    return value
+
+def _add_booking_times(booking: Dict[str, Any], service_date: date) -> Dict[str, Any]:
+    """Attach parsed _start_dt/_end_dt datetimes to a booking row."""
+    start_time = _parse_booking_time(booking['START_TIME'])
+    if start_time is None:
+        booking['_start_dt'] = booking['_end_dt'] = None
+    else:
+        booking['_start_dt'] = datetime.combine(service_date, start_time)
+        booking['_end_dt'] = booking['_start_dt'] + timedelta(
+            minutes=int(booking['SERVICE_DURATION'] or 60)
+        )
+    return booking
+
+DAY_BOOKINGS_QUERY = BOOKINGS_QUERY_TEMPLATE.format(date_filter="= ?")
+
+@st.cache_data(ttl=BOOKINGS_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_existing_bookings(service_date: date) -> List[Dict[str, Any]]:
+    """Query bookings for a date (cached by date)."""
+    bookings = snowflake_conn.execute_query(DAY_BOOKINGS_QUERY, [service_date])
+    if bookings is None:
+        # Raise so the failed lookup isn't cached
+        raise RuntimeError(f"Could not load bookings for {service_date}")
+    
+    # Parse times once here so cached rows are ready for overlap checks
+    return [_add_booking_times(booking, service_date) for booking in bookings]
+
 def get_existing_bookings(service_date: date) -> List[Dict[str, Any]]:
     """
     Get all existing bookings for a specific date.
@@ -98,37 +200,199 @@ def get_existing_bookings(service_date: date) -> List[Dict[str, Any]]:
         List of booking dictionaries with scheduling details
     """
     try:
-        bookings_query = """
-        SELECT 
-            ST.ID as TRANSACTION_ID,
-            ST.START_TIME,
-            ST.END_TIME,
-            ST.SERVICE_NAME,
-            COALESCE(S.SERVICE_DURATION, 60) as SERVICE_DURATION,
-            COALESCE(C.FIRST_NAME || ' ' || C.LAST_NAME, A.ACCOUNT_NAME) AS CUSTOMER_NAME,
-            ST.STATUS,
-            CASE 
-                WHEN C.CUSTOMER_ID IS NOT NULL THEN 'Residential'
-                WHEN A.ACCOUNT_ID IS NOT NULL THEN 'Commercial'
-                ELSE 'Unknown'
-            END AS CUSTOMER_TYPE
-        FROM OPERATIONAL.BARBER.SERVICE_TRANSACTION ST
-        LEFT JOIN OPERATIONAL.BARBER.SERVICES S ON ST.SERVICE_ID = S.SERVICE_ID
-        LEFT JOIN OPERATIONAL.BARBER.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
-        LEFT JOIN OPERATIONAL.BARBER.ACCOUNTS A ON ST.ACCOUNT_ID = A.ACCOUNT_ID
-        WHERE ST.SERVICE_DATE = ?
-        AND ST.STATUS IN ('SCHEDULED', 'IN_PROGRESS')
-        ORDER BY ST.START_TIME
-        """
-        
-        bookings = snowflake_conn.execute_query(bookings_query, [service_date.strftime('%Y-%m-%d')])
-        return bookings or []
+        return _fetch_existing_bookings(service_date)
         
     except Exception as e:
         debug_print(f"Error fetching existing bookings: {str(e)}")
         st.error(f"Error checking existing bookings: {str(e)}")
         return []
 
+def _to_date(value: Any) -> date:
+    """Normalize a SERVICE_DATE value from the database to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+RANGE_BOOKINGS_QUERY = BOOKINGS_QUERY_TEMPLATE.format(date_filter="BETWEEN ? AND ?")
+
+def get_bookings_in_range(start_date: date, end_date: date) -> Dict[date, List[Dict[str, Any]]]:
+    """
+    Get existing bookings between two dates (inclusive) with a single query.
+    
+    Args:
+        start_date: First date to include
+        end_date: Last date to include
+    
+    Returns:
+        Dictionary mapping each date to its bookings; dates without
+        bookings map to an empty list
+    """
+    bookings = snowflake_conn.execute_query(
+        RANGE_BOOKINGS_QUERY,
+        [start_date, end_date]
+    )
+    if bookings is None:
+        raise RuntimeError(f"Could not load bookings from {start_date} to {end_date}")
+    
+    bookings_by_date = defaultdict(list)
+    for booking in bookings:
+        booking_date = _to_date(booking['SERVICE_DATE'])
+        bookings_by_date[booking_date].append(_add_booking_times(booking, booking_date))
+    
+    return bookings_by_date
+
+def clear_bookings_cache(service_date: Optional[date] = None) -> None:
+    """
+    Invalidate cached bookings after a booking is created or changed.
+    
+    st.cache_data can only be cleared as a whole, so service_date is
+    accepted for call-site clarity but every cached date is dropped.
+    """
+    _fetch_existing_bookings.clear()
+
+# Minimum gap kept between back-to-back bookings
+BOOKING_BUFFER_MINUTES = 15
+
+def _seconds_to_time(seconds: int) -> time:
+    """Convert seconds since midnight to a time."""
+    return time(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
+@dataclass
+class DayBookings:
+    """One day's bookings as parallel arrays sorted by start time (seconds since midnight)."""
+    starts: np.ndarray
+    ends: np.ndarray
+    running_max_ends: np.ndarray
+    durations: np.ndarray
+    transaction_ids: np.ndarray
+    service_names: np.ndarray
+    customer_names: np.ndarray
+    statuses: np.ndarray
+
+    @classmethod
+    def from_db_rows(
+        cls,
+        service_date: date,
+        bookings: List[Dict[str, Any]],
+        exclude_transaction_id: Optional[int] = None
+    ) -> 'DayBookings':
+        day_start = datetime.combine(service_date, time.min)
+        kept = []
+        
+        for booking in bookings:
+            # Skip if this is the same transaction (for rescheduling)
+            if exclude_transaction_id and booking['TRANSACTION_ID'] == exclude_transaction_id:
+                continue
+            
+            # Rows from the booking lookups carry pre-parsed times; parse others here
+            if '_start_dt' not in booking:
+                booking = _add_booking_times(dict(booking), service_date)
+            
+            # Skip if booking doesn't have valid time data
+            if booking['_start_dt'] is None:
+                continue
+            
+            kept.append(booking)
+        
+        kept.sort(key=lambda booking: booking['_start_dt'])
+        
+        starts = np.array(
+            [(booking['_start_dt'] - day_start).total_seconds() for booking in kept], dtype=np.int64
+        )
+        durations = np.array([int(booking['SERVICE_DURATION'] or 60) for booking in kept], dtype=np.int64)
+        ends = starts + durations * 60
+        
+        return cls(
+            starts=starts,
+            ends=ends,
+            # Durations vary, so a later booking can end before an earlier one;
+            # the running maximum lets one lookup answer "does anything overlap"
+            running_max_ends=np.maximum.accumulate(ends) if len(ends) else ends,
+            durations=durations,
+            transaction_ids=np.array([booking['TRANSACTION_ID'] for booking in kept], dtype=object),
+            service_names=np.array([booking['SERVICE_NAME'] for booking in kept], dtype=object),
+            customer_names=np.array([booking['CUSTOMER_NAME'] for booking in kept], dtype=object),
+            statuses=np.array([booking.get('STATUS') for booking in kept], dtype=object)
+        )
+
+    def _candidates(self, requested_ends, buffer_seconds: int):
+        """Number of bookings starting early enough to overlap each requested end."""
+        return np.searchsorted(self.starts, requested_ends + buffer_seconds, side='left')
+
+    def overlap_mask(
+        self,
+        requested_starts: np.ndarray,
+        requested_ends: np.ndarray,
+        buffer_minutes: int = BOOKING_BUFFER_MINUTES
+    ) -> np.ndarray:
+        """
+        Check many requested ranges against these bookings at once.
+        
+        Args:
+            requested_starts: Requested starts in seconds since midnight
+            requested_ends: Requested ends in seconds since midnight
+            buffer_minutes: Buffer time in minutes between bookings
+        
+        Returns:
+            Boolean array, True where the requested range overlaps a booking
+        """
+        requested_starts = np.asarray(requested_starts, dtype=np.int64)
+        if not len(self.starts):
+            return np.zeros(requested_starts.shape, dtype=bool)
+        
+        buffer_seconds = buffer_minutes * 60
+        candidates = self._candidates(np.asarray(requested_ends, dtype=np.int64), buffer_seconds)
+        latest_end = self.running_max_ends[np.maximum(candidates - 1, 0)]
+        return (candidates > 0) & (latest_end + buffer_seconds > requested_starts)
+
+    def overlapping(
+        self,
+        requested_start: int,
+        requested_end: int,
+        buffer_minutes: int = BOOKING_BUFFER_MINUTES
+    ) -> np.ndarray:
+        """Indices of bookings that overlap one requested range."""
+        # Only bookings starting before the buffered requested end can overlap;
+        # of those, the ones still running at the buffered start conflict
+        buffer_seconds = buffer_minutes * 60
+        candidates = int(self._candidates(requested_end, buffer_seconds))
+        return np.nonzero(self.ends[:candidates] + buffer_seconds > requested_start)[0]
+
+    def longest_gap(
+        self,
+        open_seconds: int,
+        close_seconds: int,
+        buffer_minutes: int = BOOKING_BUFFER_MINUTES
+    ) -> int:
+        """Longest stretch in seconds between open and close not blocked by a buffered booking."""
+        buffer_seconds = buffer_minutes * 60
+        if not len(self.starts):
+            return close_seconds - open_seconds
+        
+        # Each gap runs from the latest buffered end so far to the next buffered start
+        gap_starts = np.concatenate(([open_seconds], self.running_max_ends + buffer_seconds))
+        gap_ends = np.concatenate((self.starts - buffer_seconds, [close_seconds]))
+        gaps = np.minimum(gap_ends, close_seconds) - np.maximum(gap_starts, open_seconds)
+        return int(gaps.max())
+
+    def conflicts(self, service_date: date, indices=None) -> List['BookingConflict']:
+        """Build BookingConflict objects for the given (default: all) bookings."""
+        if indices is None:
+            indices = range(len(self.starts))
+        return [
+            BookingConflict(
+                conflict_time=_seconds_to_time(int(self.starts[i])),
+                conflict_date=service_date,
+                existing_service=self.service_names[i],
+                existing_customer=self.customer_names[i] or 'Unknown Customer',
+                conflict_duration=int(self.durations[i]),
+                transaction_id=self.transaction_ids[i]
+            )
+            for i in indices
+        ]
+
 def check_time_overlap(
     requested_start: datetime,
     requested_end: datetime,
@@ -157,10 +421,40 @@ def check_time_overlap(
     # and requested end is after existing start
     return requested_start < buffered_end and requested_end > buffered_start
 
+def time_to_minutes(value: time) -> int:
+    """Convert a time to minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+def check_minute_overlap(
+    requested_start: int,
+    requested_end: int,
+    existing_start: int,
+    existing_end: int,
+    buffer_minutes: int = 15
+) -> bool:
+    """
+    Integer form of check_time_overlap for loops over many slots.
+    
+    All arguments are minutes since midnight, so no datetime or timedelta
+    objects are created per comparison.
+    
+    Args:
+        requested_start: Start of requested booking
+        requested_end: End of requested booking
+        existing_start: Start of existing booking
+        existing_end: End of existing booking
+        buffer_minutes: Buffer time in minutes between bookings
+    
+    Returns:
+        True if there's an overlap, False otherwise
+    """
+    return requested_start < existing_end + buffer_minutes and requested_end > existing_start - buffer_minutes
+
 def validate_business_hours(
     service_date: date,
     service_time: time,
-    service_duration: int
+    service_duration: int,
+    business_hours: Optional[Tuple[time, time]] = None
 ) -> Tuple[bool, Optional[str]]:
     """
     Validate that the service time is within business hours.
@@ -169,12 +463,13 @@ def validate_business_hours(
         service_date: Date of the service
         service_time: Start time of the service
         service_duration: Duration of service in minutes
+        business_hours: (start, end) already looked up for service_date, if any
     
     Returns:
         Tuple of (is_valid, error_message)
     """
     try:
-        business_start, business_end = get_business_hours_for_date(service_date)
+        business_start, business_end = business_hours or get_business_hours_for_date(service_date)
         
         # Calculate service end time
         service_start_datetime = datetime.combine(service_date, service_time)
@@ -195,11 +490,126 @@ def validate_business_hours(
         debug_print(f"Error validating business hours: {str(e)}")
         return False, f"Error validating business hours: {str(e)}"
 
+# Only bookings that overlap the buffered window are returned: an existing
+# booking conflicts when it starts before the buffered requested end and
+# finishes after the buffered requested start. The excluded transaction is
+# bound as NULL when there is none, so the SQL text never changes.
+CONFLICTING_BOOKINGS_QUERY = BOOKINGS_QUERY_TEMPLATE.format(date_filter="""= ?
+AND ST.START_TIME IS NOT NULL
+AND TIMESTAMP_NTZ_FROM_PARTS(ST.SERVICE_DATE, ST.START_TIME) < TO_TIMESTAMP_NTZ(?)
+AND DATEADD(minute, COALESCE(S.SERVICE_DURATION, 60),
+            TIMESTAMP_NTZ_FROM_PARTS(ST.SERVICE_DATE, ST.START_TIME)) > TO_TIMESTAMP_NTZ(?)
+AND ST.ID <> COALESCE(?, -1)""")
+
+# Same check when only "is there any conflict" matters
+FIRST_CONFLICTING_BOOKING_QUERY = CONFLICTING_BOOKINGS_QUERY + "LIMIT 1\n"
+
+def get_conflicting_bookings(
+    service_date: date,
+    requested_start: datetime,
+    requested_end: datetime,
+    buffer_minutes: int = BOOKING_BUFFER_MINUTES,
+    exclude_transaction_id: Optional[int] = None,
+    first_only: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Query only the bookings that overlap a requested window.
+    
+    Always reads Snowflake directly, so the final check before a booking
+    is saved never relies on cached bookings.
+    
+    Args:
+        service_date: Date of the requested service
+        requested_start: Start of the requested booking
+        requested_end: End of the requested booking
+        buffer_minutes: Buffer time in minutes between bookings
+        exclude_transaction_id: Transaction ID to exclude (for rescheduling)
+        first_only: Stop after the earliest overlapping booking
+    
+    Returns:
+        List of overlapping booking dictionaries
+    """
+    buffer = timedelta(minutes=buffer_minutes)
+    query = FIRST_CONFLICTING_BOOKING_QUERY if first_only else CONFLICTING_BOOKINGS_QUERY
+    bookings = snowflake_conn.execute_query(query, [
+        service_date,
+        requested_end + buffer,
+        requested_start - buffer,
+        exclude_transaction_id or None
+    ])
+    if bookings is None:
+        raise RuntimeError(f"Could not check bookings for {service_date}")
+    
+    return [_add_booking_times(booking, service_date) for booking in bookings]
+
+def find_booking_conflicts(
+    service_date: date,
+    service_time: time,
+    total_duration: int,
+    existing_bookings: List[Dict[str, Any]],
+    exclude_transaction_id: Optional[int] = None,
+    business_hours: Optional[Tuple[time, time]] = None,
+    return_first_only: bool = False
+) -> Tuple[bool, Optional[str], List[BookingConflict]]:
+    """
+    Check a requested time against bookings that were already fetched.
+    
+    Args:
+        service_date: Date of the requested service
+        service_time: Start time of the requested service
+        total_duration: Duration of the requested service in minutes
+        existing_bookings: Rows from get_existing_bookings for service_date
+        exclude_transaction_id: Transaction ID to exclude from conflict checking (for rescheduling)
+        business_hours: (start, end) already looked up for service_date, if any
+        return_first_only: Only report availability; on a conflict return
+            (False, None, []) without building conflicts or a message
+    
+    Returns:
+        Tuple of (is_available, error_message, list_of_conflicts)
+    """
+    # Validate business hours first
+    business_valid, business_error = validate_business_hours(
+        service_date, service_time, total_duration, business_hours
+    )
+    if not business_valid:
+        return False, business_error, []
+    
+    # Calculate requested booking time range in seconds since midnight
+    requested_start = service_time.hour * 3600 + service_time.minute * 60 + service_time.second
+    requested_end = requested_start + total_duration * 60
+    
+    day_bookings = DayBookings.from_db_rows(service_date, existing_bookings, exclude_transaction_id)
+    if return_first_only:
+        if day_bookings.overlap_mask([requested_start], [requested_end])[0]:
+            return False, None, []
+        return True, None, []
+    
+    return _conflict_result(
+        day_bookings.conflicts(service_date, day_bookings.overlapping(requested_start, requested_end))
+    )
+
+def _conflict_result(
+    conflicts: List[BookingConflict]
+) -> Tuple[bool, Optional[str], List[BookingConflict]]:
+    """Build the (is_available, error_message, conflicts) result."""
+    if conflicts:
+        # Generate detailed error message
+        primary_conflict = conflicts[0]
+        error_message = primary_conflict.get_conflict_message()
+        
+        if len(conflicts) > 1:
+            error_message += f" (and {len(conflicts) - 1} other conflict{'s' if len(conflicts) > 2 else ''})"
+        
+        return False, error_message, conflicts
+    
+    return True, None, []
+
 def check_for_booking_conflicts(
     service_date: date,
     service_time: time,
     service_names: List[str],
-    exclude_transaction_id: Optional[int] = None
+    exclude_transaction_id: Optional[int] = None,
+    return_first_only: bool = False
 ) -> Tuple[bool, Optional[str], List[BookingConflict]]:
     """
     Comprehensive check for booking conflicts.
@@ -209,6 +619,8 @@ def check_for_booking_conflicts(
         service_time: Start time of the requested service
         service_names: List of service names being scheduled
         exclude_transaction_id: Transaction ID to exclude from conflict checking (for rescheduling)
+        return_first_only: Only report availability; on a conflict return
+            (False, None, []) without building conflicts or a message
     
     Returns:
         Tuple of (is_available, error_message, list_of_conflicts)
@@ -226,59 +638,18 @@ def check_for_booking_conflicts(
         requested_start = datetime.combine(service_date, service_time)
         requested_end = requested_start + timedelta(minutes=total_duration)
         
-        # Get existing bookings for the date
-        existing_bookings = get_existing_bookings(service_date)
+        conflicting_bookings = get_conflicting_bookings(
+            service_date,
+            requested_start,
+            requested_end,
+            exclude_transaction_id=exclude_transaction_id,
+            first_only=return_first_only
+        )
+        if return_first_only:
+            return not conflicting_bookings, None, []
         
-        conflicts = []
-        
-        for booking in existing_bookings:
-            # Skip if this is the same transaction (for rescheduling)
-            if exclude_transaction_id and booking['TRANSACTION_ID'] == exclude_transaction_id:
-                continue
-            
-            # Skip if booking doesn't have valid time data
-            if not booking['START_TIME']:
-                continue
-            
-            # Handle different time formats from database
-            booking_start_time = booking['START_TIME']
-            if isinstance(booking_start_time, str):
-                try:
-                    hour, minute, second = map(int, booking_start_time.split(':'))
-                    booking_start_time = time(hour, minute, second)
-                except ValueError:
-                    continue  # Skip invalid time format
-            elif isinstance(booking_start_time, datetime):
-                booking_start_time = booking_start_time.time()
-            
-            # Calculate booking end time
-            booking_duration = int(booking['SERVICE_DURATION'] or 60)
-            booking_start = datetime.combine(service_date, booking_start_time)
-            booking_end = booking_start + timedelta(minutes=booking_duration)
-            
-            # Check for time overlap with 15-minute buffer
-            if check_time_overlap(requested_start, requested_end, booking_start, booking_end, buffer_minutes=15):
-                conflict = BookingConflict(
-                    conflict_time=booking_start_time,
-                    conflict_date=service_date,
-                    existing_service=booking['SERVICE_NAME'],
-                    existing_customer=booking['CUSTOMER_NAME'] or 'Unknown Customer',
-                    conflict_duration=booking_duration,
-                    transaction_id=booking['TRANSACTION_ID']
-                )
-                conflicts.append(conflict)
-        
-        if conflicts:
-            # Generate detailed error message
-            primary_conflict = conflicts[0]
-            error_message = primary_conflict.get_conflict_message()
-            
-            if len(conflicts) > 1:
-                error_message += f" (and {len(conflicts) - 1} other conflict{'s' if len(conflicts) > 2 else ''})"
-            
-            return False, error_message, conflicts
-        
-        return True, None, []
+        conflicting = DayBookings.from_db_rows(service_date, conflicting_bookings)
+        return _conflict_result(conflicting.conflicts(service_date))
         
     except Exception as e:
         debug_print(f"Error checking booking conflicts: {str(e)}")
@@ -303,34 +674,43 @@ def get_available_time_slots_enhanced(
         List of available time slots
     """
     try:
+        # Past dates can't be booked, so skip every lookup
+        if service_date < date.today():
+            return []
+        
         # Get business hours
         business_start, business_end = get_business_hours_for_date(service_date)
         
         # Calculate total service duration
         total_duration = get_service_duration(service_names)
         
-        # Generate time slots
-        current_slot = datetime.combine(service_date, business_start)
-        end_time = datetime.combine(service_date, business_end)
+        # Fetch and index the day's bookings once; every slot is checked against it
+        day_bookings = DayBookings.from_db_rows(service_date, get_existing_bookings(service_date))
         
-        available_slots = []
+        day_start = datetime.combine(service_date, time.min)
+        open_seconds = int((datetime.combine(service_date, business_start) - day_start).total_seconds())
+        close_seconds = int((datetime.combine(service_date, business_end) - day_start).total_seconds())
+        duration_seconds = total_duration * 60
         
-        # Generate slots that can fit the entire service within business hours
-        while current_slot + timedelta(minutes=total_duration) <= end_time:
-            slot_time = current_slot.time()
-            
-            # Check if this slot is available (no conflicts)
-            is_available, _, _ = check_for_booking_conflicts(
-                service_date=service_date,
-                service_time=slot_time,
-                service_names=service_names
-            )
-            
-            if is_available:
-                available_slots.append(slot_time)
-            
-            # Move to next slot
-            current_slot += timedelta(minutes=slot_duration_minutes)
+        # A fully booked day has no gap long enough for the service
+        if day_bookings.longest_gap(open_seconds, close_seconds) < duration_seconds:
+            return []
+        
+        # Build every candidate start, in seconds since midnight, that lets the
+        # entire service finish within business hours, so no separate business
+        # hours validation is needed per slot
+        slot_starts = np.arange(
+            open_seconds, close_seconds - duration_seconds + 1, slot_duration_minutes * 60, dtype=np.int64
+        )
+        
+        # Keep the slots that don't overlap any booking
+        free = ~day_bookings.overlap_mask(slot_starts, slot_starts + duration_seconds)
+        available_slots = [_seconds_to_time(seconds) for seconds in slot_starts[free].tolist()]
+        
+        debug_print(lambda: (
+            f"{service_date}: {len(available_slots)} of {len(slot_starts)} slots free "
+            f"for {total_duration} min around {len(day_bookings.starts)} bookings"
+        ))
         
         return available_slots
         
@@ -339,6 +719,73 @@ def get_available_time_slots_enhanced(
         st.error(f"Error generating available time slots: {str(e)}")
         return []
 
+# Recurring services are only checked and booked this far ahead
+RECURRENCE_HORIZON_DAYS = 180
+
+RECURRENCE_STEP_DAYS = {
+    "Weekly": 7,
+    "Bi-Weekly": 14
+}
+
+def _run_concurrently(*calls: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent lookups on worker threads and return results in order.
+    
+    Workers get the current Streamlit script context so st.error and the
+    data caches behave as they would on the script thread.
+    """
+    ctx = get_script_run_ctx()
+    
+    def run(call: Callable[[], Any]) -> Any:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return call()
+    
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        return list(executor.map(run, calls))
+
+def get_recurrence_dates(
+    base_date: date,
+    recurrence_pattern: str,
+    max_occurrences: int = 24,
+    horizon_days: int = RECURRENCE_HORIZON_DAYS
+) -> List[date]:
+    """
+    List every occurrence of a recurring service, starting with base_date.
+    
+    Args:
+        base_date: Starting date for recurring service
+        recurrence_pattern: "Weekly", "Bi-Weekly", or "Monthly"
+        max_occurrences: Maximum number of occurrences to return
+        horizon_days: Occurrences more than this many days out are dropped
+    
+    Returns:
+        List of occurrence dates in order
+    """
+    if max_occurrences <= 0:
+        return []
+    
+    base_ordinal = base_date.toordinal()
+    last_ordinal = base_ordinal + horizon_days
+    
+    if recurrence_pattern in RECURRENCE_STEP_DAYS:
+        # Fixed steps are plain integer ranges over day ordinals
+        step = RECURRENCE_STEP_DAYS[recurrence_pattern]
+        ordinals = range(base_ordinal, last_ordinal + 1, step)[:max_occurrences]
+        return [date.fromordinal(ordinal) for ordinal in ordinals]
+    
+    if recurrence_pattern == "Monthly":
+        # Each occurrence is computed from base_date, so month-end dates
+        # clamp per month (Jan 31 -> Feb 28 -> Mar 31) instead of drifting
+        occurrence_dates = []
+        for occurrence in range(max_occurrences):
+            occurrence_date = base_date + relativedelta(months=occurrence)
+            if occurrence_date.toordinal() > last_ordinal:
+                break
+            occurrence_dates.append(occurrence_date)
+        return occurrence_dates
+    
+    return [base_date]  # Unknown pattern: only the base date recurs
+
 def validate_recurring_service_availability(
     base_date: date,
     service_time: time,
@@ -362,46 +809,29 @@ def validate_recurring_service_availability(
     try:
         conflict_messages = []
         conflict_dates = []
-        current_date = base_date
+        occurrence_dates = get_recurrence_dates(base_date, recurrence_pattern, max_occurrences)
         
-        for occurrence in range(max_occurrences):
-            # Calculate next occurrence date
-            if occurrence > 0:  # Skip first occurrence as it's the base_date
-                if recurrence_pattern == "Weekly":
-                    current_date += timedelta(days=7)
-                elif recurrence_pattern == "Bi-Weekly":
-                    current_date += timedelta(days=14)
-                elif recurrence_pattern == "Monthly":
-                    # Handle month increment
-                    year = current_date.year
-                    month = current_date.month + 1
-                    if month > 12:
-                        year += 1
-                        month = 1
-                    try:
-                        current_date = current_date.replace(year=year, month=month)
-                    except ValueError:
-                        # Handle cases like Jan 31 -> Feb 31 (doesn't exist)
-                        if month + 1 > 12:
-                            next_month = current_date.replace(year=year + 1, month=1, day=1)
-                        else:
-                            next_month = current_date.replace(year=year, month=month + 1, day=1)
-                        current_date = next_month - timedelta(days=1)
-            
-            # Stop if we've gone beyond 6 months (180 days)
-            if (current_date - base_date).days > 180:
-                break
-            
-            # Check availability for this occurrence
-            is_available, error_message, conflicts = check_for_booking_conflicts(
-                service_date=current_date,
-                service_time=service_time,
-                service_names=service_names
+        if not occurrence_dates:
+            return True, [], []
+        
+        # One duration lookup and one range scan cover every occurrence;
+        # they don't depend on each other, so their round-trips overlap
+        total_duration, bookings_by_date = _run_concurrently(
+            lambda: get_service_duration(service_names),
+            lambda: get_bookings_in_range(occurrence_dates[0], occurrence_dates[-1])
+        )
+        
+        for occurrence_date in occurrence_dates:
+            is_available, error_message, conflicts = find_booking_conflicts(
+                occurrence_date,
+                service_time,
+                total_duration,
+                bookings_by_date[occurrence_date]
             )
             
             if not is_available:
-                conflict_messages.append(f"{current_date.strftime('%B %d, %Y')}: {error_message}")
-                conflict_dates.append(current_date)
+                conflict_messages.append(f"{occurrence_date.strftime('%B %d, %Y')}: {error_message}")
+                conflict_dates.append(occurrence_date)
         
         all_available = len(conflict_messages) == 0
         return all_available, conflict_messages, conflict_dates
@@ -463,11 +893,19 @@ def get_available_time_slots(
 __all__ = [
     'BookingConflict',
     'check_for_booking_conflicts',
+    'find_booking_conflicts',
+    'get_bookings_in_range',
+    'get_conflicting_bookings',
+    'check_minute_overlap',
+    'time_to_minutes',
+    'DayBookings',
     'get_available_time_slots_enhanced',
     'validate_recurring_service_availability',
+    'get_recurrence_dates',
     'check_service_availability',
     'get_available_time_slots',
     'validate_business_hours',
     'get_business_hours_for_date',
-    'get_service_duration'
+    'get_service_duration',
+    'clear_bookings_cache'
 ]
\ No newline at end of file
@@ -1,36 +1,133 @@
 # In utils/email.py
 import os
 import sys
+import json
 from datetime import time, datetime
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import traceback
 import re
-from typing import Optional, Dict, Any, Tuple
+import threading
+from string import Template
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 import requests
-from dataclasses import dataclass
-from database.connection import snowflake_conn
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.business.info import fetch_business_info
+from utils.database.batch_writer import BatchInsertWriter
 
 
 
 def debug_print(msg: str) -> None:
     """Helper function for debug logging."""
-    if 'debug_mode' in st.session_state and st.session_state['debug_mode']:
+    if st.session_state.get('debug_mode'):
         print(f"DEBUG: {msg}")
         st.write(f"DEBUG: {msg}")
 
-@dataclass
-class EmailStatus:
+class EmailStatus(NamedTuple):
+    """Result of an email send; immutable and without a per-instance __dict__."""
     success: bool
     message: str
     email_id: Optional[str] = None
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 def validate_email(email: str) -> bool:
     """
     Validate email format using regex pattern.
+    
+    Cheap string checks reject most bad input first. Requiring an alphabetic
+    TLD after the last dot also means the regex never has to backtrack
+    through a long domain that can't match.
+    """
+    if not email or email.count('@') != 1:
+        return False
+    local, _, domain = email.partition('@')
+    if not local or '.' not in domain:
+        return False
+    tld = domain.rpartition('.')[2]
+    if len(tld) < 2 or not (tld.isascii() and tld.isalpha()):
+        return False
+    return EMAIL_PATTERN.match(email) is not None
+
+MAILGUN_API_BASE = "https://api.mailgun.net/v3"
+# (connect, read) seconds, so a stalled Mailgun call can't hang the page
+MAILGUN_TIMEOUT = (3.05, 10)
+
+# Longest Retry-After wait honoured before retrying, so a rate limit can't stall the page
+MAILGUN_MAX_RETRY_AFTER = 5
+
+class _MailgunRetry(Retry):
+    """Retry policy that caps how long a Retry-After header can make us wait."""
+    
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAILGUN_MAX_RETRY_AFTER)
+
+# Background send workers; the Mailgun pool keeps one open connection per worker
+MAX_CONCURRENT_SENDS = 8
+
+def _build_mailgun_session() -> requests.Session:
+    """Create the shared HTTP session used for every Mailgun request."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        # Every request goes to the one Mailgun host
+        pool_connections=1,
+        pool_maxsize=MAX_CONCURRENT_SENDS,
+        max_retries=_MailgunRetry(
+            total=3,
+            # A read error means Mailgun may already have queued the message,
+            # so only failures that are known not to have sent are retried
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True,
+            # Hand the last response back so send_email reports its status
+            raise_on_status=False
+        )
+    ))
+    return session
+
+# Reused across sends so the TCP/TLS connection to Mailgun stays open
+mailgun_session = _build_mailgun_session()
+
+MAILGUN_SENDER_NAME = "EZ Biz"
+
+@lru_cache(maxsize=1)
+def _get_mailgun_config() -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """
+    Read Mailgun settings from secrets once per process.
+    
+    Returns:
+        (api_key, domain, messages_url, sender); the last two are None without a domain
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    mailgun_secrets = st.secrets.get("mailgun", {})
+    api_key = mailgun_secrets.get("api_key")
+    domain = mailgun_secrets.get("domain")
+    if not domain:
+        return api_key, domain, None, None
+    return (
+        api_key,
+        domain,
+        f"{MAILGUN_API_BASE}/{domain}/messages",
+        f"{MAILGUN_SENDER_NAME} <noreply@{domain}>"
+    )
+
+# Log rows are written in the background in multi-row INSERTs; CREATED_AT is
+# backdated by the time a row spent queued
+_email_log = BatchInsertWriter(
+    "INSERT INTO OPERATIONAL.BARBER.EMAIL_LOGS "
+    "(RECIPIENT_EMAIL, SUBJECT, EMAIL_TYPE, STATUS, ERROR_MESSAGE, CREATED_AT) VALUES ",
+    "(?, ?, ?, ?, ?, DATEADD(second, -?, CURRENT_TIMESTAMP()))",
+    max_rows=50,
+    flush_interval=5.0,
+    append_age_seconds=True
+)
 
 def log_email(
     to_email: str,
@@ -42,22 +139,11 @@ def log_email(
     Log email sending attempts to database.
     """
     try:
-        query = """
-        INSERT INTO OPERATIONAL.BARBER.EMAIL_LOGS (
-            RECIPIENT_EMAIL,
-            SUBJECT,
-            EMAIL_TYPE,
-            STATUS,
-            ERROR_MESSAGE
-        ) VALUES (?, ?, ?, ?, ?)
-        """
         status_str = "SUCCESS" if status else "FAILED"
         email_type = "NOTIFICATION"  # Default email type
         
-        snowflake_conn.execute_query(
-            query,
-            [to_email, subject, email_type, status_str, error_message]
-        )
+        # RECIPIENT_EMAIL is NOT NULL; one bad row would fail its whole batch
+        _email_log.put(to_email or '', subject, email_type, status_str, error_message)
     except Exception as e:
         # Just print the error and continue - don't let this crash the application
         print(f"Failed to log email (non-critical error): {str(e)}")
@@ -68,44 +154,44 @@ def send_email(
     to_email: str,
     subject: str,
     content: str,
-    business_info: Dict
+    business_info: Dict,
+    *,
+    validated: bool = False
 ) -> EmailStatus:
     """
     Send email using Mailgun with improved error handling and logging.
+    
+    Args:
+        validated: True if the caller already ran validate_email on to_email
     """
     try:
         # Validate configuration
-        if not st.secrets.get("mailgun", {}).get("api_key"):
+        mailgun_api_key, mailgun_domain, messages_url, sender = _get_mailgun_config()
+        if not mailgun_api_key:
             error_msg = "Mailgun API key missing from secrets"
             log_email(to_email, subject, False, error_msg)
             return EmailStatus(False, error_msg, None)
         
-        if not st.secrets.get("mailgun", {}).get("domain"):
+        if not mailgun_domain:
             error_msg = "Mailgun domain missing from secrets"
             log_email(to_email, subject, False, error_msg)
             return EmailStatus(False, error_msg, None)
             
         # Validate email
-        if not to_email or not validate_email(to_email):
+        if not validated and not validate_email(to_email):
             error_msg = "Invalid recipient email address"
             log_email(to_email, subject, False, error_msg)
             return EmailStatus(False, error_msg, None)
 
-        # Get domain from secrets and set sender format
-        mailgun_domain = st.secrets.mailgun.domain
-        sender = f"EZ Biz <noreply@{mailgun_domain}>"
-
         # Debug logging
         if st.session_state.get('debug_mode'):
-            print(f"Sending email to: {to_email}")
-            print(f"Subject: {subject}")
-            print(f"From: {sender}")
-            print(f"Domain: {mailgun_domain}")
+            print(f"Sending email to: {to_email}\nSubject: {subject}\nFrom: {sender}\nDomain: {mailgun_domain}")
         
         # Send email using Mailgun
-        response = requests.post(
-            f"https://api.mailgun.net/v3/{mailgun_domain}/messages",
-            auth=("api", st.secrets.mailgun.api_key),
+        response = mailgun_session.post(
+            messages_url,
+            auth=("api", mailgun_api_key),
+            timeout=MAILGUN_TIMEOUT,
             data={
                 "from": sender,
                 "to": [to_email],
@@ -116,7 +202,13 @@ def send_email(
         )
         
         if response.status_code == 200:
-            email_id = response.json().get('id')
+            # Parse the raw bytes: response.json() goes through .text, which may
+            # run charset detection first. The send succeeded even if the body
+            # can't be parsed, so fall back to no ID rather than reporting failure
+            try:
+                email_id = json.loads(response.content).get('id')
+            except ValueError:
+                email_id = None
             log_email(to_email, subject, True)
             return EmailStatus(True, "Email sent successfully", email_id)
         else:
@@ -140,15 +232,64 @@ def send_email(
         log_email(to_email, subject, False, error_msg)
         return EmailStatus(False, error_msg, None)  
 
+# Shared by every background send so the UI thread never waits on Mailgun
+_email_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SENDS, thread_name_prefix="ezbiz-mail")
+
+def _submit_email(fn: Callable[..., EmailStatus], *args: Any, **kwargs: Any) -> Future:
+    """
+    Run an email function on the shared pool.
+    
+    The worker gets the caller's script context so session_state and st calls work.
+    
+    Returns:
+        Future resolving to the function's EmailStatus
+    """
+    ctx = get_script_run_ctx()
+    
+    def run() -> EmailStatus:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args, **kwargs)
+    
+    return _email_pool.submit(run)
+
+def send_email_async(
+    to_email: str,
+    subject: str,
+    content: str,
+    business_info: Dict
+) -> Future:
+    """
+    Queue an email to send in the background.
+    
+    Returns:
+        Future resolving to the EmailStatus from send_email
+    """
+    return _submit_email(send_email, to_email, subject, content, business_info)
+
+def send_many(messages: List[Dict[str, Any]]) -> List[EmailStatus]:
+    """
+    Send several emails concurrently.
+    
+    Args:
+        messages: Keyword arguments for send_email, one dict per email
+        
+    Returns:
+        List of EmailStatus in the same order as messages
+    """
+    futures = [_submit_email(send_email, **message) for message in messages]
+    return [future.result() for future in futures]
+
 def send_completion_email(transaction_data: dict, selected_service: dict) -> bool:
     """
-    Send completion email for a transaction
-    Returns True if email was sent successfully, False otherwise
+    Send completion email for a transaction in the background
+    Returns True if the email was queued, False if it could not be prepared
     """
     try:
-        # Debug logging
-        print("Transaction Data:", transaction_data)
-        print("Selected Service:", selected_service)
+        # Read once; the data dumps below only run in debug mode
+        debug = st.session_state.get('debug_mode')
+        if debug:
+            print("Transaction Data:", transaction_data)
+            print("Selected Service:", selected_service)
 
         # Import here to avoid circular dependency
         from models.customer import fetch_customer
@@ -162,7 +303,8 @@ def send_completion_email(transaction_data: dict, selected_service: dict) -> boo
             print("No email address for customer")
             return False
 
-        print("Customer Info:", customer.to_dict())
+        if debug:
+            print("Customer Info:", customer.to_dict())
 
         # Get business info
         business_info = fetch_business_info()
@@ -170,7 +312,8 @@ def send_completion_email(transaction_data: dict, selected_service: dict) -> boo
             print("No business info available")
             return False
 
-        print("Business Info:", business_info)
+        if debug:
+            print("Business Info:", business_info)
 
         # Prepare service details
         service_details = {
@@ -185,16 +328,21 @@ def send_completion_email(transaction_data: dict, selected_service: dict) -> boo
             'notes': transaction_data['notes']
         }
 
-        print("Service Details for Email:", service_details)
+        if debug:
+            print("Service Details for Email:", service_details)
 
-        # Send email
-        email_status = generate_service_completed_email(service_details, business_info)
-        if email_status and email_status.success:
-            print(f"Email sent successfully to {customer.email_address}")
-            return True
-        else:
-            print(f"Failed to send email: {getattr(email_status, 'message', 'Unknown error')}")
-            return False
+        # Send email without holding up the rerun; the outcome is logged when it finishes
+        to_email = customer.email_address
+        
+        def report(future: Future) -> None:
+            email_status = future.result()
+            if email_status.success:
+                print(f"Email sent successfully to {to_email}")
+            else:
+                print(f"Failed to send email: {email_status.message}")
+        
+        _submit_email(generate_service_completed_email, service_details, business_info).add_done_callback(report)
+        return True
 
     except Exception as e:
         print(f"Error sending completion email: {str(e)}")
@@ -202,17 +350,218 @@ def send_completion_email(transaction_data: dict, selected_service: dict) -> boo
         return False
 
 
+# Email bodies are parsed once at import; optional sections are appended after substitution
+SCHEDULED_EMAIL_TEMPLATE = Template("""
+From: $business_name
+$street_address
+$city, $state $zip_code
+
+Dear $customer_name,
+
+Thank you for choosing $business_ref. Your service has been scheduled:
+
+Service: $service_type
+Date: $date
+Time: $time
+Total Cost: $$$total_cost""")
+
+SCHEDULED_EMAIL_FOOTER_TEMPLATE = Template("""
+
+If you need to make any changes to your appointment, please contact us:
+Phone: $phone
+Email: $email
+
+Thank you for your business!
+
+Best regards,
+$business_name""")
+
+VERIFICATION_EMAIL_TEMPLATE = Template("""
+From: $business_name
+$street_address
+$city, $state $zip_code
+
+Dear $first_name,
+
+Thank you for creating an account with $business_ref. Please verify your email address by clicking the link below:
+
+$verification_url
+
+This link will expire in 24 hours. If you didn't create an account, please ignore this email.
+
+If you have any questions, please contact us:
+Phone: $phone
+Email: $email
+
+Best regards,
+$business_name""")
+
+PASSWORD_RESET_EMAIL_TEMPLATE = Template("""
+From: $business_name
+$street_address
+$city, $state $zip_code
+
+Dear $first_name,
+
+We received a request to reset your password for your $account_ref account. To reset your password, click the link below:
+
+$reset_url
+
+This link will expire in 1 hour. If you didn't request a password reset, please ignore this email.
+
+For your security:
+- The link can only be used once
+- If it expires, you can request a new one from the login page
+- If you didn't request this reset, please contact us immediately
+
+If you have any questions or concerns, please contact us:
+Phone: $phone
+Email: $email
+
+Best regards,
+$business_name""")
+
+COMPLETED_EMAIL_TEMPLATE = Template("""
+From: $business_name
+$street_address
+$city, $state $zip_code
+
+Dear $customer_name,
+
+Thank you for choosing $business_ref. Your service has been completed:
+
+Service: $service_type
+Date: $date
+Time: $time
+
+Payment Summary:
+Total Cost: $$$total_cost
+Amount Paid: $$$amount_received""")
+
+COMPLETED_EMAIL_FOOTER_TEMPLATE = Template("""
+
+If you have any questions about your service, please contact us:
+Phone: $phone
+Email: $email
+
+Thank you for your business! We appreciate your trust in our services.
+
+Best regards,
+$business_name""")
+
+def _business_context(business_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the business fields shared by every email template, once per email.
+    
+    Args:
+        business_info: Business info dict as returned by fetch_business_info
+        
+    Returns:
+        Dict of template field name to value
+    """
+    # The name's fallback depends on where it appears, but only applies when
+    # the key is missing altogether, so look it up once
+    if 'BUSINESS_NAME' in business_info:
+        business_name = business_ref = account_ref = business_info['BUSINESS_NAME']
+    else:
+        business_name, business_ref, account_ref = 'Your Business', 'us', 'our'
+    
+    return {
+        'business_name': business_name,
+        'business_ref': business_ref,
+        'account_ref': account_ref,
+        'street_address': business_info.get('STREET_ADDRESS', ''),
+        'city': business_info.get('CITY', ''),
+        'state': business_info.get('STATE', ''),
+        'zip_code': business_info.get('ZIP_CODE', ''),
+        'phone': business_info.get('PHONE_NUMBER', ''),
+        'email': business_info.get('EMAIL_ADDRESS', ''),
+        'website': business_info.get('WEBSITE')
+    }
+
+# Per email kind: (body template, footer template or None, subject template)
+EMAIL_TEMPLATES = {
+    'service_scheduled': (
+        SCHEDULED_EMAIL_TEMPLATE,
+        SCHEDULED_EMAIL_FOOTER_TEMPLATE,
+        Template("Service Scheduled - $service_type")
+    ),
+    'service_completed': (
+        COMPLETED_EMAIL_TEMPLATE,
+        COMPLETED_EMAIL_FOOTER_TEMPLATE,
+        Template("Service Completed - $service_type")
+    ),
+    'verification': (VERIFICATION_EMAIL_TEMPLATE, None, Template("Verify Your Email Address")),
+    'password_reset': (PASSWORD_RESET_EMAIL_TEMPLATE, None, Template("Password Reset Request"))
+}
+
+def _render_and_send(
+    kind: str,
+    to_email: str,
+    business_info: Dict[str, Any],
+    fields: Dict[str, Any],
+    sections: Optional[List[str]] = None,
+    trailer: Optional[str] = None
+) -> EmailStatus:
+    """
+    Render one of EMAIL_TEMPLATES and send it. Callers must have validated to_email.
+    
+    Args:
+        kind: Key into EMAIL_TEMPLATES
+        to_email: Recipient address
+        business_info: Business info dict as returned by fetch_business_info
+        fields: Template fields specific to this email
+        sections: Optional text inserted between the body and the footer
+        trailer: Optional text appended after the website line
+        
+    Returns:
+        EmailStatus from send_email
+    """
+    body_template, footer_template, subject_template = EMAIL_TEMPLATES[kind]
+    context = {**_business_context(business_info), **fields}
+    
+    parts = [body_template.safe_substitute(context)]
+    if sections:
+        parts.extend(sections)
+    if footer_template:
+        parts.append(footer_template.safe_substitute(context))
+    if context['website']:
+        parts.append(f"\n{context['website']}")
+    if trailer:
+        parts.append(trailer)
+    
+    return send_email(
+        to_email=to_email,
+        subject=subject_template.safe_substitute(context),
+        content="".join(parts),
+        business_info=business_info,
+        validated=True
+    )
+
+def _email_error(description: str, e: Exception) -> EmailStatus:
+    """Build the failure status for an email generator; call from its except block."""
+    error_msg = f"Error generating {description} email: {str(e)}"
+    if st.session_state.get('debug_mode'):
+        st.error(error_msg)
+        st.error(traceback.format_exc())
+    return EmailStatus(False, error_msg, None)
+
+def _check_customer_email(service_details: Dict[str, Any]) -> Optional[EmailStatus]:
+    """Return a failure status if service_details lacks a valid customer email."""
+    if not service_details.get('customer_email'):
+        return EmailStatus(False, "No customer email provided", None)
+    if not validate_email(service_details['customer_email']):
+        return EmailStatus(False, "Invalid customer email address", None)
+    return None
+
 def generate_service_scheduled_email(service_details: Dict[str, Any], business_info: Dict[str, Any]) -> EmailStatus:
     """
     Generate and send service scheduled confirmation email.
     Maps to SERVICE_TRANSACTION table schema.
     """
     try:
-        if not service_details.get('customer_email'):
-            return EmailStatus(False, "No customer email provided", None)
-
-        if not validate_email(service_details['customer_email']):
-            return EmailStatus(False, "Invalid customer email address", None)
+        if invalid := _check_customer_email(service_details):
+            return invalid
 
         # Format datetime objects
         service_date = service_details.get('date')
@@ -225,71 +574,47 @@ def generate_service_scheduled_email(service_details: Dict[str, Any], business_i
         deposit_amount = float(service_details.get('deposit_amount', 0))
         deposit_paid = service_details.get('deposit_paid', False)
 
-        # Generate email content
-        email_content = f"""
-From: {business_info.get('BUSINESS_NAME', 'Your Business')}
-{business_info.get('STREET_ADDRESS', '')}
-{business_info.get('CITY', '')}, {business_info.get('STATE', '')} {business_info.get('ZIP_CODE', '')}
-
-Dear {service_details.get('customer_name', 'Valued Customer')},
-
-Thank you for choosing {business_info.get('BUSINESS_NAME', 'us')}. Your service has been scheduled:
-
-Service: {service_details.get('service_type', 'Service')}
-Date: {formatted_date}
-Time: {formatted_time}
-Total Cost: ${total_amount:.2f}"""
+        sections = []
 
         # Add deposit information if there is a deposit required
         if deposit_amount > 0:
-            email_content += f"""
-Deposit Required: ${deposit_amount:.2f}
-Deposit Status: {"Paid" if deposit_paid else "Pending"}"""
+            sections.append(f"\nDeposit Required: ${deposit_amount:.2f}")
+            sections.append(f"\nDeposit Status: {'Paid' if deposit_paid else 'Pending'}")
             
             if deposit_paid:
-                email_content += f"\nDeposit Payment Method: {service_details.get('DEPOSIT_PAYMENT_METHOD', 'Not specified')}"
+                sections.append(f"\nDeposit Payment Method: {service_details.get('DEPOSIT_PAYMENT_METHOD', 'Not specified')}")
 
         # Add service comments if any
         if comments := service_details.get('notes'):
-            email_content += f"\n\nService Notes: {comments}"
+            sections.append(f"\n\nService Notes: {comments}")
 
         # Status-specific messages
         status = service_details.get('STATUS', 'PENDING')
         if status == 'PENDING' and deposit_amount > 0 and not deposit_paid:
-            email_content += "\n\nIMPORTANT: Please note that your appointment will be confirmed once the deposit has been received."
-
-        email_content += f"""
-
-If you need to make any changes to your appointment, please contact us:
-Phone: {business_info.get('PHONE_NUMBER', '')}
-Email: {business_info.get('EMAIL_ADDRESS', '')}
-
-Thank you for your business!
-
-Best regards,
-{business_info.get('BUSINESS_NAME', 'Your Business')}"""
-
-        if business_info.get('WEBSITE'):
-            email_content += f"\n{business_info['WEBSITE']}"
+            sections.append("\n\nIMPORTANT: Please note that your appointment will be confirmed once the deposit has been received.")
 
         # Add recurring service information if applicable
+        trailer = None
         if service_details.get('is_recurring'):
             recurrence = service_details.get('recurrence_pattern', 'regular')
-            email_content += f"\n\nThis is a recurring service scheduled on a {recurrence} basis."
-
-        # Send the email
-        return send_email(
-            to_email=service_details['customer_email'],
-            subject=f"Service Scheduled - {service_details.get('service_type', 'Service')}",
-            content=email_content,
-            business_info=business_info
+            trailer = f"\n\nThis is a recurring service scheduled on a {recurrence} basis."
+
+        return _render_and_send(
+            'service_scheduled',
+            service_details['customer_email'],
+            business_info,
+            {
+                'customer_name': service_details.get('customer_name', 'Valued Customer'),
+                'service_type': service_details.get('service_type', 'Service'),
+                'date': formatted_date,
+                'time': formatted_time,
+                'total_cost': f"{total_amount:.2f}"
+            },
+            sections=sections,
+            trailer=trailer
         )
     except Exception as e:
-        error_msg = f"Error generating service scheduled email: {str(e)}"
-        if st.session_state.get('debug_mode'):
-            st.error(error_msg)
-            st.error(traceback.format_exc())
-        return EmailStatus(False, error_msg, None)
+        return _email_error("service scheduled", e)
 
 def generate_verification_email(
     email: str,
@@ -304,44 +629,15 @@ def generate_verification_email(
         if not validate_email(email):
             return EmailStatus(False, "Invalid email address", None)
             
-        # Generate email content
-        email_content = f"""
-From: {business_info.get('BUSINESS_NAME', 'Your Business')}
-{business_info.get('STREET_ADDRESS', '')}
-{business_info.get('CITY', '')}, {business_info.get('STATE', '')} {business_info.get('ZIP_CODE', '')}
-
-Dear {first_name},
-
-Thank you for creating an account with {business_info.get('BUSINESS_NAME', 'us')}. Please verify your email address by clicking the link below:
-
-{verification_url}
-
-This link will expire in 24 hours. If you didn't create an account, please ignore this email.
-
-If you have any questions, please contact us:
-Phone: {business_info.get('PHONE_NUMBER', '')}
-Email: {business_info.get('EMAIL_ADDRESS', '')}
-
-Best regards,
-{business_info.get('BUSINESS_NAME', 'Your Business')}"""
-
-        if business_info.get('WEBSITE'):
-            email_content += f"\n{business_info['WEBSITE']}"
-
-        # Send the email
-        return send_email(
-            to_email=email,
-            subject="Verify Your Email Address",
-            content=email_content,
-            business_info=business_info
+        return _render_and_send(
+            'verification',
+            email,
+            business_info,
+            {'first_name': first_name, 'verification_url': verification_url}
         )
 
     except Exception as e:
-        error_msg = f"Error generating verification email: {str(e)}"
-        if st.session_state.get('debug_mode'):
-            st.error(error_msg)
-            st.error(traceback.format_exc())
-        return EmailStatus(False, error_msg, None)
+        return _email_error("verification", e)
 
 def generate_password_reset_email(
     email: str,
@@ -356,109 +652,44 @@ def generate_password_reset_email(
         if not validate_email(email):
             return EmailStatus(False, "Invalid email address", None)
             
-        # Generate email content
-        email_content = f"""
-From: {business_info.get('BUSINESS_NAME', 'Your Business')}
-{business_info.get('STREET_ADDRESS', '')}
-{business_info.get('CITY', '')}, {business_info.get('STATE', '')} {business_info.get('ZIP_CODE', '')}
-
-Dear {first_name},
-
-We received a request to reset your password for your {business_info.get('BUSINESS_NAME', 'our')} account. To reset your password, click the link below:
-
-{reset_url}
-
-This link will expire in 1 hour. If you didn't request a password reset, please ignore this email.
-
-For your security:
-- The link can only be used once
-- If it expires, you can request a new one from the login page
-- If you didn't request this reset, please contact us immediately
-
-If you have any questions or concerns, please contact us:
-Phone: {business_info.get('PHONE_NUMBER', '')}
-Email: {business_info.get('EMAIL_ADDRESS', '')}
-
-Best regards,
-{business_info.get('BUSINESS_NAME', 'Your Business')}"""
-
-        if business_info.get('WEBSITE'):
-            email_content += f"\n{business_info['WEBSITE']}"
-
-        # Send the email
-        return send_email(
-            to_email=email,
-            subject="Password Reset Request",
-            content=email_content,
-            business_info=business_info
+        return _render_and_send(
+            'password_reset',
+            email,
+            business_info,
+            {'first_name': first_name, 'reset_url': reset_url}
         )
 
     except Exception as e:
-        error_msg = f"Error generating password reset email: {str(e)}"
-        if st.session_state.get('debug_mode'):
-            st.error(error_msg)
-            st.error(traceback.format_exc())
-        return EmailStatus(False, error_msg, None)
+        return _email_error("password reset", e)
 
 def generate_service_completed_email(service_details: Dict[str, Any], business_info: Dict[str, Any]) -> EmailStatus:
     """
     Generate and send service completion confirmation email.
     """
     try:
-        if not service_details.get('customer_email'):
-            return EmailStatus(False, "No customer email provided", None)
-
-        if not validate_email(service_details['customer_email']):
-            return EmailStatus(False, "Invalid customer email address", None)
-
-        # Generate email content
-        email_content = f"""
-From: {business_info.get('BUSINESS_NAME', 'Your Business')}
-{business_info.get('STREET_ADDRESS', '')}
-{business_info.get('CITY', '')}, {business_info.get('STATE', '')} {business_info.get('ZIP_CODE', '')}
-
-Dear {service_details.get('customer_name', 'Valued Customer')},
-
-Thank you for choosing {business_info.get('BUSINESS_NAME', 'us')}. Your service has been completed:
-
-Service: {service_details.get('service_type', 'Service')}
-Date: {service_details.get('date', '')}
-Time: {service_details.get('time', '')}
-
-Payment Summary:
-Total Cost: ${service_details.get('total_cost', 0):.2f}
-Amount Paid: ${service_details.get('amount_received', 0):.2f}"""
+        if invalid := _check_customer_email(service_details):
+            return invalid
 
+        sections = []
         if service_details.get('notes'):
-            email_content += f"\n\nService Notes: {service_details['notes']}"
-
-        email_content += f"""
-
-If you have any questions about your service, please contact us:
-Phone: {business_info.get('PHONE_NUMBER', '')}
-Email: {business_info.get('EMAIL_ADDRESS', '')}
-
-Thank you for your business! We appreciate your trust in our services.
-
-Best regards,
-{business_info.get('BUSINESS_NAME', 'Your Business')}"""
-
-        if business_info.get('WEBSITE'):
-            email_content += f"\n{business_info['WEBSITE']}"
-
-        # Send the email
-        return send_email(
-            to_email=service_details['customer_email'],
-            subject=f"Service Completed - {service_details.get('service_type', 'Service')}",
-            content=email_content,
-            business_info=business_info
+            sections.append(f"\n\nService Notes: {service_details['notes']}")
+
+        return _render_and_send(
+            'service_completed',
+            service_details['customer_email'],
+            business_info,
+            {
+                'customer_name': service_details.get('customer_name', 'Valued Customer'),
+                'service_type': service_details.get('service_type', 'Service'),
+                'date': service_details.get('date', ''),
+                'time': service_details.get('time', ''),
+                'total_cost': f"{service_details.get('total_cost', 0):.2f}",
+                'amount_received': f"{service_details.get('amount_received', 0):.2f}"
+            },
+            sections=sections
         )
     except Exception as e:
-        error_msg = f"Error generating service completed email: {str(e)}"
-        if st.session_state.get('debug_mode'):
-            st.error(error_msg)
-            st.error(traceback.format_exc())
-        return EmailStatus(False, error_msg, None)
+        return _email_error("service completed", e)
 
 # Aliases for backward compatibility
 send_service_scheduled_email = generate_service_scheduled_email
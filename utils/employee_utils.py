@@ -1,43 +1,216 @@
 """
 Employee management utility for Ez_Biz_Barber
 """
+import time
 import streamlit as st
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from database.connection import snowflake_conn
 
+# Employee rows change rarely and every write path clears the cache
+EMPLOYEE_CACHE_TTL_SECONDS = 300
 
-def get_all_employees() -> List[Dict[str, Any]]:
+
+ALL_EMPLOYEES_QUERY = """
+SELECT 
+    EMPLOYEE_ID,
+    FIRST_NAME,
+    LAST_NAME,
+    EMAIL,
+    PHONE_NUMBER,
+    JOB_TITLE,
+    HOURLY_RATE,
+    STATUS,
+    IS_ACTIVE
+FROM OPERATIONAL.BARBER.EMPLOYEE
+WHERE IS_ACTIVE = TRUE
+ORDER BY LAST_NAME, FIRST_NAME
+LIMIT ?
+"""
+
+# Upper bound on rows returned by a single employee listing
+EMPLOYEE_LIST_LIMIT = 500
+
+# Above this many active employees the picker searches by name instead of listing everyone
+EMPLOYEE_PICKER_MAX_OPTIONS = 200
+
+
+@st.cache_data(ttl=EMPLOYEE_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_all_employees(limit: int) -> List[Dict[str, Any]]:
+    """
+    Load active employees in name order, up to limit rows.
+    
+    Raises on query failure so errors are not cached.
+    """
+    result = snowflake_conn.execute_query(ALL_EMPLOYEES_QUERY, [limit])
+    if result is None:
+        raise RuntimeError("Employee query failed")
+    return result
+
+
+def get_all_employees(search: Optional[str] = None, limit: int = EMPLOYEE_LIST_LIMIT) -> List[Dict[str, Any]]:
     """
-    Get all active employees from the database.
+    Get active employees from the database.
     
+    Args:
+        search: Optional first or last name prefix to filter by
+        limit: Maximum number of employees to return
+        
     Returns:
         List of employee dictionaries
     """
+    if search is not None:
+        return search_employees(search, limit)
+    
     try:
-        query = """
-        SELECT 
-            EMPLOYEE_ID,
-            FIRST_NAME,
-            LAST_NAME,
-            EMAIL,
-            PHONE_NUMBER,
-            JOB_TITLE,
-            HOURLY_RATE,
-            STATUS,
-            IS_ACTIVE
-        FROM OPERATIONAL.BARBER.EMPLOYEE
-        WHERE IS_ACTIVE = TRUE
-        ORDER BY LAST_NAME, FIRST_NAME
-        """
+        return _fetch_all_employees(limit)
         
-        result = snowflake_conn.execute_query(query)
-        return result if result else []
+    except Exception as e:
+        st.error(f"Error fetching employees: {str(e)}")
+        return []
+
+
+@st.cache_data(ttl=EMPLOYEE_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_employee_picker_data() -> Dict[str, int]:
+    """
+    Build the picker's display name -> employee ID map from the active employees.
+    
+    Only one row past EMPLOYEE_PICKER_MAX_OPTIONS is loaded; a map longer than that
+    tells the picker to search by name instead of listing everyone.
+    
+    Raises on query failure so errors are not cached.
+    """
+    # Dict order follows the query's name ordering, so list(map) is the options list
+    return {
+        _format_employee_name(emp): emp['EMPLOYEE_ID']
+        for emp in _fetch_all_employees(EMPLOYEE_PICKER_MAX_OPTIONS + 1)
+    }
+
+
+def get_employee_picker_data() -> Dict[str, int]:
+    """
+    Get the employee picker's display name -> employee ID map.
+    
+    Returns:
+        Dict in display order; empty on error
+    """
+    try:
+        return _fetch_employee_picker_data()
         
     except Exception as e:
         st.error(f"Error fetching employees: {str(e)}")
+        return {}
+
+
+EMPLOYEE_SEARCH_QUERY = """
+SELECT 
+    EMPLOYEE_ID,
+    FIRST_NAME,
+    LAST_NAME,
+    EMAIL,
+    PHONE_NUMBER,
+    JOB_TITLE,
+    HOURLY_RATE,
+    STATUS,
+    IS_ACTIVE
+FROM OPERATIONAL.BARBER.EMPLOYEE
+WHERE IS_ACTIVE = TRUE
+AND (LAST_NAME ILIKE ? ESCAPE '^' OR FIRST_NAME ILIKE ? ESCAPE '^')
+ORDER BY LAST_NAME, FIRST_NAME
+LIMIT ?
+"""
+
+EMPLOYEE_SEARCH_LIMIT = 50
+
+
+@st.cache_data(ttl=EMPLOYEE_CACHE_TTL_SECONDS, show_spinner=False)
+def _search_employees(prefix: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Load active employees whose first or last name starts with prefix.
+    
+    Raises on query failure so errors are not cached.
+    """
+    pattern = f"{prefix}%"
+    result = snowflake_conn.execute_query(EMPLOYEE_SEARCH_QUERY, [pattern, pattern, limit])
+    if result is None:
+        raise RuntimeError("Employee search failed")
+    return result
+
+
+def search_employees(prefix: str, limit: int = EMPLOYEE_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+    """
+    Search active employees by the start of their first or last name.
+    
+    Args:
+        prefix: Name prefix to match, case-insensitive
+        limit: Maximum number of employees to return
+        
+    Returns:
+        List of employee dictionaries
+    """
+    # LIKE wildcards typed by the user are matched literally
+    prefix = prefix.strip().replace('^', '^^').replace('%', '^%').replace('_', '^_')
+    if not prefix:
+        return []
+    
+    try:
+        return _search_employees(prefix, limit)
+        
+    except Exception as e:
+        st.error(f"Error searching employees: {str(e)}")
         return []
 
 
+EMPLOYEE_INSERT_QUERY = """
+INSERT INTO OPERATIONAL.BARBER.EMPLOYEE (
+    FIRST_NAME,
+    LAST_NAME,
+    EMAIL,
+    PHONE_NUMBER,
+    JOB_TITLE,
+    HOURLY_RATE,
+    STATUS,
+    HIRE_DATE,
+    IS_ACTIVE
+) VALUES (?, ?, ?, ?, ?, ?, 'ACTIVE', CURRENT_DATE(), TRUE)
+"""
+
+# Snowflake's INSERT can't return the IDENTITY value it assigned, so the new
+# row is found again by the values just inserted; newest first
+NEW_EMPLOYEE_ID_QUERY = """
+SELECT EMPLOYEE_ID 
+FROM OPERATIONAL.BARBER.EMPLOYEE 
+WHERE FIRST_NAME = ? 
+AND LAST_NAME = ? 
+{email_filter}
+ORDER BY EMPLOYEE_ID DESC 
+LIMIT 1
+"""
+
+
+def fetch_new_employee_id(first_name: str, last_name: str, email: Optional[str] = None) -> Optional[int]:
+    """
+    Look up the ID of an employee row that was just inserted.
+    
+    Args:
+        first_name: First name as inserted
+        last_name: Last name as inserted
+        email: Email as inserted; narrows the match to this person when given
+        
+    Returns:
+        EMPLOYEE_ID of the newest matching row, or None if there is none
+    """
+    params = [first_name, last_name]
+    email_filter = ""
+    if email:
+        email_filter = "AND EMAIL = ?"
+        params.append(email)
+    
+    result = snowflake_conn.execute_query(
+        NEW_EMPLOYEE_ID_QUERY.format(email_filter=email_filter), params
+    )
+    return int(result[0]['EMPLOYEE_ID']) if result else None
+
+
 def create_employee(employee_data: Dict[str, Any]) -> Optional[int]:
     """
     Create a new employee in the database.
@@ -49,20 +222,6 @@ def create_employee(employee_data: Dict[str, Any]) -> Optional[int]:
         Employee ID if successful, None otherwise
     """
     try:
-        insert_query = """
-        INSERT INTO OPERATIONAL.BARBER.EMPLOYEE (
-            FIRST_NAME,
-            LAST_NAME,
-            EMAIL,
-            PHONE_NUMBER,
-            JOB_TITLE,
-            HOURLY_RATE,
-            STATUS,
-            HIRE_DATE,
-            IS_ACTIVE
-        ) VALUES (?, ?, ?, ?, ?, ?, 'ACTIVE', CURRENT_DATE(), TRUE)
-        """
-        
         params = [
             employee_data['first_name'],
             employee_data['last_name'],
@@ -72,24 +231,13 @@ def create_employee(employee_data: Dict[str, Any]) -> Optional[int]:
             employee_data.get('hourly_rate', 0.0)
         ]
         
-        snowflake_conn.execute_query(insert_query, params)
-        
-        # Get the newly created employee ID
-        id_query = """
-        SELECT EMPLOYEE_ID 
-        FROM OPERATIONAL.BARBER.EMPLOYEE 
-        WHERE FIRST_NAME = ? AND LAST_NAME = ?
-        ORDER BY EMPLOYEE_ID DESC 
-        LIMIT 1
-        """
-        
-        result = snowflake_conn.execute_query(id_query, [
-            employee_data['first_name'], 
-            employee_data['last_name']
-        ])
+        if snowflake_conn.execute_query(EMPLOYEE_INSERT_QUERY, params) is None:
+            st.error("Failed to create employee")
+            return None
+        clear_employee_cache()
         
-        if result:
-            employee_id = result[0]['EMPLOYEE_ID']
+        employee_id = fetch_new_employee_id(params[0], params[1], params[2])
+        if employee_id:
             st.success(f"✅ Employee '{employee_data['first_name']} {employee_data['last_name']}' created successfully!")
             return employee_id
         else:
@@ -111,164 +259,297 @@ def display_employee_multiselect_with_creation(key_suffix: str = "") -> List[int
     Returns:
         List of selected employee IDs
     """
-    # Get existing employees
-    employees = get_all_employees()
-    
-    # Create options list for multiselect
-    employee_options = []
-    employee_map = {}
-    
-    if employees:
-        for emp in employees:
-            full_name = f"{emp['FIRST_NAME']} {emp['LAST_NAME']}"
-            if emp.get('JOB_TITLE'):
-                display_name = f"{full_name} ({emp['JOB_TITLE']})"
-            else:
-                display_name = full_name
-            employee_options.append(display_name)
-            employee_map[display_name] = emp['EMPLOYEE_ID']
-    
     # Initialize session state for employee creation
     create_key = f'show_create_employee_{key_suffix}'
     if create_key not in st.session_state:
         st.session_state[create_key] = False
     
+    # Names already picked are remembered so they stay selectable between
+    # searches and while the create form is open
+    known_key = f'selected_employee_ids_{key_suffix}'
+    if st.session_state[create_key]:
+        # While the create form is open the picker only offers the employees
+        # already selected, so the reruns that open and submit the form don't
+        # need the full employee list
+        employee_map = dict(st.session_state.get(known_key, {}))
+    else:
+        # Display name -> ID for every active employee, built once per cache period
+        employee_map = get_employee_picker_data()
+    
+    # Large staff lists are searched by name instead of loaded into the widget
+    if len(employee_map) > EMPLOYEE_PICKER_MAX_OPTIONS:
+        search_term = st.text_input(
+            "Search Employees",
+            key=f"employee_search_{key_suffix}",
+            placeholder="Start typing a first or last name"
+        )
+        employee_map = {
+            **st.session_state.get(known_key, {}),
+            **{_format_employee_name(emp): emp['EMPLOYEE_ID'] for emp in search_employees(search_term)}
+        }
+    employee_options = list(employee_map)
+    
     col1, col2 = st.columns([3, 1])
     
     with col1:
         selected_employees = st.multiselect(
             "Assign Employees",
             options=employee_options,
-            default=st.session_state.get(f'selected_employees_{key_suffix}', []),
+            default=[
+                name for name in st.session_state.get(f'selected_employees_{key_suffix}', [])
+                if name in employee_map
+            ],
             key=f"employees_multiselect_{key_suffix}",
             help="Select employees to assign to this service or create new ones using the button on the right"
         )
     
     with col2:
         if st.button("➕ Create New Employee", use_container_width=True, key=f"create_employee_btn_{key_suffix}", help="Create a new employee if they're not in the list"):
+            # The form below renders in this same run
             st.session_state[create_key] = True
-            st.rerun()
     
-    # Handle employee creation
-    if st.session_state[create_key]:
-        st.markdown("---")
-        with st.expander("👤 **Create New Employee**", expanded=True):
-            with st.form(f"create_employee_form_{key_suffix}"):
-                st.markdown("#### Add New Employee")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    first_name = st.text_input(
-                        "First Name*",
-                        key=f"emp_first_name_{key_suffix}"
-                    )
-                    email = st.text_input(
-                        "Email",
-                        key=f"emp_email_{key_suffix}",
-                        placeholder="employee@barbershop.com"
-                    )
-                
-                with col2:
-                    last_name = st.text_input(
-                        "Last Name*",
-                        key=f"emp_last_name_{key_suffix}"
-                    )
-                    phone_number = st.text_input(
-                        "Phone Number",
-                        key=f"emp_phone_{key_suffix}",
-                        placeholder="(555) 123-4567"
-                    )
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    job_title = st.selectbox(
-                        "Job Title",
-                        options=[
-                            "Barber",
-                            "Senior Barber", 
-                            "Barber Assistant",
-                            "Manager",
-                            "Owner",
-                            "Receptionist",
-                            "Other"
-                        ],
-                        key=f"emp_job_title_{key_suffix}"
-                    )
-                
-                with col2:
-                    hourly_rate = st.number_input(
-                        "Hourly Rate ($)",
-                        min_value=0.0,
-                        max_value=200.0,
-                        step=0.50,
-                        format="%.2f",
-                        key=f"emp_hourly_rate_{key_suffix}"
-                    )
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    create_button = st.form_submit_button(
-                        "Create Employee",
-                        type="primary",
-                        use_container_width=True
-                    )
-                
-                with col2:
-                    cancel_button = st.form_submit_button(
-                        "Cancel",
-                        use_container_width=True
-                    )
-                
-                if cancel_button:
-                    st.session_state[create_key] = False
-                    st.rerun()
-                
-                if create_button:
-                    # Validate required fields
-                    if not first_name or not last_name:
-                        st.error("First name and last name are required")
-                    elif len(first_name.strip()) == 0 or len(last_name.strip()) == 0:
-                        st.error("First name and last name cannot be empty")
-                    else:
-                        # Create the employee
-                        employee_data = {
-                            'first_name': first_name.strip(),
-                            'last_name': last_name.strip(),
-                            'email': email.strip() if email else '',
-                            'phone_number': phone_number.strip() if phone_number else '',
-                            'job_title': job_title,
-                            'hourly_rate': hourly_rate
+    # Store current selection in session state
+    st.session_state[f'selected_employees_{key_suffix}'] = selected_employees
+    st.session_state[known_key] = {
+        name: employee_map[name] for name in selected_employees if name in employee_map
+    }
+    
+    # Nothing else to draw unless the create form is open
+    if not st.session_state[create_key]:
+        # Return selected employee IDs
+        return [employee_map[name] for name in selected_employees if name in employee_map]
+    
+    _render_create_employee_form(key_suffix, create_key, known_key, selected_employees)
+    
+    # Don't continue while creating employee
+    return []
+
+
+def _render_create_employee_form(
+    key_suffix: str,
+    create_key: str,
+    known_key: str,
+    selected_employees: List[str]
+) -> None:
+    """
+    Render the create-employee form and add a newly created employee to the selection.
+    
+    Args:
+        key_suffix: Suffix for unique session state keys
+        create_key: Session state key that keeps the form open
+        known_key: Session state key of the selected name -> ID map
+        selected_employees: Display names currently selected in the multiselect
+    """
+    st.markdown("---")
+    with st.expander("👤 **Create New Employee**", expanded=True):
+        with st.form(f"create_employee_form_{key_suffix}"):
+            st.markdown("#### Add New Employee")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                first_name = st.text_input(
+                    "First Name*",
+                    key=f"emp_first_name_{key_suffix}"
+                )
+                email = st.text_input(
+                    "Email",
+                    key=f"emp_email_{key_suffix}",
+                    placeholder="employee@barbershop.com"
+                )
+            
+            with col2:
+                last_name = st.text_input(
+                    "Last Name*",
+                    key=f"emp_last_name_{key_suffix}"
+                )
+                phone_number = st.text_input(
+                    "Phone Number",
+                    key=f"emp_phone_{key_suffix}",
+                    placeholder="(555) 123-4567"
+                )
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                job_title = st.selectbox(
+                    "Job Title",
+                    options=[
+                        "Barber",
+                        "Senior Barber", 
+                        "Barber Assistant",
+                        "Manager",
+                        "Owner",
+                        "Receptionist",
+                        "Other"
+                    ],
+                    key=f"emp_job_title_{key_suffix}"
+                )
+            
+            with col2:
+                hourly_rate = st.number_input(
+                    "Hourly Rate ($)",
+                    min_value=0.0,
+                    max_value=200.0,
+                    step=0.50,
+                    format="%.2f",
+                    key=f"emp_hourly_rate_{key_suffix}"
+                )
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                create_button = st.form_submit_button(
+                    "Create Employee",
+                    type="primary",
+                    use_container_width=True
+                )
+            
+            with col2:
+                cancel_button = st.form_submit_button(
+                    "Cancel",
+                    use_container_width=True
+                )
+            
+            if cancel_button:
+                st.session_state[create_key] = False
+                st.rerun()
+            
+            if create_button:
+                # Validate required fields
+                if not first_name or not last_name:
+                    st.error("First name and last name are required")
+                elif len(first_name.strip()) == 0 or len(last_name.strip()) == 0:
+                    st.error("First name and last name cannot be empty")
+                else:
+                    # Create the employee
+                    employee_data = {
+                        'first_name': first_name.strip(),
+                        'last_name': last_name.strip(),
+                        'email': email.strip() if email else '',
+                        'phone_number': phone_number.strip() if phone_number else '',
+                        'job_title': job_title,
+                        'hourly_rate': hourly_rate
+                    }
+                    
+                    new_employee_id = create_employee(employee_data)
+                    
+                    if new_employee_id:
+                        # Reset the form and automatically add to selection
+                        st.session_state[create_key] = False
+                        # Get the new employee's display name and add to selection
+                        new_display_name = f"{first_name.strip()} {last_name.strip()} ({job_title})"
+                        current_selections = selected_employees.copy()
+                        current_selections.append(new_display_name)
+                        st.session_state[f'selected_employees_{key_suffix}'] = current_selections
+                        st.session_state[known_key] = {
+                            **st.session_state.get(known_key, {}),
+                            new_display_name: new_employee_id
                         }
-                        
-                        new_employee_id = create_employee(employee_data)
-                        
-                        if new_employee_id:
-                            # Reset the form and automatically add to selection
-                            st.session_state[create_key] = False
-                            # Get the new employee's display name and add to selection
-                            new_display_name = f"{first_name.strip()} {last_name.strip()} ({job_title})"
-                            current_selections = selected_employees.copy()
-                            current_selections.append(new_display_name)
-                            st.session_state[f'selected_employees_{key_suffix}'] = current_selections
-                            st.info("🔄 Employee created and added to selection!")
-                            st.rerun()
+                        st.info("🔄 Employee created and added to selection!")
+                        st.rerun()
+
+
+def _format_employee_name(emp: Dict[str, Any]) -> str:
+    """Format an employee row as 'First Last (Job Title)'."""
+    name = f"{emp['FIRST_NAME']} {emp['LAST_NAME']}"
+    if emp.get('JOB_TITLE'):
+        return f"{name} ({emp['JOB_TITLE']})"
+    return name
+
+
+# {placeholders} is filled with one ? per requested ID
+EMPLOYEE_NAMES_QUERY_TEMPLATE = """
+SELECT EMPLOYEE_ID, FIRST_NAME, LAST_NAME, JOB_TITLE
+FROM OPERATIONAL.BARBER.EMPLOYEE
+WHERE EMPLOYEE_ID IN ({placeholders})
+"""
+
+
+@st.cache_data(ttl=EMPLOYEE_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_employee_display_names(employee_ids: Tuple[int, ...]) -> Dict[int, str]:
+    """
+    Load display names for a set of employees in one query.
+    
+    Raises on query failure so errors are not cached.
+    
+    Args:
+        employee_ids: Sorted tuple of unique employee IDs
         
-        # Don't continue while creating employee
-        return []
+    Returns:
+        Dict of employee ID to display name for the IDs that exist
+    """
+    placeholders = ", ".join("?" * len(employee_ids))
+    query = EMPLOYEE_NAMES_QUERY_TEMPLATE.format(placeholders=placeholders)
     
-    # Store current selection in session state
-    st.session_state[f'selected_employees_{key_suffix}'] = selected_employees
+    result = snowflake_conn.execute_query(query, list(employee_ids))
+    if result is None:
+        raise RuntimeError("Employee name query failed")
+    
+    return {emp['EMPLOYEE_ID']: _format_employee_name(emp) for emp in result}
+
+
+# Bumped on every clear so per-session name memos from before a write are dropped
+_employee_cache_generation = 0
+EMPLOYEE_NAME_MEMO_KEY = '_employee_name_memo'
+
+
+def clear_employee_cache() -> None:
+    """Drop cached employee data after an employee is created or changed."""
+    global _employee_cache_generation
+    _employee_cache_generation += 1
+    _fetch_all_employees.clear()
+    _fetch_employee_picker_data.clear()
+    _search_employees.clear()
+    _fetch_employee_display_names.clear()
+
+
+def _employee_name_memo() -> Dict[int, str]:
+    """Return this session's ID -> display name memo, reset after writes or the cache TTL."""
+    memo = st.session_state.get(EMPLOYEE_NAME_MEMO_KEY)
+    now = time.monotonic()
+    if (
+        memo is None
+        or memo['generation'] != _employee_cache_generation
+        or now - memo['created'] > EMPLOYEE_CACHE_TTL_SECONDS
+    ):
+        memo = {'generation': _employee_cache_generation, 'created': now, 'names': {}}
+        st.session_state[EMPLOYEE_NAME_MEMO_KEY] = memo
+    return memo['names']
+
+
+def get_employee_display_names(employee_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Get display names for several employees with a single query.
     
-    # Return selected employee IDs
-    selected_ids = []
-    for employee_name in selected_employees:
-        if employee_name in employee_map:
-            selected_ids.append(employee_map[employee_name])
+    Names already seen in this session are served from a memo, so only
+    unseen IDs are queried.
     
-    return selected_ids
+    Args:
+        employee_ids: Employee IDs; empty values are ignored
+        
+    Returns:
+        Dict of employee ID to display name
+    """
+    unique_ids = {employee_id for employee_id in employee_ids if employee_id}
+    if not unique_ids:
+        return {}
+    
+    memo = _employee_name_memo()
+    missing = tuple(sorted(unique_ids.difference(memo)))
+    if missing:
+        try:
+            memo.update(_fetch_employee_display_names(missing))
+        except Exception as e:
+            return {
+                employee_id: memo.get(employee_id, f"Employee #{employee_id} (Error: {str(e)})")
+                for employee_id in unique_ids
+            }
+    
+    return {
+        employee_id: memo.get(employee_id, f"Employee #{employee_id} (Not Found)")
+        for employee_id in unique_ids
+    }
 
 
 def get_employee_display_name(employee_id: int) -> str:
@@ -284,23 +565,4 @@ def get_employee_display_name(employee_id: int) -> str:
     if not employee_id:
         return "No Employee Assigned"
     
-    try:
-        query = """
-        SELECT FIRST_NAME, LAST_NAME, JOB_TITLE
-        FROM OPERATIONAL.BARBER.EMPLOYEE
-        WHERE EMPLOYEE_ID = ?
-        """
-        
-        result = snowflake_conn.execute_query(query, [employee_id])
-        
-        if result:
-            emp = result[0]
-            name = f"{emp['FIRST_NAME']} {emp['LAST_NAME']}"
-            if emp.get('JOB_TITLE'):
-                return f"{name} ({emp['JOB_TITLE']})"
-            return name
-        else:
-            return f"Employee #{employee_id} (Not Found)"
-            
-    except Exception as e:
-        return f"Employee #{employee_id} (Error: {str(e)})"
\ No newline at end of file
+    return get_employee_display_names([employee_id])[employee_id]
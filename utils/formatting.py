@@ -1,24 +1,32 @@
 from datetime import datetime, date, time, timedelta
+from functools import lru_cache
 from typing import Union, Optional, Dict, Tuple
 import streamlit as st
+from utils.text_normalize import strip_to_digits
 
+# Listings format the same amounts and phone numbers row after row
+@lru_cache(maxsize=1024)
 def format_currency(amount: float) -> str:
     """Format amount as currency"""
     return f"${amount:,.2f}"
 
+# Rows in a listing share service dates and appointment slots
+@lru_cache(maxsize=4096)
 def format_date(date_value: date) -> str:
     """Format date for display"""
     return date_value.strftime("%A, %B %d, %Y")
 
+@lru_cache(maxsize=4096)
 def format_time(time_value):
     if time_value is None:
         return "Unknown Time"  # Or any default value you'd like
     return time_value.strftime("%I:%M %p")
 
+@lru_cache(maxsize=4096)
 def format_phone(phone: str) -> str:
     """Format phone number"""
     # Remove any non-numeric characters
-    cleaned = ''.join(filter(str.isdigit, phone))
+    cleaned = strip_to_digits(phone)
     if len(cleaned) == 10:
         return f"({cleaned[:3]}) {cleaned[3:6]}-{cleaned[6:]}"
     return phone
@@ -40,35 +48,36 @@ def add_back_navigation():
 
 def format_receipt(data: dict) -> str:
     """Format receipt for printing/display"""
-    receipt = f"""
+    services = "\n".join(f"- {service}" for service in data["services"])
+    parts = [f"""
     EZ Biz Service Receipt
     ----------------------
     Customer: {data["customer_name"]}
     Service Date: {format_date(data["service_date"])}
 
     Services:
-    {chr(10).join(f"- {service}" for service in data["services"])}
+    {services}
 
     Payment Details:
     ----------------
     Total Cost: {format_currency(data["total_cost"])}
     Deposit: {format_currency(data["deposit"])}
-    """
+    """]
     
     if data.get("payment1", 0) > 0:
-        receipt += f"Payment 1: {format_currency(data['payment1'])} ({data['payment1_method']})\n"
+        parts.append(f"Payment 1: {format_currency(data['payment1'])} ({data['payment1_method']})\n")
     
     if data.get("payment2", 0) > 0:
-        receipt += f"Payment 2: {format_currency(data['payment2'])} ({data['payment2_method']})\n"
+        parts.append(f"Payment 2: {format_currency(data['payment2'])} ({data['payment2_method']})\n")
     
-    receipt += f"""
+    parts.append(f"""
     Final Total Received: {format_currency(data["final_total_received"])}
     Remaining Balance: {format_currency(data["remaining_balance"])}
 
     Notes:
     {data.get("notes", "")}
-    """
-    return receipt
+    """)
+    return "".join(parts)
 
 def render_date_range_picker(page_prefix: str) -> Tuple[date, date]:
     """
@@ -82,15 +91,21 @@ def render_date_range_picker(page_prefix: str) -> Tuple[date, date]:
     """
     st.subheader("Filter by Date Range")
     
-    # Quick date range options
+    # Quick date range options; the inputs below render later in the same run
+    # and pick up the new range, so no extra st.rerun() is needed
     col1, col2, col3, col4 = st.columns(4)
     today = datetime.now().date()
     
+    # Different default for scheduled vs completed; also the 30-day quick range
+    if page_prefix == 'scheduled':
+        default_start, default_end, button_text = today, today + timedelta(days=30), "📋 Next 30 Days"
+    else:  # completed
+        default_start, default_end, button_text = today - timedelta(days=30), today, "📋 Last 30 Days"
+    
     with col1:
         if st.button("📅 Today", use_container_width=True, key=f"{page_prefix}_today"):
             st.session_state[f'{page_prefix}_start_date'] = today
             st.session_state[f'{page_prefix}_end_date'] = today
-            st.rerun()
     
     with col2:
         if st.button("📆 This Week", use_container_width=True, key=f"{page_prefix}_week"):
@@ -99,7 +114,6 @@ def render_date_range_picker(page_prefix: str) -> Tuple[date, date]:
             end_of_week = start_of_week + timedelta(days=6)
             st.session_state[f'{page_prefix}_start_date'] = start_of_week
             st.session_state[f'{page_prefix}_end_date'] = end_of_week
-            st.rerun()
     
     with col3:
         if st.button("🗓️ This Month", use_container_width=True, key=f"{page_prefix}_month"):
@@ -111,49 +125,34 @@ def render_date_range_picker(page_prefix: str) -> Tuple[date, date]:
                 end_of_month = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
             st.session_state[f'{page_prefix}_start_date'] = start_of_month
             st.session_state[f'{page_prefix}_end_date'] = end_of_month
-            st.rerun()
     
     with col4:
-        # Different default for scheduled vs completed
-        if page_prefix == 'scheduled':
-            button_text = "📋 Next 30 Days"
-            default_start = today
-            default_end = today + timedelta(days=30)
-        else:  # completed
-            button_text = "📋 Last 30 Days" 
-            default_start = today - timedelta(days=30)
-            default_end = today
-            
         if st.button(button_text, use_container_width=True, key=f"{page_prefix}_30days"):
             st.session_state[f'{page_prefix}_start_date'] = default_start
             st.session_state[f'{page_prefix}_end_date'] = default_end
-            st.rerun()
     
-    # Custom date range inputs
-    col1, col2 = st.columns(2)
-    
-    # Set defaults based on page type
-    if page_prefix == 'scheduled':
-        default_start = today
-        default_end = today + timedelta(days=30)
-    else:  # completed
-        default_start = today - timedelta(days=30)
-        default_end = today
-    
-    with col1:
-        start_date = st.date_input(
-            "Start Date", 
-            value=st.session_state.get(f'{page_prefix}_start_date', default_start),
-            key=f"{page_prefix}_start_input"
-        )
-        st.session_state[f'{page_prefix}_start_date'] = start_date
+    # Custom date range inputs; the form holds edits back until Apply, so
+    # changing both dates reruns the page (and its queries) once, not per field
+    with st.form(f"{page_prefix}_date_range_form", border=False):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            start_date = st.date_input(
+                "Start Date", 
+                value=st.session_state.get(f'{page_prefix}_start_date', default_start),
+                key=f"{page_prefix}_start_input"
+            )
+        
+        with col2:
+            end_date = st.date_input(
+                "End Date", 
+                value=st.session_state.get(f'{page_prefix}_end_date', default_end),
+                key=f"{page_prefix}_end_input"
+            )
+        
+        st.form_submit_button("Apply Dates")
     
-    with col2:
-        end_date = st.date_input(
-            "End Date", 
-            value=st.session_state.get(f'{page_prefix}_end_date', default_end),
-            key=f"{page_prefix}_end_input"
-        )
-        st.session_state[f'{page_prefix}_end_date'] = end_date
+    st.session_state[f'{page_prefix}_start_date'] = start_date
+    st.session_state[f'{page_prefix}_end_date'] = end_date
     
     return start_date, end_date
\ No newline at end of file
@@ -1,6 +1,9 @@
 import requests
 import streamlit as st
 
+# Reused across calls so repeated sends keep the TLS connection to Mailgun open
+mailgun_session = requests.Session()
+
 def send_simple_message():
     """
     Example function to demonstrate how to use Mailgun API
@@ -9,15 +12,16 @@ def send_simple_message():
     # Get values from streamlit secrets
     api_key = st.secrets.get("mailgun", {}).get("api_key", "")
     domain = st.secrets.get("mailgun", {}).get("test_domain", "")
-    
+
     if not api_key or not domain:
         print("Mailgun API key or domain not configured in secrets")
         return None
-    
-    return requests.post(
+
+    return mailgun_session.post(
         f"https://api.mailgun.net/v3/{domain}/messages",
         auth=("api", api_key),
+        timeout=(3.05, 10),
         data={"from": f"Excited User <mailgun@{domain}>",
             "to": ["recipient@example.com"],
             "subject": "Hello",
-            "text": "Testing some Mailgun awesomeness!"}))
\ No newline at end of file
+            "text": "Testing some Mailgun awesomeness!"})
@@ -1,6 +1,6 @@
 # utils.null_handling
+import numpy as np
 import pandas as pd
-import math
 from typing import Any, Optional, TypeVar, Callable
 
 T = TypeVar('T')
@@ -17,25 +17,64 @@ def safe_get_value(value: Any, default: T, transform: Callable[[Any], T] = lambd
     Returns:
         Transformed value if valid, default otherwise
     """
+    if value is None:
+        return default
     try:
-        if pd.isnull(value) or (isinstance(value, float) and math.isnan(value)):
+        # NaN and NaT are the only values unequal to themselves; pd.NA raises
+        # TypeError here, which also falls through to the default
+        if value != value:
             return default
         return transform(value)
-    except (ValueError, TypeError, AttributeError):
+    except (ValueError, TypeError, AttributeError, OverflowError):
         return default
 
+# Exact builtin input types each target converts without error. Values of
+# these types skip the guarded path; NaN is the only one needing the default.
+_PLAIN_INPUT_TYPES = {
+    float: frozenset({float, int, bool}),
+    int: frozenset({int, bool}),
+    str: frozenset({str, int, float, bool}),
+    bool: frozenset({bool, int, float, str}),
+}
+
+def _convert(value: Any, default: T, target: Callable[[Any], T]) -> T:
+    """Converts a value to a builtin type, dispatching on the value's type."""
+    if type(value) in _PLAIN_INPUT_TYPES[target]:
+        return default if value != value else target(value)
+    return safe_get_value(value, default, target)
+
 def safe_get_float(value: Any, default: float = 0.0) -> float:
     """Safely converts a value to float."""
-    return safe_get_value(value, default, float)
+    return _convert(value, default, float)
 
 def safe_get_int(value: Any, default: int = 0) -> int:
     """Safely converts a value to int."""
-    return safe_get_value(value, default, int)
+    return _convert(value, default, int)
 
 def safe_get_string(value: Any, default: str = "") -> str:
     """Safely converts a value to string."""
-    return safe_get_value(value, default, str)
+    return _convert(value, default, str)
 
 def safe_get_bool(value: Any, default: bool = False) -> bool:
     """Safely converts a value to boolean."""
-    return safe_get_value(value, default, bool)
\ No newline at end of file
+    return _convert(value, default, bool)
+
+# Column-wise versions of the helpers above for DataFrame columns; missing or
+# unconvertible entries become the default without a Python-level loop
+
+def safe_series_float(series: pd.Series, default: float = 0.0) -> pd.Series:
+    """Safely converts a Series to float."""
+    return pd.to_numeric(series, errors='coerce').fillna(default).astype('float64')
+
+def safe_series_int(series: pd.Series, default: int = 0) -> pd.Series:
+    """Safely converts a Series to int; fractional values are truncated."""
+    numbers = pd.to_numeric(series, errors='coerce').replace([np.inf, -np.inf], np.nan)
+    return numbers.fillna(default).astype('int64')
+
+def safe_series_string(series: pd.Series, default: str = "") -> pd.Series:
+    """Safely converts a Series to string."""
+    return series.fillna(default).astype(str)
+
+def safe_series_bool(series: pd.Series, default: bool = False) -> pd.Series:
+    """Safely converts a Series to boolean."""
+    return series.fillna(default).astype(bool)
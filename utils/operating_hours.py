@@ -2,9 +2,87 @@
 Operating hours configuration utility for Ez_Biz_Barber
 """
 import streamlit as st
-from datetime import time
-from typing import Optional, Tuple, Dict, Any
+from datetime import date, time
+from functools import lru_cache
+from typing import Optional, Tuple, Dict, Any, Iterable, NamedTuple
 from database.connection import snowflake_conn
+from utils.business.info import clear_business_info_cache
+
+
+# Older BARBER schemas lack the operating hours columns; the schema only
+# changes with a migration, so one probe per process is enough
+OPERATING_HOURS_COLUMNS_QUERY = """
+SELECT COUNT(*) AS HOURS_COLUMN_COUNT
+FROM OPERATIONAL.INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = 'BARBER'
+AND TABLE_NAME = 'BUSINESS_INFO'
+AND COLUMN_NAME IN (
+    'OPERATING_HOURS_START', 'OPERATING_HOURS_END',
+    'WEEKEND_OPERATING_HOURS_START', 'WEEKEND_OPERATING_HOURS_END'
+)
+"""
+
+
+@st.cache_data(show_spinner=False)
+def _query_operating_hours_columns() -> bool:
+    """
+    Check whether BUSINESS_INFO has the operating hours columns (cached).
+    
+    Raises on query failure so errors are not cached.
+    """
+    result = snowflake_conn.execute_query(OPERATING_HOURS_COLUMNS_QUERY)
+    if not result:
+        raise RuntimeError("Could not read the BUSINESS_INFO columns")
+    return result[0]['HOURS_COLUMN_COUNT'] == 4
+
+
+def has_operating_hours_columns() -> bool:
+    """
+    Check whether the database can store operating hours.
+    
+    Returns:
+        bool: True if the columns exist or the check itself failed
+    """
+    try:
+        return _query_operating_hours_columns()
+    except Exception:
+        # Assume the current schema; queries against it report their own errors
+        return True
+
+
+# Operating hours gate scheduling on every rerun; saves clear this cache and
+# the short TTL covers hours set up from another process
+BUSINESS_HOURS_CACHE_TTL_SECONDS = 60
+
+BUSINESS_HOURS_QUERY = """
+SELECT 
+    OPERATING_HOURS_START,
+    OPERATING_HOURS_END,
+    WEEKEND_OPERATING_HOURS_START,
+    WEEKEND_OPERATING_HOURS_END
+FROM OPERATIONAL.BARBER.BUSINESS_INFO
+WHERE ACTIVE_STATUS = TRUE
+ORDER BY MODIFIED_DATE DESC
+LIMIT 1
+"""
+
+
+@st.cache_data(ttl=BUSINESS_HOURS_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_business_hours_row() -> Optional[Dict[str, Any]]:
+    """
+    Load the latest active business row's operating hours (cached).
+    
+    Shared by the configured check and the hours lookup.
+    Raises on query failure so errors are not cached.
+    """
+    # Without the columns there is nowhere to configure hours
+    if not has_operating_hours_columns():
+        return None
+    
+    result = snowflake_conn.execute_query(BUSINESS_HOURS_QUERY)
+    if result is None:
+        raise RuntimeError("Could not load business hours")
+    return result[0] if result else None
 
 
 def check_operating_hours_configured() -> bool:
@@ -19,34 +97,8 @@ def check_operating_hours_configured() -> bool:
         return True
         
     try:
-        # Check if BUSINESS_INFO table has any records with the required columns
-        # Since BARBER schema may not have operating hours columns yet, we'll use a fallback approach
-        query = """
-        SELECT BUSINESS_ID
-        FROM OPERATIONAL.BARBER.BUSINESS_INFO
-        ORDER BY MODIFIED_DATE DESC
-        LIMIT 1
-        """
-        
-        result = snowflake_conn.execute_query(query)
-        
-        if result:
-            # Try to check for operating hours columns (they may not exist yet)
-            try:
-                hours_query = """
-                SELECT OPERATING_HOURS_START, OPERATING_HOURS_END
-                FROM OPERATIONAL.BARBER.BUSINESS_INFO
-                WHERE BUSINESS_ID = ?
-                """
-                hours_result = snowflake_conn.execute_query(hours_query, [result[0]['BUSINESS_ID']])
-                
-                if hours_result and hours_result[0].get('OPERATING_HOURS_START') and hours_result[0].get('OPERATING_HOURS_END'):
-                    return True
-            except Exception:
-                # Columns don't exist yet, return False
-                pass
-        
-        return False
+        row = _fetch_business_hours_row()
+        return bool(row and row.get('OPERATING_HOURS_START') and row.get('OPERATING_HOURS_END'))
         
     except Exception as e:
         st.error(f"Error checking business info: {str(e)}")
@@ -134,8 +186,21 @@ def display_operating_hours_setup() -> bool:
             )
             
             if submitted:
+                # Strip each field once; the stripped values are validated and saved
+                fields = {
+                    key: value.strip() for key, value in (
+                        ('business_name', business_name),
+                        ('phone_number', business_phone),
+                        ('email_address', business_email),
+                        ('street_address', street_address),
+                        ('city', city),
+                        ('state', state),
+                        ('zip_code', zip_code)
+                    )
+                }
+                
                 # Validate required fields
-                if not all([business_name, business_phone, business_email, street_address, city, state, zip_code]):
+                if not all(fields.values()):
                     st.error("Please fill in all required fields marked with *")
                     return False
                 
@@ -148,31 +213,26 @@ def display_operating_hours_setup() -> bool:
                     st.error("Weekend closing time must be after opening time")
                     return False
                 
-                # Save to database
+                # Save to database; the hours columns store ISO time strings
                 success = save_business_info_with_hours({
-                    'business_name': business_name.strip(),
-                    'phone_number': business_phone.strip(),
-                    'email_address': business_email.strip(),
-                    'street_address': street_address.strip(),
-                    'city': city.strip(),
-                    'state': state.strip(),
-                    'zip_code': zip_code.strip(),
-                    'weekday_start': weekday_start,
-                    'weekday_end': weekday_end,
-                    'weekend_start': weekend_start,
-                    'weekend_end': weekend_end
+                    **fields,
+                    'weekday_start': weekday_start.isoformat(),
+                    'weekday_end': weekday_end.isoformat(),
+                    'weekend_start': weekend_start.isoformat(),
+                    'weekend_end': weekend_end.isoformat()
                 })
                 
                 if success:
                     st.success("✅ Business information and operating hours saved successfully!")
                     # Set a session state flag to indicate operating hours are now configured
                     st.session_state['operating_hours_configured'] = True
-                    st.session_state['business_hours_data'] = {
+                    st.session_state[BUSINESS_HOURS_SESSION_KEY] = {
                         'weekday_start': weekday_start,
                         'weekday_end': weekday_end,
                         'weekend_start': weekend_start,
                         'weekend_end': weekend_end
                     }
+                    st.session_state[BUSINESS_HOURS_GENERATION_KEY] = _business_hours_generation
                     st.info("✅ You can now proceed with scheduling below!")
                     return True
                 else:
@@ -182,155 +242,245 @@ def display_operating_hours_setup() -> bool:
     return False
 
 
+# Updates the latest active business row, or inserts one when there is none,
+# in a single statement
+SAVE_BUSINESS_INFO_WITH_HOURS_QUERY = """
+MERGE INTO OPERATIONAL.BARBER.BUSINESS_INFO AS target
+USING (
+    SELECT
+        (
+            SELECT BUSINESS_ID
+            FROM OPERATIONAL.BARBER.BUSINESS_INFO
+            WHERE ACTIVE_STATUS = TRUE
+            ORDER BY MODIFIED_DATE DESC
+            LIMIT 1
+        ) AS BUSINESS_ID,
+        ? AS BUSINESS_NAME,
+        ? AS PHONE_NUMBER,
+        ? AS EMAIL_ADDRESS,
+        ? AS STREET_ADDRESS,
+        ? AS CITY,
+        ? AS STATE,
+        ? AS ZIP_CODE,
+        ? AS OPERATING_HOURS_START,
+        ? AS OPERATING_HOURS_END,
+        ? AS WEEKEND_OPERATING_HOURS_START,
+        ? AS WEEKEND_OPERATING_HOURS_END
+) AS source
+ON target.BUSINESS_ID = source.BUSINESS_ID
+WHEN MATCHED THEN UPDATE SET
+    BUSINESS_NAME = source.BUSINESS_NAME,
+    PHONE_NUMBER = source.PHONE_NUMBER,
+    EMAIL_ADDRESS = source.EMAIL_ADDRESS,
+    STREET_ADDRESS = source.STREET_ADDRESS,
+    CITY = source.CITY,
+    STATE = source.STATE,
+    ZIP_CODE = source.ZIP_CODE,
+    OPERATING_HOURS_START = source.OPERATING_HOURS_START,
+    OPERATING_HOURS_END = source.OPERATING_HOURS_END,
+    WEEKEND_OPERATING_HOURS_START = source.WEEKEND_OPERATING_HOURS_START,
+    WEEKEND_OPERATING_HOURS_END = source.WEEKEND_OPERATING_HOURS_END,
+    ACTIVE_STATUS = TRUE,
+    MODIFIED_DATE = CURRENT_TIMESTAMP()
+WHEN NOT MATCHED THEN INSERT (
+    BUSINESS_NAME, PHONE_NUMBER, EMAIL_ADDRESS,
+    STREET_ADDRESS, CITY, STATE, ZIP_CODE,
+    OPERATING_HOURS_START, OPERATING_HOURS_END,
+    WEEKEND_OPERATING_HOURS_START, WEEKEND_OPERATING_HOURS_END,
+    ACTIVE_STATUS, CREATED_DATE, MODIFIED_DATE
+) VALUES (
+    source.BUSINESS_NAME, source.PHONE_NUMBER, source.EMAIL_ADDRESS,
+    source.STREET_ADDRESS, source.CITY, source.STATE, source.ZIP_CODE,
+    source.OPERATING_HOURS_START, source.OPERATING_HOURS_END,
+    source.WEEKEND_OPERATING_HOURS_START, source.WEEKEND_OPERATING_HOURS_END,
+    TRUE, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP()
+)
+"""
+
+# Same as above for schemas without the operating hours columns
+SAVE_BUSINESS_INFO_QUERY = """
+MERGE INTO OPERATIONAL.BARBER.BUSINESS_INFO AS target
+USING (
+    SELECT
+        (
+            SELECT BUSINESS_ID
+            FROM OPERATIONAL.BARBER.BUSINESS_INFO
+            WHERE ACTIVE_STATUS = TRUE
+            ORDER BY MODIFIED_DATE DESC
+            LIMIT 1
+        ) AS BUSINESS_ID,
+        ? AS BUSINESS_NAME,
+        ? AS PHONE_NUMBER,
+        ? AS EMAIL_ADDRESS,
+        ? AS STREET_ADDRESS,
+        ? AS CITY,
+        ? AS STATE,
+        ? AS ZIP_CODE
+) AS source
+ON target.BUSINESS_ID = source.BUSINESS_ID
+WHEN MATCHED THEN UPDATE SET
+    BUSINESS_NAME = source.BUSINESS_NAME,
+    PHONE_NUMBER = source.PHONE_NUMBER,
+    EMAIL_ADDRESS = source.EMAIL_ADDRESS,
+    STREET_ADDRESS = source.STREET_ADDRESS,
+    CITY = source.CITY,
+    STATE = source.STATE,
+    ZIP_CODE = source.ZIP_CODE,
+    ACTIVE_STATUS = TRUE,
+    MODIFIED_DATE = CURRENT_TIMESTAMP()
+WHEN NOT MATCHED THEN INSERT (
+    BUSINESS_NAME, PHONE_NUMBER, EMAIL_ADDRESS,
+    STREET_ADDRESS, CITY, STATE, ZIP_CODE,
+    ACTIVE_STATUS, CREATED_DATE, MODIFIED_DATE
+) VALUES (
+    source.BUSINESS_NAME, source.PHONE_NUMBER, source.EMAIL_ADDRESS,
+    source.STREET_ADDRESS, source.CITY, source.STATE, source.ZIP_CODE,
+    TRUE, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP()
+)
+"""
+
+
 def save_business_info_with_hours(data: Dict[str, Any]) -> bool:
     """
     Save business information with operating hours to the database.
     Handles case where operating hours columns may not exist yet.
     
     Args:
-        data: Dictionary containing business info and operating hours
+        data: Dictionary containing business info and operating hours,
+            with the hours as ISO time strings
         
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # First check if business info already exists
-        check_query = """
-        SELECT BUSINESS_ID 
-        FROM OPERATIONAL.BARBER.BUSINESS_INFO
-        ORDER BY MODIFIED_DATE DESC
-        LIMIT 1
-        """
-        
-        existing = snowflake_conn.execute_query(check_query)
+        business_params = [
+            data['business_name'],
+            data['phone_number'],
+            data['email_address'],
+            data['street_address'],
+            data['city'],
+            data['state'],
+            data['zip_code']
+        ]
+        hours_params = [
+            data['weekday_start'],
+            data['weekday_end'],
+            data['weekend_start'],
+            data['weekend_end']
+        ]
         
-        # Try to save with operating hours columns first, fallback to basic info if columns don't exist
-        try:
-            if existing:
-                # Update existing record with operating hours
-                update_query = """
-                UPDATE OPERATIONAL.BARBER.BUSINESS_INFO
-                SET BUSINESS_NAME = ?,
-                    PHONE_NUMBER = ?,
-                    EMAIL_ADDRESS = ?,
-                    STREET_ADDRESS = ?,
-                    CITY = ?,
-                    STATE = ?,
-                    ZIP_CODE = ?,
-                    OPERATING_HOURS_START = ?,
-                    OPERATING_HOURS_END = ?,
-                    WEEKEND_OPERATING_HOURS_START = ?,
-                    WEEKEND_OPERATING_HOURS_END = ?,
-                    ACTIVE_STATUS = TRUE,
-                    MODIFIED_DATE = CURRENT_TIMESTAMP()
-                WHERE BUSINESS_ID = ?
-                """
-                
-                params = [
-                    data['business_name'],
-                    data['phone_number'], 
-                    data['email_address'],
-                    data['street_address'],
-                    data['city'],
-                    data['state'],
-                    data['zip_code'],
-                    data['weekday_start'].isoformat(),
-                    data['weekday_end'].isoformat(),
-                    data['weekend_start'].isoformat(),
-                    data['weekend_end'].isoformat(),
-                    existing[0]['BUSINESS_ID']
-                ]
-                
-            else:
-                # Insert new record with operating hours
-                update_query = """
-                INSERT INTO OPERATIONAL.BARBER.BUSINESS_INFO (
-                    BUSINESS_NAME, PHONE_NUMBER, EMAIL_ADDRESS,
-                    STREET_ADDRESS, CITY, STATE, ZIP_CODE,
-                    OPERATING_HOURS_START, OPERATING_HOURS_END,
-                    WEEKEND_OPERATING_HOURS_START, WEEKEND_OPERATING_HOURS_END,
-                    ACTIVE_STATUS, CREATED_DATE, MODIFIED_DATE
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, TRUE, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
-                """
-                
-                params = [
-                    data['business_name'],
-                    data['phone_number'],
-                    data['email_address'], 
-                    data['street_address'],
-                    data['city'],
-                    data['state'],
-                    data['zip_code'],
-                    data['weekday_start'].isoformat(),
-                    data['weekday_end'].isoformat(),
-                    data['weekend_start'].isoformat(),
-                    data['weekend_end'].isoformat()
-                ]
+        if has_operating_hours_columns():
+            if snowflake_conn.execute_query(SAVE_BUSINESS_INFO_WITH_HOURS_QUERY, business_params + hours_params) is None:
+                return False
             
-            snowflake_conn.execute_query(update_query, params)
+            clear_business_hours_cache()
+            clear_business_info_cache()
             return True
-            
-        except Exception as hours_error:
-            # Operating hours columns don't exist, save basic business info only
+        
+        # Operating hours columns don't exist, save basic business info only;
+        # the schema won't change mid-session, so say so once
+        if not st.session_state.get('hours_columns_warned', False):
             st.warning("⚠️ Operating hours columns don't exist in database. Saving basic business info only.")
-            
-            if existing:
-                # Update existing record without operating hours
-                fallback_query = """
-                UPDATE OPERATIONAL.BARBER.BUSINESS_INFO
-                SET BUSINESS_NAME = ?,
-                    PHONE_NUMBER = ?,
-                    EMAIL_ADDRESS = ?,
-                    STREET_ADDRESS = ?,
-                    CITY = ?,
-                    STATE = ?,
-                    ZIP_CODE = ?,
-                    MODIFIED_DATE = CURRENT_TIMESTAMP()
-                WHERE BUSINESS_ID = ?
-                """
-                
-                fallback_params = [
-                    data['business_name'],
-                    data['phone_number'],
-                    data['email_address'],
-                    data['street_address'],
-                    data['city'],
-                    data['state'],
-                    data['zip_code'],
-                    existing[0]['BUSINESS_ID']
-                ]
-            else:
-                # Insert new record without operating hours
-                fallback_query = """
-                INSERT INTO OPERATIONAL.BARBER.BUSINESS_INFO (
-                    BUSINESS_NAME, PHONE_NUMBER, EMAIL_ADDRESS,
-                    STREET_ADDRESS, CITY, STATE, ZIP_CODE,
-                    CREATED_DATE, MODIFIED_DATE
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
-                """
-                
-                fallback_params = [
-                    data['business_name'],
-                    data['phone_number'],
-                    data['email_address'],
-                    data['street_address'],
-                    data['city'],
-                    data['state'],
-                    data['zip_code']
-                ]
-            
-            snowflake_conn.execute_query(fallback_query, fallback_params)
-            st.info("💡 Business info saved. Operating hours are stored in session for this scheduling session.")
-            return True
+            st.session_state['hours_columns_warned'] = True
+        
+        if snowflake_conn.execute_query(SAVE_BUSINESS_INFO_QUERY, business_params) is None:
+            return False
+        
+        clear_business_info_cache()
+        st.info("💡 Business info saved. Operating hours are stored in session for this scheduling session.")
+        return True
         
     except Exception as e:
         st.error(f"Database error: {str(e)}")
         return False
 
 
+# Used when hours are not configured or can't be read
+DEFAULT_BUSINESS_START = time(8, 0)
+DEFAULT_BUSINESS_END = time(17, 0)
+
+
+class BusinessHours(NamedTuple):
+    """Parsed weekday and weekend operating hours"""
+    weekday_start: time
+    weekday_end: time
+    weekend_start: time
+    weekend_end: time
+
+
+@lru_cache(maxsize=8)
+def _parse_time(value: str) -> time:
+    """Parse a stored ISO time string; only a handful of distinct values exist."""
+    return time.fromisoformat(value)
+
+
+def _parse_hours(start_value: Any, end_value: Any) -> Tuple[time, time]:
+    """Parse a start/end pair of stored times, falling back to the defaults."""
+    try:
+        business_start = _parse_time(str(start_value)) if start_value else DEFAULT_BUSINESS_START
+        business_end = _parse_time(str(end_value)) if end_value else DEFAULT_BUSINESS_END
+        return business_start, business_end
+    except (ValueError, TypeError):
+        return DEFAULT_BUSINESS_START, DEFAULT_BUSINESS_END
+
+
+def _load_business_hours() -> Optional[BusinessHours]:
+    """Parse the latest operating hours row, or None if there is none."""
+    row = _fetch_business_hours_row()
+    if not row:
+        return None
+    
+    return BusinessHours(
+        *_parse_hours(row.get('OPERATING_HOURS_START'), row.get('OPERATING_HOURS_END')),
+        *_parse_hours(row.get('WEEKEND_OPERATING_HOURS_START'), row.get('WEEKEND_OPERATING_HOURS_END'))
+    )
+
+
+# Sessions keep a snapshot of the hours under BUSINESS_HOURS_SESSION_KEY; it
+# is reloaded once clear_business_hours_cache bumps this generation
+BUSINESS_HOURS_SESSION_KEY = 'business_hours_data'
+BUSINESS_HOURS_GENERATION_KEY = '_business_hours_generation'
+_business_hours_generation = 0
+
+
+def clear_business_hours_cache() -> None:
+    """Drop cached operating hours after business info is saved."""
+    global _business_hours_generation
+    _business_hours_generation += 1
+    _fetch_business_hours_row.clear()
+
+
+def _ensure_business_hours_in_session() -> Optional[Dict[str, time]]:
+    """
+    Load operating hours into session state once per session.
+    
+    Returns:
+        Dict of weekday/weekend start and end times, or None if not configured
+    """
+    hours_data = st.session_state.get(BUSINESS_HOURS_SESSION_KEY)
+    if hours_data and st.session_state.get(BUSINESS_HOURS_GENERATION_KEY) == _business_hours_generation:
+        return hours_data
+    
+    try:
+        # Parsed once per session; lookups per date read the snapshot
+        business_hours = _load_business_hours()
+    except Exception:
+        business_hours = None
+    
+    if not business_hours:
+        # Keep hours saved in this session when the database has none
+        return hours_data or None
+    
+    hours_data = business_hours._asdict()
+    st.session_state[BUSINESS_HOURS_SESSION_KEY] = hours_data
+    st.session_state[BUSINESS_HOURS_GENERATION_KEY] = _business_hours_generation
+    return hours_data
+
+
 def get_business_hours_for_date(service_date) -> Tuple[time, time]:
     """
-    Get business hours for a specific date from database or session state.
+    Get business hours for a specific date from session state, loaded from
+    the database once per session.
     Fallback to defaults if not configured.
     
     Args:
@@ -339,55 +489,35 @@ def get_business_hours_for_date(service_date) -> Tuple[time, time]:
     Returns:
         Tuple of (start_time, end_time) for business hours
     """
-    # First check session state for operating hours (for same-session configuration)
-    if st.session_state.get('business_hours_data'):
-        hours_data = st.session_state['business_hours_data']
-        is_weekend = service_date.weekday() >= 5
-        
-        if is_weekend:
-            return hours_data['weekend_start'], hours_data['weekend_end']
-        else:
-            return hours_data['weekday_start'], hours_data['weekday_end']
+    # Check if it's weekend (Saturday = 5, Sunday = 6)
+    is_weekend = service_date.weekday() >= 5
     
-    try:
-        # Try to get from database (may fail if columns don't exist)
-        business_hours_query = """
-        SELECT 
-            OPERATING_HOURS_START,
-            OPERATING_HOURS_END,
-            WEEKEND_OPERATING_HOURS_START,
-            WEEKEND_OPERATING_HOURS_END
-        FROM OPERATIONAL.BARBER.BUSINESS_INFO
-        ORDER BY MODIFIED_DATE DESC
-        LIMIT 1
-        """
-        
-        business_hours_result = snowflake_conn.execute_query(business_hours_query)
-        
-        if business_hours_result:
-            business_info = business_hours_result[0]
-            # Check if it's weekend (Saturday = 5, Sunday = 6)
-            is_weekend = service_date.weekday() >= 5
-            
-            # Get appropriate hours based on weekday/weekend
-            if is_weekend:
-                start_time_str = business_info.get('WEEKEND_OPERATING_HOURS_START')
-                end_time_str = business_info.get('WEEKEND_OPERATING_HOURS_END')
-            else:
-                start_time_str = business_info.get('OPERATING_HOURS_START')
-                end_time_str = business_info.get('OPERATING_HOURS_END')
-            
-            # Parse time strings, fallback to defaults if parsing fails
-            try:
-                business_start = time.fromisoformat(str(start_time_str)) if start_time_str else time(8, 0)
-                business_end = time.fromisoformat(str(end_time_str)) if end_time_str else time(17, 0)
-                return business_start, business_end
-            except (ValueError, TypeError):
-                pass
-        
-        # Fallback to defaults if no business hours found or parsing failed
-        return time(8, 0), time(17, 0)
+    hours_data = _ensure_business_hours_in_session()
+    if not hours_data:
+        # Fallback to defaults if no business hours are configured or readable
+        return DEFAULT_BUSINESS_START, DEFAULT_BUSINESS_END
+    
+    if is_weekend:
+        return hours_data['weekend_start'], hours_data['weekend_end']
+    return hours_data['weekday_start'], hours_data['weekday_end']
+
+
+def get_business_hours_for_dates(dates: Iterable[date]) -> Dict[date, Tuple[time, time]]:
+    """
+    Get business hours for several dates with a single hours lookup.
+    
+    Args:
+        dates: Dates to check business hours for
         
-    except Exception as e:
-        # Database query failed (likely columns don't exist), fallback to defaults
-        return time(8, 0), time(17, 0)
\ No newline at end of file
+    Returns:
+        Dict mapping each date to its (start_time, end_time)
+    """
+    hours_data = _ensure_business_hours_in_session()
+    if not hours_data:
+        weekday_hours = weekend_hours = (DEFAULT_BUSINESS_START, DEFAULT_BUSINESS_END)
+    else:
+        weekday_hours = (hours_data['weekday_start'], hours_data['weekday_end'])
+        weekend_hours = (hours_data['weekend_start'], hours_data['weekend_end'])
+    
+    # Saturday = 5, Sunday = 6
+    return {d: weekend_hours if d.weekday() >= 5 else weekday_hours for d in dates}
@@ -1,9 +1,13 @@
 # utils/portal/security.py
 import secrets
-from datetime import datetime, timedelta
 from typing import Optional, Tuple, Dict
 import streamlit as st
 from database.connection import snowflake_conn
+from .verification import fetch_token_status
+
+# Unknown, expired and spent tokens are reported alike, so a caller learns
+# nothing about which tokens exist
+INVALID_TOKEN_MESSAGE = "Invalid or expired token"
 
 def verify_action_token(token: str, token_type: str) -> Tuple[bool, Optional[int], str]:
     """
@@ -11,46 +15,40 @@ def verify_action_token(token: str, token_type: str) -> Tuple[bool, Optional[int
     Returns (is_valid, user_id, message)
     """
     try:
-        query = """
-        SELECT 
-            t.TOKEN_ID,
-            t.PORTAL_USER_ID,
-            t.EXPIRES_AT,
-            t.IS_USED,
-            u.EMAIL_VERIFIED
-        FROM OPERATIONAL.BARBER.VERIFICATION_TOKENS t
-        JOIN OPERATIONAL.BARBER.CUSTOMER_PORTAL_USERS u 
-            ON t.PORTAL_USER_ID = u.PORTAL_USER_ID
-        WHERE t.TOKEN_ID = ?
-        AND t.TOKEN_TYPE = ?
-        """
-        
-        result = snowflake_conn.execute_query(query, [token, token_type])
-        if not result:
-            return False, None, "Invalid token"
+        token_data = fetch_token_status(token, token_type)
+        if not token_data:
+            return False, None, INVALID_TOKEN_MESSAGE
             
-        token_data = result[0]
-        
-        # Check if token is expired
-        if token_data['EXPIRES_AT'] < datetime.now():
-            return False, None, "Token has expired"
+        # Check if token is expired (against the database clock that set it)
+        if token_data['IS_EXPIRED']:
+            return False, None, INVALID_TOKEN_MESSAGE
             
         # Check if token was already used
         if token_data['IS_USED']:
             if token_type == 'EMAIL_VERIFICATION' and token_data['EMAIL_VERIFIED']:
                 return False, None, "Email already verified"
-            return False, None, "Token has already been used"
+            return False, None, INVALID_TOKEN_MESSAGE
             
-        # Mark token as used
+        # Mark token as used; the same guards in WHERE make this the single
+        # point where a token is consumed, so only one concurrent use wins
         update_query = """
-        UPDATE VERIFICATION_TOKENS
+        UPDATE OPERATIONAL.BARBER.VERIFICATION_TOKENS
         SET 
             IS_USED = TRUE,
             USED_AT = CURRENT_TIMESTAMP()
         WHERE TOKEN_ID = ?
+        AND TOKEN_TYPE = ?
+        AND IS_USED = FALSE
+        AND EXPIRES_AT > CURRENT_TIMESTAMP()
         """
         
-        snowflake_conn.execute_query(update_query, [token])
+        update_result = snowflake_conn.execute_query(update_query, [token, token_type])
+        if not update_result:
+            return False, None, "Error verifying token"
+        
+        # UPDATE reports the number of rows updated first
+        if not next(iter(update_result[0].values())):
+            return False, None, INVALID_TOKEN_MESSAGE
         
         return True, int(token_data['PORTAL_USER_ID']), "Token valid"
         
@@ -81,43 +79,35 @@ def check_rate_limit(
     max_attempts = limits[action_type]['count']
     
     try:
-        # Get attempts in time window
-        query = """
-        SELECT COUNT(*) as attempt_count
+        # Count the attempts in the window and log this one in one statement;
+        # nothing is inserted once the limit is reached
+        user_filter = "AND PORTAL_USER_ID = ?" if user_id else ""
+        query = f"""
+        INSERT INTO RATE_LIMIT_LOG (
+            IP_ADDRESS, ACTION_TYPE, PORTAL_USER_ID,
+            ATTEMPT_COUNT
+        )
+        SELECT ?, ?, ?, COUNT(*) + 1
         FROM RATE_LIMIT_LOG
         WHERE IP_ADDRESS = ?
         AND ACTION_TYPE = ?
         AND LAST_ATTEMPT > DATEADD(minute, -?, CURRENT_TIMESTAMP())
+        {user_filter}
+        HAVING COUNT(*) < ?
         """
-        params = [ip_address, action_type, window_minutes]
-        
+        params = [ip_address, action_type, user_id, ip_address, action_type, window_minutes]
         if user_id:
-            query += " AND PORTAL_USER_ID = ?"
             params.append(user_id)
+        params.append(max_attempts)
         
         result = snowflake_conn.execute_query(query, params)
         if not result:
             return True, "First attempt"
-            
-        current_attempts = result[0]['ATTEMPT_COUNT']
         
-        if current_attempts >= max_attempts:
+        # INSERT reports a single "number of rows inserted" column
+        rows_inserted = next(iter(result[0].values()))
+        if not rows_inserted:
             return False, f"Rate limit exceeded for {action_type}"
-            
-        # Log attempt
-        log_query = """
-        INSERT INTO RATE_LIMIT_LOG (
-            IP_ADDRESS, ACTION_TYPE, PORTAL_USER_ID,
-            ATTEMPT_COUNT
-        ) VALUES (?, ?, ?, ?)
-        """
-        
-        snowflake_conn.execute_query(log_query, [
-            ip_address,
-            action_type,
-            user_id,
-            current_attempts + 1
-        ])
         
         return True, "Rate limit check passed"
         
@@ -137,30 +127,34 @@ def check_suspicious_activity(
     try:
         checks = []
         
-        # Check for rapid requests from same IP
-        rapid_query = """
-        SELECT COUNT(*) as request_count
+        # Count rapid requests from the same IP and recent failures for the
+        # user in one scan of the last 30 minutes; with no user the failure
+        # count compares against NULL and stays 0
+        activity_query = """
+        SELECT 
+            COUNT_IF(
+                IP_ADDRESS = ?
+                AND EVENT_TIME > DATEADD(second, -5, CURRENT_TIMESTAMP())
+            ) as request_count,
+            COUNT_IF(
+                PORTAL_USER_ID = ?
+                AND EVENT_TYPE IN ('LOGIN_FAILED', 'VERIFY_FAILED')
+            ) as fail_count
         FROM OPERATIONAL.BARBER.SESSION_LOG
-        WHERE IP_ADDRESS = ?
-        AND EVENT_TIME > DATEADD(second, -5, CURRENT_TIMESTAMP())
+        WHERE EVENT_TIME > DATEADD(minute, -30, CURRENT_TIMESTAMP())
+        AND (IP_ADDRESS = ? OR PORTAL_USER_ID = ?)
         """
         
-        result = snowflake_conn.execute_query(rapid_query, [ip_address])
-        if result and result[0]['REQUEST_COUNT'] > 10:
-            checks.append("Rapid requests detected")
-            
-        # Check for multiple failed attempts
-        if user_id:
-            fails_query = """
-            SELECT COUNT(*) as fail_count
-            FROM OPERATIONAL.BARBER.SESSION_LOG
-            WHERE PORTAL_USER_ID = ?
-            AND EVENT_TYPE IN ('LOGIN_FAILED', 'VERIFY_FAILED')
-            AND EVENT_TIME > DATEADD(minute, -30, CURRENT_TIMESTAMP())
-            """
+        result = snowflake_conn.execute_query(
+            activity_query, [ip_address, user_id, ip_address, user_id]
+        )
+        if result:
+            # Check for rapid requests from same IP
+            if result[0]['REQUEST_COUNT'] > 10:
+                checks.append("Rapid requests detected")
             
-            result = snowflake_conn.execute_query(fails_query, [user_id])
-            if result and result[0]['FAIL_COUNT'] > 5:
+            # Check for multiple failed attempts
+            if result[0]['FAIL_COUNT'] > 5:
                 checks.append("Multiple failed attempts")
                 
         # Return results
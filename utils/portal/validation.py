@@ -1,15 +1,58 @@
 import re
-from typing import Tuple, Optional, Dict, List, Union
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+import string
+from typing import Callable, Tuple, Optional, Dict, List, Union, NamedTuple
+from datetime import datetime, time, timedelta
+from utils.text_normalize import strip_to_digits
 
-@dataclass
-class ValidationResult:
-    """Standardized validation result object"""
+# Compiled once at import; these run on every form submission
+ZIP_CODE_PATTERN = re.compile(r'^\d{5}$')
+ZIP_PLUS_FOUR_PATTERN = re.compile(r'^\d{5}-\d{4}$')
+# Same inputs strptime's '%H:%M' accepts
+HOUR_MINUTE_PATTERN = re.compile(r'(2[0-3]|[0-1]\d|\d):([0-5]\d|\d)')
+
+# Service hours checked by validate_business_hours
+WEEKDAY_SERVICE_START = time(8, 0)
+WEEKDAY_SERVICE_END = time(17, 0)
+SATURDAY_SERVICE_START = time(9, 0)
+SATURDAY_SERVICE_END = time(14, 0)
+
+# Valid US state codes
+VALID_STATES = frozenset({
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
+    'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+    'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+    'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+    'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
+})
+
+# Characters allowed on each side of the '@' in an email address
+EMAIL_LOCAL_CHARS = string.ascii_letters + string.digits + '._%+-'
+EMAIL_DOMAIN_CHARS = string.ascii_letters + string.digits + '.-'
+
+class ValidationResult(NamedTuple):
+    """Standardized validation result object; immutable and without a per-instance __dict__"""
     is_valid: bool
     message: Optional[str] = None
     data: Optional[Union[str, datetime, dict]] = None
 
+def _is_email_format(email: str) -> bool:
+    """
+    Check local@domain.tld in a single scan of each part.
+    
+    Matches ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}$ without the
+    regex engine: a part is valid when stripping its allowed characters
+    leaves nothing, and the alphabetic TLD must follow the last '.'.
+    """
+    local, at, domain = email.partition('@')
+    if not at or not local or local.strip(EMAIL_LOCAL_CHARS):
+        return False
+    
+    host, dot, tld = domain.rpartition('.')
+    return bool(
+        dot and host and not host.strip(EMAIL_DOMAIN_CHARS)
+        and len(tld) >= 2 and tld.isascii() and tld.isalpha()
+    )
+
 def validate_email(email: str) -> ValidationResult:
     """
     Validate email format using RFC 5322 standards
@@ -18,12 +61,11 @@ def validate_email(email: str) -> ValidationResult:
         - message: error message if invalid
         - data: normalized email if valid
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     if not email:
         return ValidationResult(False, "Email address is required")
     
     email = email.strip().lower()
-    if not re.match(pattern, email):
+    if not _is_email_format(email):
         return ValidationResult(False, "Invalid email format")
     
     return ValidationResult(True, data=email)
@@ -41,7 +83,7 @@ def validate_phone(phone: str) -> ValidationResult:
         return ValidationResult(False, "Phone number is required")
     
     # Remove all non-digit characters
-    digits = re.sub(r'\D', '', phone)
+    digits = strip_to_digits(phone)
     
     # Validate length (10 digits or 11 digits with country code)
     if len(digits) == 10:
@@ -68,11 +110,11 @@ def validate_zip_code(zip_code: str) -> ValidationResult:
     zip_code = zip_code.strip()
     
     # Basic 5-digit ZIP code
-    if re.match(r'^\d{5}$', zip_code):
+    if ZIP_CODE_PATTERN.match(zip_code):
         return ValidationResult(True, data=zip_code)
     
     # ZIP+4 format
-    if re.match(r'^\d{5}-\d{4}$', zip_code):
+    if ZIP_PLUS_FOUR_PATTERN.match(zip_code):
         return ValidationResult(True, data=zip_code)
     
     return ValidationResult(False, "Invalid ZIP code format")
@@ -135,7 +177,10 @@ def validate_business_hours(
         if not time_str:
             return ValidationResult(False, "Service time is required")
             
-        time = datetime.strptime(time_str, '%H:%M').time()
+        match = HOUR_MINUTE_PATTERN.fullmatch(time_str)
+        if not match:
+            raise ValueError(f"Invalid time: {time_str}")
+        service_time = time(int(match.group(1)), int(match.group(2)))
         
         # Check if Sunday
         if date.weekday() == 6:  # Sunday
@@ -143,9 +188,7 @@ def validate_business_hours(
             
         # Check Saturday hours
         if date.weekday() == 5:  # Saturday
-            start = datetime.strptime('09:00', '%H:%M').time()
-            end = datetime.strptime('14:00', '%H:%M').time()
-            if time < start or time > end:
+            if service_time < SATURDAY_SERVICE_START or service_time > SATURDAY_SERVICE_END:
                 return ValidationResult(
                     False,
                     "Saturday service hours are 9:00 AM to 2:00 PM"
@@ -153,15 +196,13 @@ def validate_business_hours(
                 
         # Check weekday hours
         else:
-            start = datetime.strptime('08:00', '%H:%M').time()
-            end = datetime.strptime('17:00', '%H:%M').time()
-            if time < start or time > end:
+            if service_time < WEEKDAY_SERVICE_START or service_time > WEEKDAY_SERVICE_END:
                 return ValidationResult(
                     False,
                     "Weekday service hours are 8:00 AM to 5:00 PM"
                 )
                 
-        return ValidationResult(True, data=time)
+        return ValidationResult(True, data=service_time)
         
     except ValueError:
         return ValidationResult(False, "Invalid time format (use HH:MM)")
@@ -179,62 +220,65 @@ def validate_state(state: str) -> ValidationResult:
     
     state = state.strip().upper()
     
-    # List of valid US state codes
-    valid_states = {
-        'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
-        'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-        'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-        'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-        'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
-    }
-    
-    if state not in valid_states:
+    if state not in VALID_STATES:
         return ValidationResult(False, "Invalid state code")
     
     return ValidationResult(True, data=state)
 
-def validate_customer_data(data: Dict[str, str]) -> Tuple[bool, List[str]]:
-    """
-    Validate complete customer form data
-    Returns:
-        - is_valid: bool
-        - list of error messages
-    """
+# Extra format checks for fields that have them, shared by the form validators
+FIELD_VALIDATORS: Dict[str, Callable[[str], ValidationResult]] = {
+    'phone_number': validate_phone,
+    'email_address': validate_email,
+    'state': validate_state,
+    'zip_code': validate_zip_code
+}
+
+CUSTOMER_REQUIRED_FIELDS = {
+    'first_name': "First Name",
+    'last_name': "Last Name",
+    'phone_number': "Phone Number",
+    'street_address': "Street Address",
+    'city': "City",
+    'state': "State",
+    'zip_code': "ZIP Code"
+}
+
+BUSINESS_REQUIRED_FIELDS = {
+    'business_name': "Business Name",
+    'street_address': "Street Address",
+    'city': "City",
+    'state': "State",
+    'zip_code': "ZIP Code",
+    'phone_number': "Phone Number",
+    'email_address': "Email Address"
+}
+
+def _validate_fields(data: Dict[str, str], required_fields: Dict[str, str]) -> List[str]:
+    """Check required fields are present and pass their format checks; returns error messages."""
     errors = []
-    
-    # Required fields
-    required_fields = {
-        'first_name': "First Name",
-        'last_name': "Last Name",
-        'phone_number': "Phone Number",
-        'street_address': "Street Address",
-        'city': "City",
-        'state': "State",
-        'zip_code': "ZIP Code"
-    }
-    
-    # Check required fields
     for field, label in required_fields.items():
-        if not data.get(field):
+        value = data.get(field)
+        if not value:
             errors.append(f"{label} is required")
             continue
         
-        # Additional validation for specific fields
-        if field == 'phone_number':
-            result = validate_phone(data[field])
-            if not result.is_valid:
-                errors.append(result.message)
-        
-        elif field == 'state':
-            result = validate_state(data[field])
-            if not result.is_valid:
-                errors.append(result.message)
-        
-        elif field == 'zip_code':
-            result = validate_zip_code(data[field])
+        validator = FIELD_VALIDATORS.get(field)
+        if validator:
+            result = validator(value)
             if not result.is_valid:
                 errors.append(result.message)
     
+    return errors
+
+def validate_customer_data(data: Dict[str, str]) -> Tuple[bool, List[str]]:
+    """
+    Validate complete customer form data
+    Returns:
+        - is_valid: bool
+        - list of error messages
+    """
+    errors = _validate_fields(data, CUSTOMER_REQUIRED_FIELDS)
+    
     # Email validation if provided
     if email := data.get('email_address'):
         result = validate_email(email)
@@ -250,49 +294,11 @@ def validate_business_data(data: Dict[str, str]) -> Tuple[bool, List[str]]:
         - is_valid: bool
         - list of error messages
     """
-    errors = []
-    
-    # Required fields
-    required_fields = {
-        'business_name': "Business Name",
-        'street_address': "Street Address",
-        'city': "City",
-        'state': "State",
-        'zip_code': "ZIP Code",
-        'phone_number': "Phone Number",
-        'email_address': "Email Address"
-    }
-    
-    # Check required fields
-    for field, label in required_fields.items():
-        if not data.get(field):
-            errors.append(f"{label} is required")
-            continue
-        
-        # Additional validation for specific fields
-        if field == 'phone_number':
-            result = validate_phone(data[field])
-            if not result.is_valid:
-                errors.append(result.message)
-        
-        elif field == 'email_address':
-            result = validate_email(data[field])
-            if not result.is_valid:
-                errors.append(result.message)
-        
-        elif field == 'state':
-            result = validate_state(data[field])
-            if not result.is_valid:
-                errors.append(result.message)
-        
-        elif field == 'zip_code':
-            result = validate_zip_code(data[field])
-            if not result.is_valid:
-                errors.append(result.message)
+    errors = _validate_fields(data, BUSINESS_REQUIRED_FIELDS)
     
     # Website validation if provided
     if website := data.get('website'):
         if not website.startswith(('http://', 'https://')):
             errors.append("Website must begin with http:// or https://")
     
-    return not bool(errors), errors
\ No newline at end of file
+    return not bool(errors), errors
@@ -1,30 +1,29 @@
 # utils/portal/verification.py
 import secrets
-from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 import streamlit as st
 from database.connection import snowflake_conn
+from utils.business.info import fetch_business_info
+from utils.email import send_email
 
 def generate_verification_token(portal_user_id: int, token_type: str) -> Optional[str]:
     """Generate a secure verification token"""
     try:
         # Generate token
         token = secrets.token_urlsafe(32)
-        expires_at = datetime.now() + timedelta(hours=24)
         
-        # Save token
+        # Save token; expiry is set on the database clock it is checked against
         query = """
         INSERT INTO OPERATIONAL.BARBER.VERIFICATION_TOKENS (
             TOKEN_ID, PORTAL_USER_ID, TOKEN_TYPE,
             EXPIRES_AT, CREATED_AT
-        ) VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP())
+        ) VALUES (?, ?, ?, DATEADD(hour, 24, CURRENT_TIMESTAMP()), CURRENT_TIMESTAMP())
         """
         
         snowflake_conn.execute_query(query, [
             token,
             portal_user_id,
-            token_type,
-            expires_at
+            token_type
         ])
         
         return token
@@ -32,31 +31,36 @@ def generate_verification_token(portal_user_id: int, token_type: str) -> Optiona
         print(f"Error generating token: {str(e)}")
         return None
 
+# Everything needed to judge a token, with expiry checked on the database
+# clock that set it
+TOKEN_STATUS_QUERY = """
+SELECT 
+    t.PORTAL_USER_ID,
+    t.EXPIRES_AT <= CURRENT_TIMESTAMP() AS IS_EXPIRED,
+    t.IS_USED,
+    u.EMAIL_VERIFIED
+FROM OPERATIONAL.BARBER.VERIFICATION_TOKENS t
+JOIN OPERATIONAL.BARBER.CUSTOMER_PORTAL_USERS u 
+    ON t.PORTAL_USER_ID = u.PORTAL_USER_ID
+WHERE t.TOKEN_ID = ?
+AND t.TOKEN_TYPE = ?
+"""
+
+def fetch_token_status(token: str, token_type: str) -> Optional[Dict[str, Any]]:
+    """Load a token's status row, or None if there is no such token"""
+    result = snowflake_conn.execute_query(TOKEN_STATUS_QUERY, [token, token_type])
+    return result[0] if result else None
+
 def verify_token(token: str, token_type: str) -> Tuple[bool, Optional[int], str]:
     """Verify a token and return (is_valid, portal_user_id, message)"""
     try:
         # Check token
-        query = """
-        SELECT 
-            t.PORTAL_USER_ID,
-            t.EXPIRES_AT,
-            t.IS_USED,
-            u.EMAIL_VERIFIED
-        FROM OPERATIONAL.BARBER.VERIFICATION_TOKENS t
-        JOIN OPERATIONAL.BARBER.CUSTOMER_PORTAL_USERS u 
-            ON t.PORTAL_USER_ID = u.PORTAL_USER_ID
-        WHERE t.TOKEN_ID = ?
-        AND t.TOKEN_TYPE = ?
-        """
-        
-        result = snowflake_conn.execute_query(query, [token, token_type])
-        if not result:
+        token_data = fetch_token_status(token, token_type)
+        if not token_data:
             return False, None, "Invalid verification token"
-            
-        token_data = result[0]
         
         # Check if token is expired
-        if token_data['EXPIRES_AT'] < datetime.now():
+        if token_data['IS_EXPIRED']:
             return False, None, "Verification token has expired"
             
         # Check if token was already used
@@ -105,6 +109,30 @@ def mark_email_verified(portal_user_id: int) -> bool:
         print(f"Error marking email verified: {str(e)}")
         return False
 
+# Templates are edited rarely, from the communications settings page
+VERIFICATION_TEMPLATE_CACHE_TTL_SECONDS = 300
+
+VERIFICATION_TEMPLATE_QUERY = """
+SELECT TEMPLATE_CONTENT
+FROM MESSAGE_TEMPLATES
+WHERE TEMPLATE_TYPE = 'EMAIL_VERIFICATION'
+AND IS_ACTIVE = TRUE
+LIMIT 1
+"""
+
+@st.cache_data(ttl=VERIFICATION_TEMPLATE_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_verification_template() -> Optional[str]:
+    """Load the active verification email template (cached)."""
+    result = snowflake_conn.execute_query(VERIFICATION_TEMPLATE_QUERY)
+    if result is None:
+        # Raise so the failed lookup isn't cached
+        raise RuntimeError("Could not load email template")
+    return result[0]['TEMPLATE_CONTENT'] if result else None
+
+def clear_verification_template_cache() -> None:
+    """Drop the cached verification template after templates change."""
+    _fetch_verification_template.clear()
+
 def send_verification_email(email: str, portal_user_id: int) -> bool:
     """Send verification email to user"""
     try:
@@ -117,35 +145,22 @@ def send_verification_email(email: str, portal_user_id: int) -> bool:
         verify_url = f"{st.secrets.BASE_URL}/verify?token={token}"
         
         # Get email template
-        template_query = """
-        SELECT TEMPLATE_CONTENT
-        FROM MESSAGE_TEMPLATES
-        WHERE TEMPLATE_TYPE = 'EMAIL_VERIFICATION'
-        AND IS_ACTIVE = TRUE
-        LIMIT 1
-        """
-        
-        result = snowflake_conn.execute_query(template_query)
-        if not result:
+        template = _fetch_verification_template()
+        if not template:
             print("No email template found")
             return False
-            
-        template = result[0]['TEMPLATE_CONTENT']
         
         # Replace placeholders
         email_content = template.replace('{VERIFY_URL}', verify_url)
         
         # Send email using email utility
-        from utils.email import send_email
-        from pages.settings.business import fetch_business_info
-        
         business_info = fetch_business_info()
         return send_email(
             to_email=email,
             subject="Verify Your Email",
             content=email_content,
             business_info=business_info
-        )
+        ).success
         
     except Exception as e:
         print(f"Error sending verification email: {str(e)}")
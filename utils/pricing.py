@@ -1,11 +1,9 @@
 # models/pricing.py
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, NamedTuple
 import json
 from database.connection import snowflake_conn
 
-@dataclass
-class PricingStrategy:
+class PricingStrategy(NamedTuple):
     strategy_id: int
     name: str
     type: str
@@ -40,6 +38,74 @@ def get_active_pricing_strategy() -> Optional[PricingStrategy]:
         print(f"Error fetching pricing strategy: {str(e)}")
         return None
 
+def _fixed_price(
+    base_cost: float,
+    rules: Dict[str, Any],
+    labor_details: Optional[List[Dict[str, Any]]],
+    material_cost: float,
+    price_details: Dict[str, Any]
+) -> float:
+    """Fixed Price: the base cost is the price."""
+    return base_cost
+
+def _cost_plus_price(
+    base_cost: float,
+    rules: Dict[str, Any],
+    labor_details: Optional[List[Dict[str, Any]]],
+    material_cost: float,
+    price_details: Dict[str, Any]
+) -> float:
+    """Cost Plus: base, labor and material costs plus a markup."""
+    # Calculate total cost
+    total_cost = base_cost
+    
+    # Add labor cost if included in rules
+    if rules.get('include_labor', True) and labor_details:
+        total_labor_cost = sum(
+            detail['hours'] * detail['rate']
+            for detail in labor_details
+        )
+        total_cost += total_labor_cost
+        price_details['labor_cost'] = total_labor_cost
+    
+    # Add material cost if included in rules
+    if rules.get('include_materials', True) and material_cost > 0:
+        total_cost += material_cost
+        price_details['material_cost'] = material_cost
+    
+    # Apply markup
+    markup_type = rules.get('markup_type', 'Percentage')
+    markup_value = float(rules.get('markup_value', 20))
+    
+    if markup_type == "Percentage":
+        markup_amount = total_cost * (markup_value / 100)
+    else:  # Fixed Amount
+        markup_amount = markup_value
+        
+    price_details['markup_amount'] = markup_amount
+    return total_cost + markup_amount
+
+def _variable_price(
+    base_cost: float,
+    rules: Dict[str, Any],
+    labor_details: Optional[List[Dict[str, Any]]],
+    material_cost: float,
+    price_details: Dict[str, Any]
+) -> float:
+    """Variable: the base cost adjusted by a percentage."""
+    # Apply base adjustment
+    base_adjustment = float(rules.get('base_adjustment', 0))
+    adjusted_cost = base_cost * (1 + (base_adjustment / 100))
+    price_details['base_adjustment'] = adjusted_cost - base_cost
+    return adjusted_cost
+
+# Price calculation for each strategy type; unknown types keep the base cost
+STRATEGY_PRICERS = {
+    "Fixed Price": _fixed_price,
+    "Cost Plus": _cost_plus_price,
+    "Variable": _variable_price
+}
+
 def calculate_final_price(
     base_cost: float,
     strategy: Optional[PricingStrategy],
@@ -52,47 +118,10 @@ def calculate_final_price(
     price_details = {"base_cost": base_cost}
     current_price = base_cost
     
-    if strategy:
-        # Apply strategy-specific calculations
-        if strategy.type == "Fixed Price":
-            current_price = base_cost
-            
-        elif strategy.type == "Cost Plus":
-            # Calculate total cost
-            total_cost = base_cost
-            
-            # Add labor cost if included in rules
-            if strategy.rules.get('include_labor', True) and labor_details:
-                total_labor_cost = sum(
-                    detail['hours'] * detail['rate']
-                    for detail in labor_details
-                )
-                total_cost += total_labor_cost
-                price_details['labor_cost'] = total_labor_cost
-            
-            # Add material cost if included in rules
-            if strategy.rules.get('include_materials', True) and material_cost > 0:
-                total_cost += material_cost
-                price_details['material_cost'] = material_cost
-            
-            # Apply markup
-            markup_type = strategy.rules.get('markup_type', 'Percentage')
-            markup_value = float(strategy.rules.get('markup_value', 20))
-            
-            if markup_type == "Percentage":
-                markup_amount = total_cost * (markup_value / 100)
-            else:  # Fixed Amount
-                markup_amount = markup_value
-                
-            current_price = total_cost + markup_amount
-            price_details['markup_amount'] = markup_amount
-            
-        elif strategy.type == "Variable":
-            # Apply base adjustment
-            base_adjustment = float(strategy.rules.get('base_adjustment', 0))
-            adjusted_cost = base_cost * (1 + (base_adjustment / 100))
-            current_price = adjusted_cost
-            price_details['base_adjustment'] = adjusted_cost - base_cost
+    # Apply strategy-specific calculations
+    pricer = STRATEGY_PRICERS.get(strategy.type) if strategy else None
+    if pricer:
+        current_price = pricer(base_cost, strategy.rules, labor_details, material_cost, price_details)
     
     # Add additional charges
     if additional_charges:
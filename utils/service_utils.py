@@ -4,8 +4,45 @@ Utility functions for service management that can be used across the application
 """
 
 import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from database.connection import snowflake_conn
+from utils.double_booking_prevention import clear_service_durations_cache
+
+# Categories change only when a service is created or edited, which clear
+# this cache
+SERVICE_CATEGORIES_CACHE_TTL_SECONDS = 300
+
+SERVICE_CATEGORIES_QUERY = """
+SELECT DISTINCT SERVICE_CATEGORY 
+FROM OPERATIONAL.BARBER.SERVICES 
+WHERE SERVICE_CATEGORY IS NOT NULL 
+ORDER BY SERVICE_CATEGORY
+"""
+
+# Offered in the category picker even before any service uses them
+DEFAULT_SERVICE_CATEGORIES = (
+    'Carpet Cleaning',
+    'Deep Cleaning',
+    'Upholstery Cleaning',
+    'Area Rug Cleaning',
+    'Tile & Grout Cleaning',
+    'Pet Odor Treatment',
+    'Stain Removal',
+    'Other'
+)
+
+@st.cache_data(ttl=SERVICE_CATEGORIES_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_service_categories() -> List[str]:
+    """Load the categories used by existing services (cached)."""
+    result = snowflake_conn.execute_query(SERVICE_CATEGORIES_QUERY)
+    if result is None:
+        # Raise so the failed lookup isn't cached
+        raise RuntimeError("Could not load service categories")
+    return [row['SERVICE_CATEGORY'] for row in result]
+
+def clear_service_categories_cache() -> None:
+    """Drop cached categories after a service is created or edited."""
+    _fetch_service_categories.clear()
 
 def create_new_service(
     service_name: str,
@@ -32,18 +69,7 @@ def create_new_service(
         SERVICE_ID of the created service, or None if failed
     """
     try:
-        # Check if service name already exists
-        check_query = """
-        SELECT COUNT(*) as count 
-        FROM OPERATIONAL.BARBER.SERVICES 
-        WHERE UPPER(SERVICE_NAME) = UPPER(?)
-        """
-        result = snowflake_conn.execute_query(check_query, [service_name])
-        if result and result[0]['COUNT'] > 0:
-            st.error(f"⚠️ Service '{service_name}' already exists. Please choose a different name.")
-            return None
-        
-        # Insert new service
+        # Insert new service unless the name is taken, in one statement
         insert_query = """
         INSERT INTO OPERATIONAL.BARBER.SERVICES (
             SERVICE_NAME,
@@ -53,18 +79,35 @@ def create_new_service(
             ACTIVE_STATUS,
             SERVICE_DURATION,
             CUSTOMER_BOOKABLE
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        )
+        SELECT ?, ?, ?, ?, ?, ?, ?
+        WHERE NOT EXISTS (
+            SELECT 1 
+            FROM OPERATIONAL.BARBER.SERVICES 
+            WHERE UPPER(SERVICE_NAME) = UPPER(?)
+        )
         """
         
-        snowflake_conn.execute_query(insert_query, [
+        result = snowflake_conn.execute_query(insert_query, [
             service_name,
             service_category,
             service_description,
             float(cost),
             active_status,
             int(service_duration),
-            customer_bookable
+            customer_bookable,
+            service_name
         ])
+        if not result:
+            st.error("Failed to create service")
+            return None
+        
+        # INSERT reports a single "number of rows inserted" column
+        if not next(iter(result[0].values())):
+            st.error(f"⚠️ Service '{service_name}' already exists. Please choose a different name.")
+            return None
+        clear_service_categories_cache()
+        clear_service_durations_cache()
         
         # Get the created service ID
         id_query = """
@@ -88,52 +131,87 @@ def create_new_service(
         st.error(f"Error creating service: {str(e)}")
         return None
 
+# Multi-row insert used for seeding several services at once
+SERVICE_INSERT_PREFIX = """
+INSERT INTO OPERATIONAL.BARBER.SERVICES (
+    SERVICE_NAME,
+    SERVICE_CATEGORY,
+    SERVICE_DESCRIPTION,
+    COST,
+    ACTIVE_STATUS,
+    SERVICE_DURATION,
+    CUSTOMER_BOOKABLE
+) VALUES """
+SERVICE_ROW_TEMPLATE = "(?, ?, ?, ?, ?, ?, ?)"
+
+# Rows per INSERT statement, keeping each statement's bind list modest
+SERVICE_INSERT_BATCH_ROWS = 500
+
+def bulk_create_services(services: List[Dict[str, Any]]) -> int:
+    """
+    Create several services with one INSERT statement per batch.
+    
+    Args:
+        services: One dict per service with name, category, description and
+            cost; duration (default 60), active_status (default True) and
+            customer_bookable (default False) are optional
+    
+    Returns:
+        Number of services inserted; stops at the first failed batch
+    """
+    inserted = 0
+    for start in range(0, len(services), SERVICE_INSERT_BATCH_ROWS):
+        batch = services[start:start + SERVICE_INSERT_BATCH_ROWS]
+        params = []
+        for service in batch:
+            params.extend([
+                service['name'],
+                service['category'],
+                service['description'],
+                float(service['cost']),
+                service.get('active_status', True),
+                int(service.get('duration', 60)),
+                service.get('customer_bookable', False)
+            ])
+        
+        query = SERVICE_INSERT_PREFIX + ", ".join([SERVICE_ROW_TEMPLATE] * len(batch))
+        result = snowflake_conn.execute_query(query, params)
+        if not result:
+            break
+        # INSERT reports a single "number of rows inserted" column
+        inserted += next(iter(result[0].values()))
+    
+    if inserted:
+        clear_service_categories_cache()
+        clear_service_durations_cache()
+    return inserted
+
 def get_service_categories() -> list:
     """Get list of existing service categories."""
     try:
-        query = """
-        SELECT DISTINCT SERVICE_CATEGORY 
-        FROM OPERATIONAL.BARBER.SERVICES 
-        WHERE SERVICE_CATEGORY IS NOT NULL 
-        ORDER BY SERVICE_CATEGORY
-        """
-        result = snowflake_conn.execute_query(query)
-        
-        categories = [row['SERVICE_CATEGORY'] for row in result] if result else []
-        
         # Add common categories if not present
-        default_categories = [
-            'Carpet Cleaning',
-            'Deep Cleaning',
-            'Upholstery Cleaning',
-            'Area Rug Cleaning',
-            'Tile & Grout Cleaning',
-            'Pet Odor Treatment',
-            'Stain Removal',
-            'Other'
-        ]
-        
-        for category in default_categories:
-            if category not in categories:
-                categories.append(category)
-        
-        return sorted(categories)
-        
+        return sorted(set(_fetch_service_categories()).union(DEFAULT_SERVICE_CATEGORIES))
     except Exception as e:
         st.error(f"Error fetching service categories: {str(e)}")
         return ['Carpet Cleaning', 'Deep Cleaning', 'Other']
 
-def display_create_service_form(key_suffix: str = "") -> Optional[Dict[str, Any]]:
+def display_create_service_form(
+    key_suffix: str = "",
+    categories: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
     """
     Display a form for creating a new service.
     
     Args:
         key_suffix: Suffix to make form keys unique
+        categories: Category options, for callers that already loaded them;
+            fetched with get_service_categories when omitted
     
     Returns:
         Dict with service data if form was submitted successfully, None otherwise
     """
-    categories = get_service_categories()
+    if categories is None:
+        categories = get_service_categories()
     
     with st.form(f"create_service_form_{key_suffix}"):
         st.markdown("#### Create New Service")
@@ -196,16 +274,13 @@ def display_create_service_form(key_suffix: str = "") -> Optional[Dict[str, Any]
             return "cancelled"
         
         if create_button:
-            # Validate required fields
+            # Validate required fields; the name is stored without surrounding spaces
+            service_name = service_name.strip()
             if not service_name:
                 st.error("Service name is required")
                 return None
             
-            if not service_name.strip():
-                st.error("Service name cannot be empty")
-                return None
-            
-            if len(service_name.strip()) > 100:
+            if len(service_name) > 100:
                 st.error("Service name must be 100 characters or less")
                 return None
             
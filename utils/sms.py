@@ -2,11 +2,17 @@
 SMS messaging utilities using Twilio
 """
 import streamlit as st
-from typing import Optional, Dict, Any
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from dataclasses import dataclass
-import re
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+import time
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioException
+from utils.business.info import fetch_business_info
+from utils.text_normalize import strip_to_digits
 
 
 @dataclass
@@ -18,6 +24,17 @@ class SMSResult:
     cost: Optional[str] = None
 
 
+@st.cache_resource(show_spinner=False)
+def _create_twilio_client(account_sid: str, auth_token: str) -> Client:
+    """
+    Build one Twilio client per set of credentials, shared across sends
+    
+    Keying on the credentials means a change to the secrets gets a new
+    client rather than the stale one.
+    """
+    return Client(account_sid, auth_token)
+
+
 def get_twilio_client() -> Optional[Client]:
     """Initialize Twilio client from secrets"""
     try:
@@ -27,7 +44,7 @@ def get_twilio_client() -> Optional[Client]:
         if not account_sid or not auth_token:
             return None
             
-        return Client(account_sid, auth_token)
+        return _create_twilio_client(account_sid, auth_token)
     except Exception as e:
         print(f"Error initializing Twilio client: {str(e)}")
         return None
@@ -47,15 +64,46 @@ def format_phone_for_sms(phone: str) -> Optional[str]:
         return None
         
     # Remove all non-digit characters
-    digits = re.sub(r'\D', '', phone)
+    digits = strip_to_digits(phone)
     
     # Handle US numbers
-    if len(digits) == 10:
-        return f"+1{digits}"
-    elif len(digits) == 11 and digits.startswith('1'):
-        return f"+{digits}"
-    else:
-        return None
+    length = len(digits)
+    if length == 10:
+        return "+1" + digits
+    if length == 11 and digits[0] == '1':
+        return "+" + digits
+    return None
+
+
+# Identical text to the same number within this window is sent once, so a
+# double-clicked send button or overlapping reruns don't bill twice
+SMS_DEDUPE_WINDOW_SECONDS = 60
+
+# (phone, message) -> monotonic time claimed, oldest first
+_recent_sends: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+_recent_sends_lock = threading.Lock()
+
+
+def _claim_send(send_key: Tuple[str, str]) -> bool:
+    """Reserve a send; False if the same one was claimed within the window"""
+    now = time.monotonic()
+    with _recent_sends_lock:
+        while _recent_sends:
+            oldest_key, claimed_at = next(iter(_recent_sends.items()))
+            if now - claimed_at < SMS_DEDUPE_WINDOW_SECONDS:
+                break
+            del _recent_sends[oldest_key]
+        
+        if send_key in _recent_sends:
+            return False
+        _recent_sends[send_key] = now
+        return True
+
+
+def _release_send(send_key: Tuple[str, str]) -> None:
+    """Drop a claim so a retry after a failed send is not suppressed"""
+    with _recent_sends_lock:
+        _recent_sends.pop(send_key, None)
 
 
 def send_sms(to_phone: str, message: str, from_phone: Optional[str] = None) -> SMSResult:
@@ -95,18 +143,29 @@ def send_sms(to_phone: str, message: str, from_phone: Optional[str] = None) -> S
                     message="No sender phone number configured"
                 )
         
+        send_key = (formatted_phone, message)
+        if not _claim_send(send_key):
+            return SMSResult(
+                success=True,
+                message="Duplicate SMS suppressed; the same message was just sent"
+            )
+        
         # Send message
-        message_obj = client.messages.create(
-            body=message,
-            from_=from_phone,
-            to=formatted_phone
-        )
+        try:
+            message_obj = client.messages.create(
+                body=message,
+                from_=from_phone,
+                to=formatted_phone
+            )
+        except Exception:
+            _release_send(send_key)
+            raise
         
         return SMSResult(
             success=True,
             message="SMS sent successfully",
             message_sid=message_obj.sid,
-            cost=getattr(message_obj, 'price', None)
+            cost=message_obj.price
         )
         
     except TwilioException as e:
@@ -135,18 +194,22 @@ def generate_service_scheduled_sms(service_details: Dict[str, Any], business_inf
     business_name = business_info.get('BUSINESS_NAME', 'Ez Biz')
     business_phone = business_info.get('PHONE_NUMBER', '')
     
-    message = f"🏠 {business_name}\n\n"
-    message += f"Service Scheduled!\n"
-    message += f"📅 {service_details['date']} at {service_details['time']}\n"
-    message += f"🔧 {service_details['service_type']}\n"
+    lines = [
+        f"🏠 {business_name}",
+        "",
+        "Service Scheduled!",
+        f"📅 {service_details['date']} at {service_details['time']}",
+        f"🔧 {service_details['service_type']}",
+    ]
     
     if service_details.get('deposit_required') and not service_details.get('deposit_paid'):
-        message += f"💰 Deposit: ${service_details['deposit_amount']:.2f} (required)\n"
+        lines.append(f"💰 Deposit: ${service_details['deposit_amount']:.2f} (required)")
     
     if service_details.get('notes'):
-        message += f"📝 Notes: {service_details['notes']}\n"
+        lines.append(f"📝 Notes: {service_details['notes']}")
     
-    message += f"\nQuestions? Call {business_phone}"
+    lines += ["", f"Questions? Call {business_phone}"]
+    message = "\n".join(lines)
     
     # SMS character limit is 160 for single message, 1600 for concatenated
     if len(message) > 1600:
@@ -170,17 +233,19 @@ def generate_service_reminder_sms(service_details: Dict[str, Any], business_info
     business_name = business_info.get('BUSINESS_NAME', 'Ez Biz')
     business_phone = business_info.get('PHONE_NUMBER', '')
     
-    message = f"🔔 {business_name} Reminder\n\n"
-    message += f"Service tomorrow:\n"
-    message += f"📅 {service_details['date']} at {service_details['time']}\n"
-    message += f"🔧 {service_details['service_type']}\n"
+    lines = [
+        f"🔔 {business_name} Reminder",
+        "",
+        "Service tomorrow:",
+        f"📅 {service_details['date']} at {service_details['time']}",
+        f"🔧 {service_details['service_type']}",
+    ]
     
     if service_details.get('deposit_required') and not service_details.get('deposit_paid'):
-        message += f"💰 Please have ${service_details['deposit_amount']:.2f} deposit ready\n"
-    
-    message += f"\nQuestions? Call {business_phone}"
+        lines.append(f"💰 Please have ${service_details['deposit_amount']:.2f} deposit ready")
     
-    return message
+    lines += ["", f"Questions? Call {business_phone}"]
+    return "\n".join(lines)
 
 
 def generate_service_completed_sms(service_details: Dict[str, Any], business_info: Dict[str, Any]) -> str:
@@ -197,18 +262,27 @@ def generate_service_completed_sms(service_details: Dict[str, Any], business_inf
     business_name = business_info.get('BUSINESS_NAME', 'Ez Biz')
     business_phone = business_info.get('PHONE_NUMBER', '')
     
-    message = f"✅ {business_name}\n\n"
-    message += f"Service completed!\n"
-    message += f"🔧 {service_details['service_type']}\n"
-    message += f"💵 Total: ${service_details['total_cost']:.2f}\n"
+    lines = [
+        f"✅ {business_name}",
+        "",
+        "Service completed!",
+        f"🔧 {service_details['service_type']}",
+        f"💵 Total: ${service_details['total_cost']:.2f}",
+    ]
     
     if service_details.get('balance_due', 0) > 0:
-        message += f"💰 Balance due: ${service_details['balance_due']:.2f}\n"
+        lines.append(f"💰 Balance due: ${service_details['balance_due']:.2f}")
     
-    message += f"\nThank you for choosing {business_name}!\n"
-    message += f"Questions? Call {business_phone}"
-    
-    return message
+    lines += ["", f"Thank you for choosing {business_name}!", f"Questions? Call {business_phone}"]
+    return "\n".join(lines)
+
+
+# Message builder for each notification type
+SMS_GENERATORS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], str]] = {
+    'scheduled': generate_service_scheduled_sms,
+    'reminder': generate_service_reminder_sms,
+    'completed': generate_service_completed_sms,
+}
 
 
 def send_service_notification_sms(
@@ -230,19 +304,14 @@ def send_service_notification_sms(
         SMSResult with success status
     """
     try:
-        if notification_type == "scheduled":
-            message = generate_service_scheduled_sms(service_details, business_info)
-        elif notification_type == "reminder":
-            message = generate_service_reminder_sms(service_details, business_info)
-        elif notification_type == "completed":
-            message = generate_service_completed_sms(service_details, business_info)
-        else:
+        generate = SMS_GENERATORS.get(notification_type)
+        if not generate:
             return SMSResult(
                 success=False,
                 message=f"Unknown notification type: {notification_type}"
             )
         
-        return send_sms(customer_phone, message)
+        return send_sms(customer_phone, generate(service_details, business_info))
         
     except Exception as e:
         return SMSResult(
@@ -251,6 +320,88 @@ def send_service_notification_sms(
         )
 
 
+# Concurrent Twilio requests per batch; stays under the client's default
+# connection pool of 10
+MAX_CONCURRENT_SMS = 8
+
+_sms_pool = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SMS, thread_name_prefix="ezbiz-sms")
+
+
+def _submit_sms(to_phone: str, message: str) -> Future:
+    """
+    Run send_sms on the shared pool with the caller's script context,
+    so st.secrets and the cached client work in the worker.
+    
+    Returns:
+        Future resolving to the SMSResult from send_sms
+    """
+    ctx = get_script_run_ctx()
+    
+    def run() -> SMSResult:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return send_sms(to_phone, message)
+    
+    return _sms_pool.submit(run)
+
+
+def send_bulk_notifications(
+    recipients: List[Tuple[str, Dict[str, Any]]],
+    business_info: Optional[Dict[str, Any]] = None,
+    notification_type: str = "reminder"
+) -> List[SMSResult]:
+    """
+    Send the same kind of service notification to many customers concurrently
+    
+    Args:
+        recipients: (customer_phone, service_details) pairs
+        business_info: Business information; loaded once for the whole
+            batch from the cached settings when omitted
+        notification_type: Type of notification ('scheduled', 'reminder', 'completed')
+        
+    Returns:
+        List of SMSResult in the same order as recipients
+    """
+    generate = SMS_GENERATORS.get(notification_type)
+    if not generate:
+        return [
+            SMSResult(success=False, message=f"Unknown notification type: {notification_type}")
+            for _ in recipients
+        ]
+    
+    if business_info is None:
+        business_info = fetch_business_info()
+    
+    results: List[Optional[SMSResult]] = [None] * len(recipients)
+    pending = []
+    for index, (customer_phone, service_details) in enumerate(recipients):
+        try:
+            message = generate(service_details, business_info)
+        except Exception as e:
+            results[index] = SMSResult(success=False, message=f"Error generating SMS: {str(e)}")
+            continue
+        pending.append((index, _submit_sms(customer_phone, message)))
+    
+    for index, future in pending:
+        results[index] = future.result()
+    return results
+
+
+# How long a successful Twilio account check is trusted before asking again
+SMS_SETUP_CACHE_TTL_SECONDS = 60
+
+
+@st.cache_data(ttl=SMS_SETUP_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_twilio_account_status(account_sid: str, auth_token: str) -> str:
+    """Look up the Twilio account status (cached); raises if the lookup fails"""
+    client = _create_twilio_client(account_sid, auth_token)
+    return client.api.accounts(account_sid).fetch().status
+
+
+def clear_sms_setup_cache() -> None:
+    """Force the next validate_sms_setup call to check with Twilio again."""
+    _fetch_twilio_account_status.clear()
+
+
 def validate_sms_setup() -> Dict[str, Any]:
     """
     Validate SMS/Twilio configuration
@@ -279,16 +430,15 @@ def validate_sms_setup() -> Dict[str, Any]:
         
         # Test client connection if credentials are present
         if not results['errors']:
-            client = get_twilio_client()
-            if client:
-                # Test connection by fetching account info
-                account = client.api.accounts(twilio_config["account_sid"]).fetch()
-                if account.status != 'active':
-                    results['warnings'].append(f"Twilio account status: {account.status}")
-                else:
-                    results['configured'] = True
+            # Test connection by fetching account info
+            status = _fetch_twilio_account_status(
+                twilio_config["account_sid"],
+                twilio_config["auth_token"]
+            )
+            if status != 'active':
+                results['warnings'].append(f"Twilio account status: {status}")
             else:
-                results['errors'].append("Failed to initialize Twilio client")
+                results['configured'] = True
     
     except Exception as e:
         results['errors'].append(f"Configuration validation error: {str(e)}")
@@ -301,9 +451,11 @@ __all__ = [
     'SMSResult',
     'send_sms',
     'send_service_notification_sms',
+    'send_bulk_notifications',
     'generate_service_scheduled_sms',
     'generate_service_reminder_sms', 
     'generate_service_completed_sms',
     'format_phone_for_sms',
-    'validate_sms_setup'
+    'validate_sms_setup',
+    'clear_sms_setup_cache'
 ]
\ No newline at end of file
@@ -0,0 +1,13 @@
+# utils/text_normalize.py
+"""
+Text clean-up shared by the phone, ZIP code and formatting helpers.
+"""
+
+import re
+
+# Anything that isn't a decimal digit, in any script
+NON_DIGIT_PATTERN = re.compile(r'\D')
+
+def strip_to_digits(value: str) -> str:
+    """Remove every non-digit character, e.g. '(555) 123-4567' -> '5551234567'."""
+    return NON_DIGIT_PATTERN.sub('', value)
@@ -1,13 +1,20 @@
 from typing import Union, Optional, Any, Tuple
 import math
+import re
+from utils.text_normalize import strip_to_digits
+
+_EMAIL_PATTERN = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
 
 def validate_numeric_value(value: Optional[Union[int, float, str]], default: float = 0.0) -> float:
     """Validate and convert numeric value"""
+    if type(value) is int:
+        # Plain ints are never NaN or infinite
+        return max(0.0, float(value))
     try:
         if value is None:
             return default
         float_value = float(value)
-        if math.isnan(float_value) or math.isinf(float_value):
+        if not math.isfinite(float_value):
             return default
         return max(0.0, float_value)
     except (ValueError, TypeError):
@@ -15,13 +22,25 @@ def validate_numeric_value(value: Optional[Union[int, float, str]], default: flo
 
 def validate_phone(phone: str) -> Tuple[bool, str]:
     """Validate phone number format"""
-    cleaned = ''.join(filter(str.isdigit, phone))
+    cleaned = strip_to_digits(phone)
     is_valid = len(cleaned) == 10
     return is_valid, cleaned if is_valid else phone
 
 def validate_email(email: str) -> bool:
-    """Basic email format validation"""
-    return '@' in email and '.' in email.split('@')[1]
+    """Basic email format validation: one '@' and a dot in the domain, no whitespace"""
+    return bool(email) and _EMAIL_PATTERN.fullmatch(email) is not None
+
+def _normalize_zip_code(zip_code: Any) -> Optional[int]:
+    """Return the ZIP code's digits as an int, or None unless there are exactly five"""
+    if zip_code is None:
+        return None
+    
+    try:
+        # Remove whitespace and any other non-digit characters
+        zip_str = strip_to_digits(str(zip_code))
+        return int(zip_str) if len(zip_str) == 5 else None
+    except (ValueError, TypeError):
+        return None
 
 def validate_zip_code(zip_code: any) -> bool:
     """
@@ -33,21 +52,7 @@ def validate_zip_code(zip_code: any) -> bool:
     Returns:
         bool: True if valid, False if invalid
     """
-    if zip_code is None:
-        return False
-        
-    try:
-        # Convert to string and remove any whitespace
-        zip_str = str(zip_code).strip()
-        
-        # Remove any non-digit characters
-        zip_str = ''.join(filter(str.isdigit, zip_str))
-        
-        # Check if it's exactly 5 digits and within valid range
-        return len(zip_str) == 5 and 0 <= int(zip_str) <= 99999
-        
-    except (ValueError, TypeError):
-        return False
+    return _normalize_zip_code(zip_code) is not None
 
 def sanitize_zip_code(zip_code: any) -> Optional[int]:
     """
@@ -71,28 +76,4 @@ def sanitize_zip_code(zip_code: any) -> Optional[int]:
         >>> sanitize_zip_code(None)
         None
     """
-    if zip_code is None or (isinstance(zip_code, str) and not zip_code.strip()):
-        return None
-        
-    try:
-        # Convert to string and remove any whitespace
-        zip_str = str(zip_code).strip()
-        
-        # Remove any non-digit characters
-        zip_str = ''.join(filter(str.isdigit, zip_str))
-        
-        # Validate length
-        if len(zip_str) != 5:
-            return None
-            
-        # Convert to integer
-        zip_int = int(zip_str)
-        
-        # Ensure it's a 5-digit number
-        if 0 <= zip_int <= 99999:
-            return zip_int
-            
-        return None
-        
-    except (ValueError, TypeError):
-        return None
\ No newline at end of file
+    return _normalize_zip_code(zip_code)